@@ -18,40 +18,12 @@ with DAG('bizsight_pipeline',
          schedule_interval='@daily',
          catchup=False) as dag:
 
-    create_raw_db = BashOperator(
-        task_id='create_raw_db',
-        bash_command='python /Users/deepmangroliya/Desktop/d2p_ds_project/src/database.py -dbn True -db "raw"'
+    # One task runs every stage in a single interpreter (python -m src.pipeline), so
+    # modules are imported once, connections are pooled across stages and results are
+    # handed over in memory. To retry or backfill only some stages, trigger the DAG
+    # with {"stages": ["extract", "score"]}: each is passed on as `-s <stage>`.
+    run_pipeline = BashOperator(
+        task_id='run_pipeline',
+        bash_command='cd /Users/deepmangroliya/Desktop/d2p_ds_project && python -m src.pipeline'
+                     '{% for stage in (dag_run.conf or {}).get("stages", []) %} -s {{ stage }}{% endfor %}'
     )
-
-    load_raw_data = BashOperator(
-        task_id='load_data_raw_db',
-        bash_command='python /Users/deepmangroliya/Desktop/d2p_ds_project/src/database.py -db "raw" -t "upload-to-database"'
-    )
-
-    run_etl = BashOperator(
-        task_id='run_etl_pipeline',
-        bash_command='python /Users/deepmangroliya/Desktop/d2p_ds_project/src/etl_pipeline.py'
-    )
-
-    create_refined_db = BashOperator(
-        task_id='create_refined_db',
-        bash_command='python /Users/deepmangroliya/Desktop/d2p_ds_project/src/database.py -dbn True -db "refined"'
-    )
-
-    load_cleaned_data = BashOperator(
-        task_id='load_data_refined_db',
-        bash_command='python /Users/deepmangroliya/Desktop/d2p_ds_project/src/database.py -db "refined" -t "cleaned-upload-to-database"'
-    )
-
-    run_data_analysis = BashOperator(
-        task_id='run_data_analysis_task',
-        bash_command='python3 /Users/deepmangroliya/Desktop/d2p_ds_project/main.py -t "data_analysis_ext"'
-    )
-
-    run_modeling = BashOperator(
-        task_id='run_modeling_task',
-        bash_command='python3 /Users/deepmangroliya/Desktop/d2p_ds_project/main.py -t "modeling"'
-    )
-
-    # DAG flow
-    create_raw_db >> load_raw_data >> run_etl >> create_refined_db >> load_cleaned_data >> run_data_analysis >> run_modeling
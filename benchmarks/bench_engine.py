@@ -0,0 +1,95 @@
+"""
+Checks the Polars engine (src/polars_engine.py) against the pandas one on
+synthetic CDNOW data and times both: the ETL split of the raw CSV, and the
+feature engineering modeling() runs before XGBoost (transaction_frame,
+prepare_features and the scoring build_features).
+
+    python -m benchmarks.bench_engine --sizes 1000000 10000000 --threads 0
+
+Both engines must produce identical frames (values, dtypes and index); the
+script stops with an assertion error otherwise. The step cache and metrics are
+disabled.
+`--threads 0` gives Polars every core.
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+import pandas as pd
+
+from benchmarks.synthetic import write_cdnow_csv
+from src import cache, etl_pipeline, metrics, modeling, polars_engine
+from src.utils import infer_format, read_frame
+
+
+def use_engine(backend: str, threads: int) -> None:
+    polars_engine.engine_settings = lambda: {"backend": backend, "threads": threads or None}
+
+
+def written(output_dir: Path) -> Dict[str, pd.DataFrame]:
+    """The ETL files as read back by the load, which must match too."""
+    return {f"{path.stem} file": read_frame(path, file_format=infer_format(path.name))
+            for path in sorted(output_dir.glob("*.*"))}
+
+
+def features(original_data: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    transactions = modeling.transaction_frame(original_data)
+    return {"transactions": transactions,
+            "training": modeling.prepare_features(transactions),
+            "scoring": modeling.build_features(transactions)}
+
+
+def timed(func: Callable, *args) -> Tuple[Dict[str, pd.DataFrame], float]:
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the pandas and Polars engines")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1_000_000, 10_000_000])
+    parser.add_argument("--threads", type=int, default=0, help="Polars threads (0 = every core)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    cache.cache_settings = lambda: {"enabled": False}
+    metrics.metrics_settings = lambda: {"enabled": False}
+    use_engine("polars", args.threads)
+    threads = polars_engine.polars().thread_pool_size()
+    print(f"Polars on {threads} of {os.cpu_count()} cores")
+    print(f"{'rows':>10} {'stage':>9} {'pandas s':>9} {'polars s':>9} {'speedup':>8}")
+
+    for rows in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            work_dir = Path(tmp)
+            csv_path = work_dir / "original_data.csv"
+            write_cdnow_csv(csv_path, rows, seed=args.seed)
+            original_data = pd.read_csv(csv_path)
+
+            for stage in ("etl", "features"):
+                results = {}
+                for engine in ("pandas", "polars"):
+                    use_engine(engine, args.threads)
+                    if stage == "etl":
+                        output_dir = work_dir / engine
+                        output_dir.mkdir()
+                        frames, seconds = timed(etl_pipeline.process, csv_path, output_dir)
+                        frames.update(written(output_dir))
+                    else:
+                        frames, seconds = timed(features, original_data)
+                    results[engine] = frames, seconds
+
+                (expected, pandas_s), (actual, polars_s) = results["pandas"], results["polars"]
+                for name in expected:
+                    pd.testing.assert_frame_equal(actual[name], expected[name], check_exact=True,
+                                                  obj=f"{stage} {name} ({rows} rows)")
+                print(f"{rows:>10} {stage:>9} {pandas_s:>9.2f} {polars_s:>9.2f} {pandas_s / polars_s:>7.1f}x")
+
+    print("✅ Both engines produced identical results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Compares rows/sec of the MySQL insert strategies in src/integrations/mysql_db.py.
+
+Run from the project root against a scratch database (it is dropped and recreated):
+
+    python -m benchmarks.bench_insert --rows 1000000 --database bench
+
+The legacy per-row path takes hours at 1M rows, so it is timed on the first
+`--row-limit` rows only and its rows/sec is reported from that sample.
+"""
+import argparse
+import os
+import time
+
+from benchmarks.synthetic import synthetic_frame
+from src.integrations.mysql_db import (bulk_insert, create_database, create_table, db_connection,
+                                      formatting_columns_placeholders)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MySQL insert strategies")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows in the synthetic frame")
+    parser.add_argument("--batch-size", type=int, default=10000, help="rows per batch")
+    parser.add_argument("--row-limit", type=int, default=20000,
+                        help="rows timed for the legacy per-row strategy")
+    parser.add_argument("--strategies", nargs="+", default=["row", "executemany", "load_data"])
+    parser.add_argument("--database", type=str, default="bench", help="scratch database name")
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.rows)
+    schema, _ = formatting_columns_placeholders(df)
+
+    con, mycursor = db_connection(host=os.getenv("HOST"), user="root",
+                                  password=os.getenv("PASSWORD"),
+                                  allow_local_infile="load_data" in args.strategies)
+    if con is None:
+        raise ConnectionError("Benchmark needs a reachable MySQL server (HOST/PASSWORD in .env)")
+    create_database(mycursor=mycursor, database=args.database)
+
+    results = []
+    for strategy in args.strategies:
+        frame = df.head(args.row_limit) if strategy == "row" else df
+        create_table(mycursor=mycursor, database=args.database, table_name="bench", schema=schema)
+
+        start = time.perf_counter()
+        inserted = bulk_insert(con=con, mycursor=mycursor, table_name="bench", df=frame,
+                               strategy=strategy, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        results.append((strategy, inserted, elapsed, inserted / elapsed if elapsed else 0.0))
+
+    mycursor.execute(f"DROP DATABASE IF EXISTS {args.database}")
+    con.close()
+
+    print(f"\n{'strategy':<12} {'rows':>10} {'seconds':>10} {'rows/sec':>12}")
+    for strategy, inserted, elapsed, rate in results:
+        print(f"{strategy:<12} {inserted:>10} {elapsed:>10.2f} {rate:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
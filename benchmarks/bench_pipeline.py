@@ -0,0 +1,256 @@
+"""
+End-to-end benchmark on synthetic CDNOW-shaped data: generates the dataset, then
+runs the ETL split (src/etl_pipeline.py), the refined load (src/database.py), the
+extract (src/query.sql through src/data_analysis_ext.py) and modeling() on it,
+and writes the wall time, throughput and memory of every stage to a JSON file
+that can be compared across commits.
+
+    python -m benchmarks.bench_pipeline --sizes 100000 1000000 --db sqlite
+    python -m benchmarks.bench_pipeline --sizes 1000000 --db mysql --database bench_refined
+    python -m benchmarks.bench_pipeline --sizes 1000000 --compare benchmarks/results/<older>.json
+
+Every stage runs in a fresh process, so its peak RSS is its own. With `--db mysql`
+the load and extract run the real code against the server in `.env` (the scratch
+database is dropped and recreated). With `--db sqlite` (no server needed) a local
+SQLite file stands in; src/database.py's SQL is MySQL-only, so it is filled by
+pandas `to_sql` with the same batch size instead, and that stage is reported as
+`to_sql_baseline` rather than `load`. The extract queries it with the same SQL.
+The step cache is disabled and the model registry, predictions.csv and all
+intermediate files live in the work directory, so the project's data/ and models/
+are left alone.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sqlite3
+import subprocess
+import tempfile
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STAGES = ("generate", "etl", "load", "extract", "modeling")
+
+
+def _isolate(work_dir: Path) -> None:
+    """Keeps this worker off the step cache, the project's metrics log and model registry."""
+    from src import cache, metrics
+
+    cache.cache_settings = lambda: {"enabled": False}
+    metrics.metrics_settings = lambda: {"enabled": True}
+    os.chdir(work_dir)
+
+
+def stage_label(stage: str, db: str) -> str:
+    """The name a stage is reported under; the SQLite load does not run src/database.py."""
+    return "to_sql_baseline" if stage == "load" and db == "sqlite" else stage
+
+
+def _refined_items(work_dir: Path) -> list:
+    """The refined load's import items, reading the ETL output from the work directory."""
+    from src.config import load_config
+
+    config = load_config()
+    return [{"import": {**item["import"], "dirpath": str(work_dir), "load_mode": "full"}}
+            for item in config["cleaned-upload-to-database"]["import"]]
+
+
+def generate(record: dict, work_dir: Path, rows: int, seed: int, **_) -> None:
+    from benchmarks.synthetic import write_cdnow_csv
+
+    record["bytes"] = write_cdnow_csv(work_dir / "original_data.csv", rows, seed=seed)
+    record["rows"] = rows
+
+
+def etl(record: dict, work_dir: Path, **_) -> None:
+    from src.etl_pipeline import process
+
+    frames = process(csv_path=work_dir / "original_data.csv", output_dir=work_dir)
+    record["rows"] = len(frames["sales"])
+    record["bytes"] = sum(path.stat().st_size for path in work_dir.glob("sales.*")) + \
+        sum(path.stat().st_size for path in work_dir.glob("products.*"))
+
+
+def load(record: dict, work_dir: Path, db: str, database: str, **_) -> None:
+    items = _refined_items(work_dir)
+    files = [work_dir / f"{i['import']['prefix_filename']}.{i['import']['file_extension']}" for i in items]
+    record["bytes"] = sum(path.stat().st_size for path in files)
+
+    if db == "mysql":
+        from src.database import process, run_load
+
+        process(database_name=database, database_new=True, full_refresh=True)
+        with ThreadPoolExecutor(max_workers=len(items)) as pool:
+            results = list(pool.map(lambda item: run_load(database, item, True), items))
+        record["rows"] = sum(rows for _, rows, _ in results)
+        return
+
+    # pandas.to_sql baseline, only so the extract has tables to query (see stage_label)
+    from src.utils import read_frame
+
+    with closing(sqlite3.connect(work_dir / "refined.sqlite")) as con:
+        rows = 0
+        for item, path in zip(items, files):
+            cfg = item["import"]
+            df = read_frame(path, file_format=cfg["file_extension"])
+            df.to_sql(cfg["prefix_filename"], con, if_exists="replace", index=False,
+                      chunksize=cfg.get("batch_size", 10000))
+            for cols in cfg.get("indexes", []):
+                con.execute(f"CREATE INDEX idx_{cfg['prefix_filename']}_{'_'.join(cols)} "
+                            f"ON {cfg['prefix_filename']} ({', '.join(cols)})")
+            rows += len(df)
+        con.commit()
+        record["rows"] = rows
+
+
+def extract(record: dict, work_dir: Path, db: str, database: str, **_):
+    import pandas as pd
+    from src.data_analysis_ext import _read_query, run_sql_query_from_file
+
+    query_file = PROJECT_ROOT / "src" / "query.sql"
+    if db == "mysql":
+        df = run_sql_query_from_file(query_file, database=database)
+    else:
+        with closing(sqlite3.connect(work_dir / "refined.sqlite")) as con:
+            df = pd.read_sql(_read_query(query_file), con)
+    record["rows"] = len(df)
+    record["bytes"] = int(df.memory_usage(index=False).sum())
+    return df
+
+
+def modeling(record: dict, work_dir: Path, **_) -> None:
+    import pandas as pd
+    from src import registry
+    from src.modeling import TRANSACTION_COLUMNS, modeling as run_modeling
+
+    registry.registry_settings = lambda: {"location": "local", "path": str(work_dir / "models")}
+    df = pd.read_parquet(work_dir / "extract.parquet", columns=TRANSACTION_COLUMNS)
+    record["bytes"] = int(df.memory_usage(index=False).sum())
+    predictions = run_modeling(df)
+    record["rows"] = len(df)
+    record["customers"] = len(predictions)
+
+
+STAGE_FUNCS: Dict[str, Callable] = {"generate": generate, "etl": etl, "load": load,
+                                    "extract": extract, "modeling": modeling}
+
+
+def run_stage(stage: str, work_dir: Path, **options) -> dict:
+    """
+    Runs one stage in this (fresh) process and returns its measurements.
+
+    A DataFrame returned by the stage is written to <work_dir>/<stage>.parquet for
+    the next stage, outside the timed block.
+    """
+    _isolate(work_dir)
+    from src.metrics import measure
+
+    with measure(stage) as record:
+        handed_on = STAGE_FUNCS[stage](record, work_dir, **options)
+    if handed_on is not None:
+        handed_on.to_parquet(work_dir / f"{stage}.parquet", index=False)
+    seconds = record["seconds"]
+    return {"seconds": seconds,
+            "rows": record["rows"],
+            "bytes": record["bytes"],
+            "rows_per_s": round(record["rows"] / seconds) if seconds and record["rows"] else None,
+            "mb_per_s": round(record["bytes"] / 1024 ** 2 / seconds, 2) if seconds and record["bytes"] else None,
+            "peak_rss_mb": record["process_peak_rss_mb"],  # a fresh process per stage
+            "rss_growth_mb": record.get("rss_growth_mb"),
+            **({"customers": record["customers"]} if "customers" in record else {})}
+
+
+def git_revision() -> dict:
+    """The commit being benchmarked, and whether the tree has uncommitted changes."""
+    def git(*args) -> Optional[str]:
+        try:
+            return subprocess.run(["git", *args], cwd=PROJECT_ROOT, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(status) if status is not None else None}
+
+
+def versions() -> dict:
+    import numpy
+    import pandas
+    import xgboost
+
+    return {"python": platform.python_version(), "pandas": pandas.__version__,
+            "numpy": numpy.__version__, "xgboost": xgboost.__version__}
+
+
+def compare(results: dict, baseline_path: Path) -> None:
+    """Prints every stage's time against a previous results file."""
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+    before = {(run["rows"], stage): m for run in baseline["runs"] for stage, m in run["stages"].items()}
+    print(f"\nAgainst {baseline_path.name} ({(baseline.get('commit') or '?')[:10]}):")
+    print(f"{'rows':>10} {'stage':>15} {'before s':>9} {'after s':>8} {'speedup':>8} {'peak MB':>15}")
+    for run in results["runs"]:
+        for stage, m in run["stages"].items():
+            old = before.get((run["rows"], stage))
+            if old is None:
+                continue
+            print(f"{run['rows']:>10} {stage:>15} {old['seconds']:>9.2f} {m['seconds']:>8.2f} "
+                  f"{old['seconds'] / m['seconds']:>7.2f}x {old['peak_rss_mb']:>7.0f}->{m['peak_rss_mb']:<7.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark on synthetic CDNOW data")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100_000, 1_000_000])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES),
+                        help="stages to time (each needs the ones before it in the work directory)")
+    parser.add_argument("--db", choices=["sqlite", "mysql"], default="sqlite",
+                        help="database for the load and extract stages")
+    parser.add_argument("--database", default="bench_refined", help="scratch MySQL database (dropped!)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--work-dir", type=Path, default=None, help="keep intermediate files here")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="results file (default benchmarks/results/<timestamp>-<commit>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="earlier results file to compare with")
+    args = parser.parse_args()
+
+    revision = git_revision()
+    results = {**revision, "created": datetime.now(timezone.utc).isoformat(),
+               "host": {"platform": platform.platform(), "cpus": os.cpu_count()},
+               "versions": versions(), "db": args.db, "seed": args.seed, "runs": []}
+
+    spawn = multiprocessing.get_context("spawn")
+    print(f"{'rows':>10} {'stage':>15} {'seconds':>8} {'rows/s':>11} {'MB/s':>8} {'peak MB':>8}")
+    for rows in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            work_dir = (args.work_dir / str(rows)) if args.work_dir else Path(tmp)
+            work_dir.mkdir(parents=True, exist_ok=True)
+            run = {"rows": rows, "stages": {}}
+            for stage in args.stages:
+                with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                    m = pool.submit(run_stage, stage, work_dir.resolve(), rows=rows, seed=args.seed,
+                                    db=args.db, database=args.database).result()
+                label = stage_label(stage, args.db)
+                run["stages"][label] = m
+                print(f"{rows:>10} {label:>15} {m['seconds']:>8.2f} {m['rows_per_s'] or 0:>11,} "
+                      f"{m['mb_per_s'] or 0:>8.1f} {m['peak_rss_mb']:>8.0f}")
+            results["runs"].append(run)
+
+    output = args.output or PROJECT_ROOT / "benchmarks" / "results" / (
+        f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{(revision['commit'] or 'unknown')[:10]}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Results written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
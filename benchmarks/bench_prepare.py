@@ -0,0 +1,126 @@
+"""
+Checks the lean src.modeling.prepare_features against the previous implementation
+and reports time and peak traced memory (tracemalloc) for both.
+
+    python -m benchmarks.bench_prepare --sizes 100000 1000000 5000000
+
+Both paths start from the same raw frame with string dates. The legacy path
+merges on random product ids, so the few customers whose ids collide (and whose
+transactions get duplicated) are left out of the comparison. The legacy path is
+only run up to `--legacy-max-rows`.
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_frame
+from src.modeling import build_features, prepare_features, transaction_frame
+
+
+def legacy_prepare_features(original_data: pd.DataFrame, customer_data: pd.DataFrame) -> pd.DataFrame:
+    """Features and targets exactly as modeling() prepared them before the lean pipeline."""
+    #Product Data - Creating product dataframe with fake data -> product_id, product_category, price(from original dataframe)
+    original_data['product_id'] = np.random.randint(10000, 1909221900, len(original_data))
+    product_data = original_data[['product_id', 'price']]
+    original_data.drop(['price'], axis=1, inplace=True)
+
+    #fake list to create product's category columns
+    products = ['fruit', 'vegetables', 'refrigerated items', 'frozen', 'spices and herbs', 'canned foods', 
+                'packaged foods', 'condiments and sauces', 'beverages', 'dairy', 'cheese', 'meat', 'seafood', 
+                'baked goods', 'baking', 'snacks', 'baby products', 'pets', 'personal care', 'medicine', 'kitchen', 
+                'cleaning products']
+    
+    p = np.random.uniform(0, 0.99999, len(products))
+    p=p/sum(p)
+    product_data["product_category"] = np.random.choice(products, size=len(product_data), p=p)
+
+    product_data['product_category'].value_counts().reset_index()
+
+    #Merge Product, customer data into original data
+
+    original_data = original_data.merge(product_data, on='product_id', how='left')
+    original_data = original_data.merge(customer_data, on='customer_id', how='left')
+
+    #CLV
+    original_data['date'] = pd.to_datetime(original_data['date'].astype(str))
+
+    """##Finding First purchase of customer"""
+
+    first_purchases = original_data.sort_values(by=['customer_id','date']).groupby('customer_id').first()
+
+    #ML : feature eng
+
+    n_days=60
+    max_date = original_data['date'].max()
+    cutoff_date = max_date - pd.to_timedelta(n_days, unit='d')
+
+    historical_data = original_data[original_data['date']<=cutoff_date]
+    future_data = original_data[original_data['date']>cutoff_date]
+
+    #Targets DataFrame for ML Modeling
+
+    targets_df = future_data.drop(['quantity'], axis=1)
+
+    targets_df.drop(['date'], axis=1, inplace=True)
+    targets_df = targets_df.groupby('customer_id').sum().rename({'price':'spend_60_day'}, axis=1)
+    targets_df['spend_60_flag'] = 1
+
+    targets_df.drop(['product_category', 'product_id', 'country'], axis=1, inplace=True)
+
+    #Recency, Frequency, Overall Price and Price Mean
+
+    features_df = build_features(historical_data)
+
+    features_df = pd.merge(features_df, targets_df, left_index=True, right_index=True, how="left").fillna(0)
+
+    return features_df
+
+
+def measured(func, *args) -> tuple:
+    """Runs func, returning (result, seconds, peak traced MB)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 ** 2
+
+
+def lean(original_data: pd.DataFrame) -> pd.DataFrame:
+    return prepare_features(transaction_frame(original_data))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark modeling data preparation")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--legacy-max-rows", type=int, default=1_000_000,
+                        help="largest size the legacy implementation is run and compared on")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'legacy s':>9} {'lean s':>8} {'legacy MB':>10} {'lean MB':>8} {'memory':>7}")
+    for rows in args.sizes:
+        df = synthetic_frame(rows)
+        new, new_s, new_mb = measured(lean, df)
+        if rows <= args.legacy_max_rows:
+            customer_data = pd.DataFrame({"customer_id": df["customer_id"].unique(), "country": "x"})
+            np.random.seed(0)
+            old, old_s, old_mb = measured(legacy_prepare_features, df.copy(), customer_data)
+            # Replay the legacy product ids to leave out customers hit by its colliding-id merge
+            np.random.seed(0)
+            product_ids = pd.Series(np.random.randint(10000, 1909221900, rows))
+            collided = df["customer_id"][product_ids.duplicated(keep=False).to_numpy()].unique()
+            pd.testing.assert_frame_equal(new.drop(collided, errors="ignore"),
+                                          old[new.columns].drop(collided, errors="ignore"),
+                                          check_dtype=False, check_index_type=False, rtol=1e-5)
+            print(f"{rows:>10} {old_s:>9.2f} {new_s:>8.2f} {old_mb:>10.0f} {new_mb:>8.0f} "
+                  f"{old_mb / new_mb:>6.1f}x")
+        else:
+            print(f"{rows:>10} {'-':>9} {new_s:>8.2f} {'-':>10} {new_mb:>8.0f} {'-':>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Guards the cold-start cost of every task: imports what `main.py -t <task>` (or a
+`python -m src.pipeline -s <stage>` module stage) loads before doing any work,
+in a fresh interpreter under `python -X importtime`, and reports the import time
+and the heaviest packages.
+
+    python -m benchmarks.bench_startup --repeat 3 --max-seconds 2.5
+
+A task fails the guard when it imports a client library that neither its module
+nor its export sinks use (e.g. the extract pulling in gspread or xgboost), or
+when its best-of-`--repeat` import time exceeds `--max-seconds`; the script then
+exits with status 1.
+"""
+import argparse
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Client libraries worth guarding, by top-level package
+HEAVY = ("boto3", "gspread", "pymysql", "sqlalchemy", "xgboost", "sklearn", "faker", "polars")
+
+# What each task module and export host is expected to import
+MODULE_NEEDS = {
+    "data_analysis_ext": {"sqlalchemy"},
+    "database": {"pymysql", "sqlalchemy"},
+    "etl_pipeline": set(),
+    "modeling": {"xgboost", "sklearn"},  # xgboost imports sklearn itself
+}
+SINK_NEEDS = {"s3": {"boto3"}, "gsheet": {"gspread"}, "mysql": {"sqlalchemy"}, "local": set()}
+SINK_MODULES = {"s3": "src.integrations.s3", "gsheet": "src.integrations.gsheets",
+                "mysql": "src.connections", "local": None}
+
+
+def startup_targets(config: dict) -> Dict[str, Tuple[List[str], Set[str]]]:
+    """
+    Lists the modules each task and module stage imports, with the heavy packages it may load.
+
+    Returns:
+        Dict[str, Tuple[List[str], Set[str]]]: label -> (modules to import, allowed heavy packages).
+    """
+    targets = {}
+    for name, task in config.items():
+        if not isinstance(task, dict) or not ("export" in task or "module" in task):
+            continue
+        module = task.get("module", "data_analysis_ext")
+        hosts = [item["export"]["host"] for item in task.get("export", [])]
+        modules = ["src.pipeline", f"src.{module}"] + [SINK_MODULES[h] for h in hosts if SINK_MODULES[h]]
+        allowed = set(MODULE_NEEDS.get(module, HEAVY)).union(*(SINK_NEEDS[h] for h in hosts))
+        targets[f"task {name}"] = (modules, allowed)
+    for stage in config.get("pipeline", []):
+        if "module" in stage:
+            targets[f"stage {stage['name']}"] = (["src.pipeline", f"src.{stage['module']}"],
+                                                 set(MODULE_NEEDS.get(stage["module"], HEAVY)))
+    return targets
+
+
+def import_profile(modules: List[str]) -> Tuple[float, Counter]:
+    """
+    Imports `modules` in a fresh interpreter with -X importtime.
+
+    Returns:
+        Tuple[float, Counter]: total import seconds, and cumulative seconds per top-level package.
+    """
+    code = "import importlib\n" + "".join(f"importlib.import_module({m!r})\n" for m in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, check=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            entries.append((len(name) - len(name.lstrip()), name.strip().split(".")[0], int(cumulative) / 1e6))
+
+    # Children are printed before their parent, so walk backwards to see each import's parent;
+    # a package is charged where it is entered from another package, so nothing is counted twice
+    total, packages, parents = 0.0, Counter(), []
+    for indent, package, seconds in reversed(entries):
+        while parents and parents[-1][0] >= indent:
+            parents.pop()
+        if not parents:
+            total += seconds
+        if not parents or parents[-1][1] != package:
+            packages[package] += seconds
+        parents.append((indent, package))
+    return total, packages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark and guard task startup imports")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per task; the fastest counts")
+    parser.add_argument("--max-seconds", type=float, default=None, help="fail tasks importing slower than this")
+    args = parser.parse_args()
+
+    from src.config import load_config
+
+    config = load_config()
+
+    failures = []
+    print(f"{'target':<40} {'import s':>9}  heaviest packages (cumulative s)")
+    for label, (modules, allowed) in startup_targets(config).items():
+        runs = [import_profile(modules) for _ in range(args.repeat)]
+        total, packages = min(runs, key=lambda run: run[0])
+        third_party = [(name, seconds) for name, seconds in packages.most_common() if name != "src"]
+        heaviest = ", ".join(f"{name} {seconds:.2f}" for name, seconds in third_party[:4])
+        print(f"{label:<40} {total:>9.2f}  {heaviest}")
+
+        unexpected = sorted(name for name in HEAVY if name in packages and name not in allowed)
+        if unexpected:
+            failures.append(f"{label} imports {', '.join(unexpected)} without using it")
+        if args.max_seconds is not None and total > args.max_seconds:
+            failures.append(f"{label} takes {total:.2f}s to import (budget {args.max_seconds:.2f}s)")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Every task imports only what it uses")
+
+
+if __name__ == "__main__":
+    main()
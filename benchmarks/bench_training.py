@@ -0,0 +1,46 @@
+"""
+Times the concurrent XGBoost fits of src.modeling.train_models and their peak
+memory at growing customer counts, to size the workers the modeling task runs on.
+
+    python -m benchmarks.bench_training --customers 10000 100000 1000000 --n-jobs 8
+
+Each size runs in a fresh process so its peak RSS is not inflated by the previous one.
+Hyperparameters come from the `training` section of config/config.yaml.
+"""
+import argparse
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.synthetic import synthetic_features
+from src.modeling import train_models, training_settings
+
+
+def run(customers: int, n_jobs: int) -> tuple:
+    """Fits both models on `customers` rows; returns (seconds, peak RSS MB, fit seconds per model)."""
+    features_df = synthetic_features(customers).set_index("customer_id")
+    settings = {**training_settings(), "n_jobs": n_jobs}
+    start = time.perf_counter()
+    _, metadata = train_models(features_df, settings)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is reported in KiB on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return elapsed, peak_mb, metadata["fit_seconds"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark CLV model training")
+    parser.add_argument("--customers", nargs="+", type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--n-jobs", type=int, default=0, help="total threads (0 = every core)")
+    args = parser.parse_args()
+
+    print(f"{'customers':>10} {'total s':>9} {'spend s':>9} {'purchase s':>11} {'peak MB':>9}")
+    for customers in args.customers:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            elapsed, peak_mb, fit_seconds = pool.submit(run, customers, args.n_jobs).result()
+        print(f"{customers:>10} {elapsed:>9.2f} {fit_seconds['spend']:>9.2f} "
+              f"{fit_seconds['purchase']:>11.2f} {peak_mb:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
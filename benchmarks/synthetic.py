@@ -0,0 +1,120 @@
+"""Synthetic CDNOW-shaped data shared by the benchmark scripts."""
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.enrichment import COUNTRIES, assign, product_categories
+
+# CDNOW covers 1997-01-01 to 1998-06-30; every customer's first purchase falls in Q1 1997
+CDNOW_START = pd.Timestamp("1997-01-01")
+CDNOW_DAYS = 546
+COHORT_DAYS = 90
+
+
+def synthetic_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Builds a CDNOW-shaped transaction frame with `rows` rows (dates as 'YYYY-MM-DD' strings)."""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("1997-01-01") + pd.to_timedelta(rng.integers(0, 546, rows), unit="D")
+    return pd.DataFrame({
+        "customer_id": rng.integers(1, max(rows // 30, 2), rows),
+        "date": dates.strftime("%Y-%m-%d"),
+        "quantity": rng.integers(1, 10, rows),
+        "price": rng.gamma(2.0, 15.0, rows).round(2),
+    })
+
+
+def synthetic_features(customers: int, seed: int = 42) -> pd.DataFrame:
+    """Builds a per-customer feature/target frame shaped like src/features.sql output."""
+    rng = np.random.default_rng(seed)
+    frequency = rng.poisson(3.0, customers) + 1
+    price_mean = rng.gamma(2.0, 15.0, customers).round(2)
+    spend = np.where(rng.random(customers) < 0.3, rng.gamma(2.0, 20.0, customers), 0.0)
+    recency = -rng.integers(0, 486, customers).astype(float)
+    return pd.DataFrame({
+        "customer_id": np.arange(1, customers + 1),
+        "recency": recency,
+        "frequency": frequency.astype(float),
+        "price_sum": (price_mean * frequency).round(2),
+        "price_mean": price_mean,
+        "spend_60_day": spend.round(2),
+        "spend_60_flag": (spend > 0).astype(float),
+        # Whole history: the 60 days after the cutoff included, one purchase of `spend` in them
+        "scoring_recency": np.where(spend > 0, -rng.integers(0, 60, customers), recency - 60),
+        "scoring_frequency": (frequency + (spend > 0)).astype(float),
+        "scoring_price_sum": (price_mean * frequency + spend).round(2),
+        "scoring_price_mean": ((price_mean * frequency + spend) / (frequency + (spend > 0))).round(2),
+    })
+
+
+# Rows are drawn in seeded blocks of this size, so they do not depend on the chunk size
+ROW_BLOCK = 100_000
+
+
+def _row_draws(seed: int, start: int, size: int) -> np.ndarray:
+    """Four uniform draws for each of the rows [start, start + size)."""
+    first, last = start // ROW_BLOCK, (start + size - 1) // ROW_BLOCK
+    draws = np.concatenate([np.random.default_rng([seed, block]).random((ROW_BLOCK, 4))
+                            for block in range(first, last + 1)])
+    offset = start - first * ROW_BLOCK
+    return draws[offset:offset + size]
+
+
+def cdnow_chunks(rows: int, chunk_rows: int = 1_000_000, customers: Optional[int] = None,
+                 seed: int = 42) -> Iterator[pd.DataFrame]:
+    """
+    Generates CDNOW-shaped transactions in chunks, fully vectorized and reproducible.
+
+    Columns match data/original_data.csv: customer_id, country, date ('YYYY-MM-DD'),
+    product_id, quantity, price and product_category. Customers are drawn with
+    heavy-tailed (lognormal) activity, first buy in Q1 1997 and come back less and
+    less often; country and product_category come from src/enrichment.py. The same
+    seed gives the same data whatever the chunk size.
+
+    Args:
+        rows (int): Transactions to generate.
+        chunk_rows (int, Default=1000000): Rows per chunk.
+        customers (Optional[int]): Distinct customers; about one per three rows by default, as in CDNOW.
+        seed (int, Default=42): Seed of every draw.
+
+    Returns:
+        Iterator[pd.DataFrame]: Chunks of at most `chunk_rows` rows.
+    """
+    customers = customers or max(rows // 3, 1)
+    rng = np.random.default_rng([seed, customers])
+    activity = np.cumsum(rng.lognormal(0.0, 1.2, customers))
+    activity /= activity[-1]
+    cohort_day = rng.integers(0, COHORT_DAYS, customers)
+
+    for start in range(0, rows, chunk_rows):
+        size = min(chunk_rows, rows - start)
+        draws = _row_draws(seed, start, size)
+        # Inverse-CDF draws: customer by activity, exponential days after the cohort day
+        # (mean 150), geometric quantity, exponential unit price
+        customer = np.searchsorted(activity, draws[:, 0], side="right").clip(max=customers - 1)
+        days = np.minimum(cohort_day[customer] - np.log1p(-draws[:, 1]) * 150, CDNOW_DAYS - 1).astype(int)
+        quantity = np.floor(np.log1p(-draws[:, 2]) / np.log(0.45)).astype(int) + 1
+        unit_price = -np.log1p(-draws[:, 3]) * 12.0 + 2.0
+        product_id = np.arange(start, start + size) + 10000
+
+        customer_id = customer + 1
+        yield pd.DataFrame({
+            "customer_id": customer_id,
+            "country": assign(customer_id, COUNTRIES, seed, salt="country"),
+            "date": (CDNOW_START + pd.to_timedelta(days, unit="D")).strftime("%Y-%m-%d"),
+            "product_id": product_id,
+            "quantity": quantity,
+            "price": (quantity * unit_price).round(2),
+            "product_category": product_categories(product_id, seed=seed, settings={}),
+        })
+
+
+def write_cdnow_csv(path: Path, rows: int, chunk_rows: int = 1_000_000, seed: int = 42) -> int:
+    """Writes `rows` CDNOW-shaped transactions to a CSV (one chunk in memory at a time); returns its size in bytes."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        for i, chunk in enumerate(cdnow_chunks(rows, chunk_rows=chunk_rows, seed=seed)):
+            chunk.to_csv(f, index=False, header=i == 0)
+    return path.stat().st_size
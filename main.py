@@ -1,13 +1,6 @@
 import argparse
-import yaml
-import os
-from pathlib import Path
-from src.utils import write_file_s3, gcp_feed_data
-from src.data_analysis_ext import process
-
-# Resolve project root dynamically
-PROJECT_ROOT = Path(__file__).resolve().parent
-CONFIG_PATH = PROJECT_ROOT / "config" / "config.yaml"
+from src.metrics import task_run
+from src.pipeline import load_config, run_task
 
 # Parse task argument
 args = argparse.ArgumentParser(
@@ -18,27 +11,13 @@ args.add_argument(
     help="This will point to a task location in the config.yaml file. \
           Then it will follow the steps for this specific task."
 )
+args.add_argument(
+    "-p", "--profile", action="store_true",
+    help="Profile the task (cProfile, or pyinstrument per metrics.profile.tool in config.yaml)"
+)
 args = args.parse_args()
 
-# Load the config file
-with open(CONFIG_PATH, "r") as f:
-    config = yaml.load(f, Loader=yaml.FullLoader)
-
-# Fetch the export configuration
-config_export = config[args.task]["export"]
-export_cfg = config_export[0]["export"]
-
-# Run data process function
-df = process()
-
-if df is None:
-    raise Exception("❌ DataFrame returned is None. Check your query or DB connection.")
-
-if df is None:
-    raise Exception("❌ DataFrame is None. Check your DB, query, or process function.")
-
-# Export result based on config
-if export_cfg["host"] == "s3":
-    write_file_s3(df, export_cfg["bucket_name"], export_cfg["object_name"])
-elif export_cfg["host"] == "gsheet":
-    gcp_feed_data(export_cfg["spread_sheet_id"], export_cfg["worksheet_name"], df)
+# Run the task (its SQL extract, or its `module`) and export the result to every sink in the config;
+# its steps are recorded per the `metrics` section of config.yaml
+with task_run(args.task, profile=args.profile or None):
+    run_task(args.task, load_config())
@@ -0,0 +1,244 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+import pandas as pd
+
+from src.config import load_config
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+INDEX_FILE = "index.json"
+
+# Hits and misses per step for this process
+_stats: Dict[str, Counter] = {}
+_lock = threading.Lock()
+# Serializes read-modify-write of the index between the threads of this process
+# (concurrent exports and loads); local writes are also atomic across processes
+_index_lock = threading.Lock()
+
+
+def cache_settings() -> dict:
+    """
+    Reads the `step_cache` section of config/config.yaml (parsed once per process).
+
+    Returns:
+        dict: Location and size settings (empty if the section is missing).
+    """
+    return load_config("step_cache")
+
+
+def fingerprint(step: str,
+                files: Iterable[Path] = (),
+                texts: Iterable[str] = (),
+                config: Optional[dict] = None,
+                code: Iterable[Path] = ()) -> str:
+    """
+    Content address of a step's inputs: the same inputs always give the same key.
+
+    Args:
+        step (str): Step name.
+        files (Iterable[Path]): Input files, hashed by content.
+        texts (Iterable[str]): Input text such as SQL queries.
+        config (Optional[dict]): The config slice (and any other JSON-able state) the step reads.
+        code (Iterable[Path]): Source files of the step, so code changes invalidate the entry.
+
+    Returns:
+        str: SHA-256 hex digest.
+    """
+    digest = hashlib.sha256(step.encode())
+    for path in [*files, *code]:
+        digest.update(str(Path(path).name).encode())
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+    for text in texts:
+        digest.update(text.encode())
+    digest.update(json.dumps(config, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class _LocalStore:
+    """Cache blobs below a local directory."""
+
+    def __init__(self, settings: dict) -> None:
+        self.root = PROJECT_ROOT / settings.get("path", "./data/.cache")
+
+    def get(self, name: str) -> Optional[bytes]:
+        path = self.root / name
+        return path.read_bytes() if path.exists() else None
+
+    def put(self, name: str, data: bytes) -> None:
+        """Writes through a temporary file, so readers never see a partly written blob."""
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", delete=False) as tmp:
+            tmp.write(data)
+        os.replace(tmp.name, path)
+
+    def delete(self, name: str) -> None:
+        (self.root / name).unlink(missing_ok=True)
+
+
+class _S3Store:
+    """Cache blobs below `prefix` in `bucket_name`."""
+
+    def __init__(self, settings: dict) -> None:
+        from src.integrations.s3 import auth_aws  # boto3 is only imported for an S3 cache
+
+        self.s3_client = auth_aws()
+        self.bucket = settings["bucket_name"]
+        self.prefix = settings.get("prefix", "cache")
+
+    def get(self, name: str) -> Optional[bytes]:
+        s3_client = self.s3_client
+        try:
+            return s3_client.get_object(Bucket=self.bucket, Key=f"{self.prefix}/{name}")["Body"].read()
+        except s3_client.exceptions.NoSuchKey:
+            return None
+
+    def put(self, name: str, data: bytes) -> None:
+        self.s3_client.put_object(Bucket=self.bucket, Key=f"{self.prefix}/{name}", Body=data)
+
+    def delete(self, name: str) -> None:
+        self.s3_client.delete_object(Bucket=self.bucket, Key=f"{self.prefix}/{name}")
+
+
+def _open_store(settings: dict):
+    return _S3Store(settings) if settings.get("location", "local") == "s3" else _LocalStore(settings)
+
+
+def _read_index(store) -> dict:
+    raw = store.get(INDEX_FILE)
+    return json.loads(raw) if raw else {}
+
+
+def _count(step: str, outcome: str) -> None:
+    with _lock:
+        _stats.setdefault(step, Counter())[outcome] += 1
+
+
+def lookup(step: str, key: Optional[str], settings: Optional[dict] = None) -> Optional[Dict[str, bytes]]:
+    """
+    Returns the cached outputs of a step, or None on a miss.
+
+    Args:
+        step (str): Step name.
+        key (Optional[str]): Fingerprint of the step's inputs; None means the step cannot be cached.
+        settings (Optional[dict]): Cache settings; read from config.yaml when omitted.
+
+    Returns:
+        Optional[Dict[str, bytes]]: Output name -> bytes.
+    """
+    settings = cache_settings() if settings is None else settings
+    if not settings.get("enabled") or key is None:
+        return None
+
+    start = time.perf_counter()
+    backend = _open_store(settings)
+    with _index_lock:
+        entry = _read_index(backend).get(f"{step}/{key}")
+    blobs = None
+    if entry is not None:
+        blobs = {name: backend.get(f"{step}/{key}/{name}") for name in entry["files"]}
+        if any(not data for data in blobs.values()):
+            blobs = None
+
+    if blobs is None:
+        _count(step, "miss")
+        print(f"🗄️  Cache miss for '{step}' ({key[:12]})")
+        return None
+
+    with _index_lock:
+        index = _read_index(backend)
+        if f"{step}/{key}" in index:
+            index[f"{step}/{key}"]["last_used"] = time.time()
+            backend.put(INDEX_FILE, json.dumps(index).encode())
+    _count(step, "hit")
+    print(f"🗄️  Cache hit for '{step}' ({key[:12]}, {entry['size'] / 1024 ** 2:.1f} MB) "
+          f"in {time.perf_counter() - start:.1f}s")
+    return blobs
+
+
+def store(step: str, key: Optional[str], blobs: Dict[str, bytes], settings: Optional[dict] = None) -> None:
+    """
+    Caches the outputs of a step, then evicts least recently used entries beyond `max_size_mb`.
+
+    Args:
+        step (str): Step name.
+        key (Optional[str]): Fingerprint of the step's inputs; None skips caching.
+        blobs (Dict[str, bytes]): Output name -> bytes.
+        settings (Optional[dict]): Cache settings; read from config.yaml when omitted.
+
+    Returns:
+        None
+    """
+    settings = cache_settings() if settings is None else settings
+    if not settings.get("enabled") or key is None:
+        return
+
+    backend = _open_store(settings)
+    for name, data in blobs.items():
+        backend.put(f"{step}/{key}/{name}", data)
+
+    with _index_lock:
+        index = _read_index(backend)
+        index[f"{step}/{key}"] = {"files": sorted(blobs), "size": sum(len(d) for d in blobs.values()),
+                                  "last_used": time.time()}
+
+        max_size = settings.get("max_size_mb", 2048) * 1024 ** 2
+        total = sum(entry["size"] for entry in index.values())
+        for entry_key in sorted(index, key=lambda k: index[k]["last_used"]):
+            if total <= max_size or entry_key == f"{step}/{key}":
+                continue
+            for name in index[entry_key]["files"]:
+                backend.delete(f"{entry_key}/{name}")
+            total -= index.pop(entry_key)["size"]
+            print(f"🗄️  Evicted '{entry_key[:entry_key.index('/') + 13]}' from the cache")
+
+        backend.put(INDEX_FILE, json.dumps(index).encode())
+
+
+def cache_stats() -> Dict[str, dict]:
+    """Returns the hits and misses per step seen by this process."""
+    with _lock:
+        return {step: dict(counts) for step, counts in _stats.items()}
+
+
+def frame_bytes(df: pd.DataFrame) -> bytes:
+    """Encodes a DataFrame as Parquet for the cache."""
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def cached_frame(step: str, key: Optional[str], compute: Callable[[], Optional[pd.DataFrame]],
+                 settings: Optional[dict] = None) -> Optional[pd.DataFrame]:
+    """
+    Returns a step's DataFrame from the cache, or computes and caches it.
+
+    Args:
+        step (str): Step name.
+        key (Optional[str]): Fingerprint of the step's inputs; None always computes.
+        compute (Callable): Produces the DataFrame on a miss (None results are not cached).
+        settings (Optional[dict]): Cache settings; read from config.yaml when omitted.
+
+    Returns:
+        Optional[pd.DataFrame]: The step's output.
+    """
+    settings = cache_settings() if settings is None else settings
+    blobs = lookup(step, key, settings)
+    if blobs is not None:
+        return pd.read_parquet(io.BytesIO(blobs["frame.parquet"]))
+    df = compute()
+    if df is not None:
+        store(step, key, {"frame.parquet": frame_bytes(df)}, settings)
+    return df
@@ -0,0 +1,35 @@
+import copy
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CONFIG_PATH = PROJECT_ROOT / "config" / "config.yaml"
+
+
+@lru_cache(maxsize=None)
+def _read_config() -> dict:
+    """Parses config/config.yaml (once per process)."""
+    with open(CONFIG_PATH, 'r') as f:
+        return yaml.load(f, Loader=yaml.FullLoader) or {}
+
+
+def load_config(section: Optional[str] = None) -> dict:
+    """
+    Reads config/config.yaml, or one of its sections.
+
+    The file is parsed once per process; every call returns a copy, so callers can
+    change what they get back without affecting anyone else.
+
+    Args:
+        section (Optional[str]): Top-level key to return; the whole config when omitted.
+
+    Returns:
+        dict: The config, or the section (empty if it is missing).
+    """
+    config = _read_config()
+    if section is not None:
+        config = config.get(section) or {}
+    return copy.deepcopy(config)
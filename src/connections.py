@@ -0,0 +1,85 @@
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, Engine
+
+from src.config import load_config
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+load_dotenv(dotenv_path=PROJECT_ROOT / ".env")
+
+# One pooled engine per database name (None = server level, no default schema)
+_engines: Dict[Optional[str], Engine] = {}
+_lock = threading.Lock()
+
+
+def connection_settings() -> dict:
+    """
+    Reads the `connections` section of config/config.yaml (parsed once per process).
+
+    Returns:
+        dict: Driver, user and pool settings (empty if the section is missing).
+    """
+    return load_config("connections")
+
+
+def get_engine(database: Optional[str] = None) -> Engine:
+    """
+    Returns the process-wide pooled SQLAlchemy engine for a database, creating it on first use.
+
+    Connections (and their TLS/auth handshakes) are opened once and reused by
+    every caller in the process, for both the loader and the extract.
+
+    Args:
+        database (Optional[str], Default=None): Database name, or None for a server-level engine.
+
+    Returns:
+        Engine: Pooled SQLAlchemy engine.
+    """
+    with _lock:
+        if database not in _engines:
+            settings = connection_settings()
+            url = URL.create(
+                drivername=f"mysql+{settings.get('driver', 'pymysql')}",
+                username=settings.get("user", "root"),
+                password=os.getenv("PASSWORD"),
+                host=os.getenv("HOST"),
+                database=database
+            )
+            _engines[database] = create_engine(
+                url,
+                pool_size=settings.get("pool_size", 5),
+                max_overflow=settings.get("max_overflow", 10),
+                pool_pre_ping=settings.get("pool_pre_ping", True),
+                pool_recycle=settings.get("pool_recycle", 3600),
+                connect_args=settings.get("connect_args") or {}
+            )
+        return _engines[database]
+
+
+def raw_connection(database: Optional[str] = None) -> Tuple[Any, Any]:
+    """
+    Checks a DBAPI connection out of the pooled engine, for code that works with cursors.
+
+    Calling `close()` on the connection returns it to the pool.
+
+    Args:
+        database (Optional[str], Default=None): Database name, or None for a server-level connection.
+
+    Returns:
+        tuple (connection, cursor): Pooled DBAPI connection and a cursor on it.
+    """
+    con = get_engine(database).raw_connection()
+    return con, con.cursor()
+
+
+def dispose_engines() -> None:
+    """Closes every pooled connection and forgets the cached engines."""
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
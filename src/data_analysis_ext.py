@@ -1,17 +1,36 @@
-import os
-from typing import Optional
+import io
+import re
+import tempfile
+from typing import Iterator, Optional, Union
 import pandas as pd
 from dotenv import load_dotenv
 from pathlib import Path
-from sqlalchemy import create_engine
+from sqlalchemy import text
+
+from src.cache import fingerprint, frame_bytes, lookup, store
+from src.connections import get_engine
+from src.metrics import instrumented, note
+from src.utils import FrameStreamWriter
 
 # Load environment variables from the .env file in the project root
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 load_dotenv(dotenv_path=PROJECT_ROOT / ".env")
 
+def _read_query(file_path: Path) -> str:
+    """
+    Reads a .sql file and strips its `USE <database>;` statements.
+
+    The database is already selected by the connection, and a server-side
+    cursor only accepts a single statement.
+    """
+    with open(file_path, 'r') as f:
+        query = f.read()
+    return re.sub(r"^\s*USE\s+\w+\s*;", "", query, flags=re.IGNORECASE | re.MULTILINE).strip()
+
+@instrumented()
 def run_sql_query_from_file(file_path: Path, database: str) -> Optional[pd.DataFrame]:
     """
-    Executes a SQL query from a .sql file using SQLAlchemy engine and returns the result as a DataFrame.
+    Executes a SQL query from a .sql file using the shared pooled engine and returns the result as a DataFrame.
 
     Args:
         file_path : Path
@@ -23,18 +42,13 @@ def run_sql_query_from_file(file_path: Path, database: str) -> Optional[pd.DataF
         Optional[pd.DataFrame] : 
             Query result as a DataFrame if successful, else None.
     """
-    user = os.getenv('USER') or 'root'
-    password = os.getenv('PASSWORD')
-    host = os.getenv('HOST')
-
-    connection_string = f"mysql+pymysql://{user}:{password}@{host}/{database}"
-    engine = create_engine(connection_string)
+    engine = get_engine(database)
+    note(query=Path(file_path).name, database=database)
 
     try:
-        with open(file_path, 'r') as f:
-            query = f.read()
+        query = _read_query(file_path)
 
-        df = pd.read_sql(query, engine)
+        df = pd.read_sql(text(query), engine)
         print(f"✅ Query executed successfully. {len(df)} rows retrieved.")
         return df
 
@@ -45,17 +59,116 @@ def run_sql_query_from_file(file_path: Path, database: str) -> Optional[pd.DataF
 
     return None
 
-def process() -> None:
+def stream_sql_query_from_file(file_path: Path,
+                               database: str,
+                               chunksize: int = 50000) -> Optional[Iterator[pd.DataFrame]]:
+    """
+    Executes a SQL query from a .sql file through a server-side cursor and yields the result in chunks.
+
+    Rows are fetched from MySQL as the consumer iterates, so memory is bounded by
+    `chunksize` and downstream work can start before the query has finished sending.
+
+    Args:
+        file_path : Path
+            Path to the SQL file.
+        database : str
+            Name of the database to connect to.
+        chunksize : int
+            Number of rows per DataFrame chunk.
+
+    Returns:
+        Optional[Iterator[pd.DataFrame]] :
+            Generator of DataFrame chunks if the query file exists, else None.
+    """
+    try:
+        query = _read_query(file_path)
+    except FileNotFoundError:
+        print(f"❌ Query file not found: {file_path}")
+        return None
+
+    def chunks() -> Iterator[pd.DataFrame]:
+        engine = get_engine(database)
+        rows = 0
+        with engine.connect().execution_options(stream_results=True) as con:
+            for chunk in pd.read_sql(text(query), con, chunksize=chunksize):
+                rows += len(chunk)
+                yield chunk
+        print(f"✅ Query streamed successfully. {rows} rows retrieved.")
+
+    return chunks()
+
+def load_state_version(database: str) -> Optional[list]:
+    """
+    Returns what has been loaded into a database, per the loader's `_load_state` table.
+
+    Args:
+        database : str
+            Name of the database.
+
+    Returns:
+        Optional[list] :
+            [table_name, watermark, checksum, rows_loaded] rows, or None if the state is unavailable.
+    """
+    try:
+        with get_engine(database).connect() as con:
+            rows = con.execute(text("SELECT table_name, watermark, checksum, rows_loaded "
+                                    "FROM _load_state ORDER BY table_name")).fetchall()
+        return [list(row) for row in rows]
+    except Exception as e:
+        print(f"Load state of '{database}' unavailable, extract not cached: {e}")
+        return None
+
+def _cache_stream(chunks: Iterator[pd.DataFrame], cache_key: str) -> Iterator[pd.DataFrame]:
+    """
+    Passes streamed chunks through while spooling them to Parquet, cached once the stream
+    completes; an empty stream leaves nothing to read back, so it is not cached.
+    """
+    with tempfile.TemporaryFile() as spool:
+        writer = FrameStreamWriter(spool, file_format="parquet")
+        written = 0
+        for chunk in chunks:
+            writer.write(chunk)
+            written += 1
+            yield chunk
+        writer.close()
+        if written:
+            spool.seek(0)
+            store("extract", cache_key, {"frame.parquet": spool.read()})
+
+def process(chunksize: Optional[int] = None,
+            query_file: str = "query.sql") -> Union[pd.DataFrame, Iterator[pd.DataFrame], None]:
     """
     Runs a SQL query from file, loads data, and returns the DataFrame.
 
+    Args:
+        chunksize (Optional[int]): If set, stream the result as DataFrame chunks of this size.
+        query_file (str): SQL file in src/ to run, e.g. "query.sql" for raw transactions
+            or "features.sql" for per-customer features computed in MySQL.
+
     Returns:
-        None
+        The query result as one DataFrame, a generator of chunks when streaming, or None on failure.
     """
-    file_path = PROJECT_ROOT / "src" / "query.sql"
+    file_path = PROJECT_ROOT / "src" / query_file
     database = "refined"  # Ensure this matches your actual DB name
 
+    # Same query over the same loaded files (per _load_state) gives the same result
+    state = load_state_version(database)
+    cache_key = None
+    if state is not None and file_path.exists():
+        cache_key = fingerprint("extract", texts=[_read_query(file_path)],
+                                config={"database": database, "load_state": state},
+                                code=[Path(__file__)])
+    cached = lookup("extract", cache_key)
+    if cached is not None:
+        return pd.read_parquet(io.BytesIO(cached["frame.parquet"]))
+
+    if chunksize:
+        chunks = stream_sql_query_from_file(file_path=file_path, database=database, chunksize=chunksize)
+        return chunks if chunks is None or cache_key is None else _cache_stream(chunks, cache_key)
+
     data = run_sql_query_from_file(file_path=file_path, database=database)
+    if data is not None:
+        store("extract", cache_key, {"frame.parquet": frame_bytes(data)})
     return data
 
 if __name__ == "__main__":
@@ -1,62 +1,251 @@
 import argparse
-import os
-import yaml
+import itertools
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
+import pandas as pd
 from dotenv import load_dotenv
 
-from utils import (create_database, create_table, db_connection,
-                   formatting_columns_placeholders, get_data, insert_data)
-
-# ──────────────────────────────────────────────
-# Parse CLI arguments
-parser = argparse.ArgumentParser(description="Accessing Database for D2P Project")
-parser.add_argument('-dbn', '--database_new', default=False, type=bool,
-                    help='Use existing database or create a new database')
-parser.add_argument('-db', '--database_name', required=True,
-                    type=str, help='Name of the database')
-parser.add_argument('-t', '--task_name', type=str,
-                    help='task defined in the config file')
-args = parser.parse_args()
-
-# ──────────────────────────────────────────────
-# Setup project root path
+# Setup project root path (and make `src` importable when run as `python src/database.py`)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if __package__ in (None, ""):
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import load_config
+from src.connections import raw_connection
+from src.integrations.mysql_db import (bulk_insert, create_database, create_indexes, create_table,
+                                      formatting_columns_placeholders, get_load_state,
+                                      save_load_state, table_exists)
+from src.metrics import measure
+from src.utils import after_watermark, file_checksum, get_data, get_data_chunks, max_watermark
 
 # Load environment variables safely regardless of working directory
 load_dotenv(dotenv_path=PROJECT_ROOT / ".env")
 
-# Load config YAML safely using full path
-with open(PROJECT_ROOT / "config" / "config.yaml", 'r') as f:
-    config = yaml.load(f, Loader=yaml.FullLoader)
+# ──────────────────────────────────────────────
+def load_item(con, mycursor, database: str, item: dict, full_refresh: bool,
+              frame: Optional[pd.DataFrame] = None) -> int:
+    """
+    Loads one import item of the task into its table.
 
-# Connect to MySQL using credentials from .env
-con, mycursor = db_connection(
-    host=os.getenv("HOST"),
-    user="root",
-    password=os.getenv("PASSWORD")
-)
+    With `load_mode: incremental` the table is kept between runs: an unchanged
+    file (same checksum as the last load) is skipped, and otherwise the rows at or
+    past the stored `watermark_column` value (every row without one) are upserted
+    on the item's `primary_key`. Everything else, and any run with --full_refresh,
+    drops and reloads the table.
 
-# ──────────────────────────────────────────────
-# Run logic based on arguments
-if args.database_new:
-    create_database(mycursor=mycursor, database=args.database_name)
-else:
-    config_import = config[args.task_name]['import']
-    for item in config_import:
-        # Fix 1: Construct absolute path to CSV file
-        data_path = PROJECT_ROOT / item["import"]["dirpath"] / (
-            item["import"]["prefix_filename"] + '.' + item["import"]["file_extension"]
-        )
-
-        table_name = data_path.stem  # cleaner than os.path.basename
+    Args:
+        con: pooled DBAPI connection
+        mycursor: cursor on `con`
+        database (str): database the table lives in
+        item (dict): import item from config.yaml
+        full_refresh (bool): force a full reload
+        frame (Optional[pd.DataFrame]): the file's contents, already in memory
+            (e.g. handed over by the ETL stage); the file is still checksummed
+
+    Returns:
+        int: rows written to the table
+
+    Raises:
+        ValueError: If an incremental item has a `watermark_column` but no `primary_key`.
+        RuntimeError: If fewer rows reached the table than were read; the load state
+            (checksum, watermark) is only saved once every row is in
+    """
+    cfg = item["import"]
+
+    # Fix 1: Construct absolute path to CSV file
+    data_path = PROJECT_ROOT / cfg["dirpath"] / (
+        cfg["prefix_filename"] + '.' + cfg["file_extension"]
+    )
+
+    table_name = data_path.stem  # cleaner than os.path.basename
+
+    watermark_column = cfg.get("watermark_column")
+    upsert = bool(cfg.get("primary_key"))
+    if cfg.get("load_mode") == "incremental" and watermark_column and not upsert:
+        # Rows arriving late on the watermark value must be re-read, which only a key
+        # can deduplicate; without one they would be dropped or inserted twice
+        raise ValueError(f"ETL stopped: '{table_name}' sets a watermark_column without a primary_key; "
+                         "incremental watermark loads upsert on it")
+
+    # Fix 2: Add check in case file was missing
+    if not data_path.exists():
+        raise FileNotFoundError(f"ETL stopped: Could not find {data_path}")
+
+    checksum = file_checksum(data_path)
+    state = get_load_state(mycursor, table_name)
+
+    incremental = (cfg.get("load_mode") == "incremental" and not full_refresh
+                   and state is not None and table_exists(mycursor, table_name))
+    if incremental and state["checksum"] == checksum:
+        print(f"⏭️  '{table_name}' unchanged since the last load, skipping.")
+        return 0
+    if incremental and not upsert:
+        print(f"'{table_name}' has no primary key to upsert on, reloading it fully.")
+        incremental = False
+
+    # Streaming mode keeps only one chunk in memory at a time
+    chunksize = cfg.get("chunksize")
+    if frame is not None:
+        chunks = (frame.iloc[i:i + chunksize] for i in range(0, len(frame), chunksize)) \
+            if chunksize else iter([frame])
+    elif chunksize:
+        chunks = get_data_chunks(csv_file=data_path, chunksize=chunksize)
+    else:
         df = get_data(csv_file=data_path)
+        chunks = None if df is None else iter([df])
+
+    if chunks is None:
+        raise FileNotFoundError(f"ETL stopped: Could not read {data_path}")
+
+    # Schema is inferred from the first chunk only
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
+        raise ValueError(f"ETL stopped: {data_path} contains no rows")
+
+    if not incremental:
+        schema, placeholder_str = formatting_columns_placeholders(
+            df=first_chunk, column_types=cfg.get("columns"))
+        create_table(mycursor=mycursor, database=database,
+                     table_name=table_name, schema=schema, primary_key=cfg.get("primary_key"))
+
+    watermark = state["watermark"] if incremental else None
+    new_watermark = watermark
+    total, rows = 0, 0
+    for chunk in itertools.chain([first_chunk], chunks):
+        if incremental and watermark_column:
+            # The watermark value itself is re-read to pick up late rows; the upsert dedupes them
+            chunk = chunk[after_watermark(chunk[watermark_column], watermark)]
+        if chunk.empty:
+            continue
+        total += bulk_insert(con=con, mycursor=mycursor, table_name=table_name, df=chunk,
+                             strategy=cfg.get("strategy", "executemany"),
+                             batch_size=cfg.get("batch_size", 10000),
+                             upsert=incremental)
+        rows += len(chunk)
+        if watermark_column:
+            new_watermark = max_watermark(chunk[watermark_column], new_watermark)
+    # Upserts count updated rows twice (and unchanged ones not at all), so only a plain insert
+    # can be checked row for row; a failing batch raises in either case
+    if total != rows and not incremental:
+        raise RuntimeError(f"ETL stopped: only {total}/{rows} rows reached '{table_name}'; "
+                           "its load state was not saved, so the next run loads the file again")
+    print(f"✅ {total}/{rows} rows {'upserted into' if incremental else 'inserted into'} '{table_name}'")
+
+    # Secondary indexes are built once the data is in, not maintained during the load
+    if not incremental:
+        create_indexes(mycursor=mycursor, table_name=table_name, indexes=cfg.get("indexes", []))
+
+    save_load_state(con=con, mycursor=mycursor, table_name=table_name,
+                    watermark=new_watermark, checksum=checksum, rows_loaded=total)
+    return total
+
+
+def run_load(database: str, item: dict, full_refresh: bool,
+             frame: Optional[pd.DataFrame] = None) -> Tuple[str, int, float]:
+    """
+    Loads one import item over its own pooled connection and reports its timing.
+
+    Args:
+        database (str): database to load into
+        item (dict): import item from config.yaml
+        full_refresh (bool): force a full reload
+        frame (Optional[pd.DataFrame]): the item's data, if already in memory
+
+    Returns:
+        tuple (str, int, float): table name, rows written and seconds taken
+    """
+    table_name = item["import"]["prefix_filename"]
+    print(f"▶️  Loading '{table_name}'...")
+    start = time.perf_counter()
+    with measure("load_table", database=database, table=table_name) as record:
+        con, mycursor = raw_connection(database=database)
+        try:
+            total = load_item(con, mycursor, database, item, full_refresh, frame)
+        finally:
+            # Return the connection to the pool
+            con.close()
+        record["rows"] = total
+    elapsed = time.perf_counter() - start
+    print(f"⏱️  '{table_name}': {total} rows in {elapsed:.1f}s "
+          f"({total / elapsed if elapsed else 0:.0f} rows/s)")
+    return table_name, total, elapsed
+
+
+# ──────────────────────────────────────────────
+def process(database_name: str,
+            task_name: Optional[str] = None,
+            database_new: bool = False,
+            full_refresh: bool = False,
+            workers: Optional[int] = None,
+            data: Optional[Dict[str, pd.DataFrame]] = None) -> Dict[str, int]:
+    """
+    Creates a database, or loads the import items of a task into it.
+
+    Args:
+        database_name (str): Name of the database
+        task_name (Optional[str]): Import task defined in the config file
+        database_new (bool): Create the database instead of loading a task
+        full_refresh (bool): Drop and reload everything (backfills) instead of loading incrementally
+        workers (Optional[int]): Import items loaded in parallel (overrides load_workers in the config)
+        data (Optional[Dict[str, pd.DataFrame]]): In-memory contents of import files,
+            keyed by prefix_filename (e.g. the ETL stage's output)
+
+    Returns:
+        Dict[str, int]: Rows written per table
+    """
+    if database_new:
+        # Server-level connection from the shared pool; user, driver and pool settings
+        # live under `connections` in config.yaml
+        con, mycursor = raw_connection(database=None)
+        try:
+            # Keep the existing database (and its load state) unless a full refresh is asked for
+            create_database(mycursor=mycursor, database=database_name, drop_existing=full_refresh)
+        finally:
+            con.close()
+        return {}
+
+    config = load_config()
+    config_import = config[task_name]['import'] if task_name else []
+    if not config_import:
+        return {}
+
+    # Independent import items are loaded in parallel, each over its own pooled connection
+    load_workers = workers or config[task_name].get("load_workers", 2)
+    data = data or {}
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(load_workers, len(config_import)))) as pool:
+        futures = [pool.submit(run_load, database_name, item, full_refresh,
+                               data.get(item["import"]["prefix_filename"]))
+                   for item in config_import]
+        results = [future.result() for future in futures]
+    print(f"✅ Loaded {len(results)} table(s), {sum(r[1] for r in results)} rows "
+          f"in {time.perf_counter() - start:.1f}s")
+    return {table_name: rows for table_name, rows, _ in results}
+
+
+def main() -> None:
+    # Parse CLI arguments
+    parser = argparse.ArgumentParser(description="Accessing Database for D2P Project")
+    parser.add_argument('-dbn', '--database_new', default=False, type=bool,
+                        help='Use existing database or create a new database')
+    parser.add_argument('-db', '--database_name', required=True,
+                        type=str, help='Name of the database')
+    parser.add_argument('-t', '--task_name', type=str,
+                        help='task defined in the config file')
+    parser.add_argument('-fr', '--full_refresh', action='store_true',
+                        help='Drop and reload everything (backfills) instead of loading incrementally')
+    parser.add_argument('-w', '--workers', type=int,
+                        help='Import items loaded in parallel (overrides load_workers in the config)')
+    args = parser.parse_args()
+
+    process(database_name=args.database_name, task_name=args.task_name,
+            database_new=args.database_new, full_refresh=args.full_refresh, workers=args.workers)
 
-        # Fix 2: Add check in case file was missing
-        if df is None:
-            raise FileNotFoundError(f"ETL stopped: Could not find {data_path}")
 
-        schema, placeholder_str = formatting_columns_placeholders(df=df)
-        create_table(mycursor=mycursor, database=args.database_name,
-                     table_name=table_name, schema=schema)
-        insert_data(con=con, mycursor=mycursor, table_name=table_name, df=df)
+if __name__ == "__main__":
+    main()
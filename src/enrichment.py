@@ -0,0 +1,129 @@
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.config import load_config
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Precomputed vocabularies, so enrichment needs neither Faker nor a per-row Python loop
+COUNTRIES = (
+    'Argentina', 'Australia', 'Austria', 'Belgium', 'Brazil', 'Canada', 'Chile', 'China',
+    'Denmark', 'Finland', 'France', 'Germany', 'India', 'Ireland', 'Italy', 'Japan',
+    'Mexico', 'Netherlands', 'New Zealand', 'Norway', 'Poland', 'Spain', 'Sweden',
+    'United Kingdom', 'United States of America',
+)
+
+PRODUCT_CATEGORIES = (
+    'fruit', 'vegetables', 'refrigerated items', 'frozen', 'spices and herbs', 'canned foods',
+    'packaged foods', 'condiments and sauces', 'beverages', 'dairy', 'cheese', 'meat', 'seafood',
+    'baked goods', 'baking', 'snacks', 'baby products', 'pets', 'personal care', 'medicine', 'kitchen',
+    'cleaning products',
+)
+
+
+def enrichment_settings() -> dict:
+    """
+    Reads the `enrichment` section of config/config.yaml (parsed once per process).
+
+    Returns:
+        dict: Seed and vocabulary settings (empty if the section is missing).
+    """
+    return load_config("enrichment")
+
+
+def faker_countries(size: int = 25, seed: int = 42) -> tuple:
+    """
+    Draws a country vocabulary from Faker, which is only imported when this is called.
+
+    Args:
+        size (int, Default=25): Countries drawn (duplicates are dropped).
+        seed (int, Default=42): Faker seed.
+
+    Returns:
+        tuple: Sorted, de-duplicated country names.
+    """
+    from faker import Faker
+
+    fake = Faker()
+    fake.seed_instance(seed)
+    return tuple(sorted({fake.country() for _ in range(size)}))
+
+
+def assign(keys: Sequence, vocabulary: Sequence[str], seed: int = 42, salt: str = "") -> pd.Categorical:
+    """
+    Assigns every key a value from `vocabulary`, reproducibly and in bulk.
+
+    The vocabulary weights are drawn once from a seeded numpy Generator, and each
+    key is mapped through a seeded hash of the key itself, so a key gets the same
+    value however the data is ordered or chunked, and the same seed always gives
+    the same assignment.
+
+    Args:
+        keys (Sequence): Keys to enrich, e.g. customer ids (any hashable dtype).
+        vocabulary (Sequence[str]): Values to assign.
+        seed (int, Default=42): Seed for the weights and the key hash.
+        salt (str, Default=""): Separates independent assignments made with the same seed.
+
+    Returns:
+        pd.Categorical: One value per key, with `vocabulary` as the categories.
+    """
+    rng = np.random.default_rng([seed, len(vocabulary), *salt.encode()])
+    weights = rng.uniform(0, 0.99999, len(vocabulary))
+    bounds = np.cumsum(weights / weights.sum())
+    bounds[-1] = 1.0
+
+    # hash_array ignores hash_key for numeric keys, so the seed is mixed in explicitly
+    seed_hash = pd.util.hash_array(np.array([f"{seed}:{salt}"], dtype=object))[0]
+    hashed = pd.util.hash_array(pd.util.hash_array(np.asarray(keys)) ^ seed_hash)
+    # Top 53 bits of the hash as a uniform draw in [0, 1)
+    uniform = (hashed >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+    codes = np.searchsorted(bounds, uniform, side="right")
+    return pd.Categorical.from_codes(codes, categories=list(vocabulary))
+
+
+def customer_countries(customer_ids: Sequence,
+                       seed: Optional[int] = None,
+                       settings: Optional[dict] = None) -> pd.DataFrame:
+    """
+    Builds the synthetic country of every distinct customer.
+
+    Args:
+        customer_ids (Sequence): Customer ids (duplicates are dropped).
+        seed (Optional[int]): Overrides `enrichment.seed`.
+        settings (Optional[dict]): Enrichment settings; read from config.yaml when omitted.
+
+    Returns:
+        pd.DataFrame: customer_id with its categorical country.
+    """
+    settings = enrichment_settings() if settings is None else settings
+    seed = settings.get("seed", 42) if seed is None else seed
+    if settings.get("country_source") == "faker":
+        vocabulary = faker_countries(seed=seed)
+    else:
+        vocabulary = settings.get("countries") or COUNTRIES
+
+    customer_data = pd.DataFrame({'customer_id': pd.unique(np.asarray(customer_ids))})
+    customer_data['country'] = assign(customer_data['customer_id'], vocabulary, seed, salt="country")
+    return customer_data
+
+
+def product_categories(product_ids: Sequence, seed: Optional[int] = None,
+                       settings: Optional[dict] = None) -> pd.Categorical:
+    """
+    Assigns every product id a synthetic category.
+
+    Args:
+        product_ids (Sequence): Product ids, one per row to enrich.
+        seed (Optional[int]): Overrides `enrichment.seed`.
+        settings (Optional[dict]): Enrichment settings; read from config.yaml when omitted.
+
+    Returns:
+        pd.Categorical: One category per product id.
+    """
+    settings = enrichment_settings() if settings is None else settings
+    seed = settings.get("seed", 42) if seed is None else seed
+    return assign(product_ids, settings.get("product_categories") or PRODUCT_CATEGORIES,
+                  seed, salt="category")
@@ -1,37 +1,95 @@
-import pandas as pd
+import io
+import sys
 from pathlib import Path
-from utils import get_data
+from typing import Dict, Optional
+
+import pandas as pd
 
-# Build absolute path to the CSV file
+# Build absolute path to the CSV file (and make `src` importable when run as `python src/etl_pipeline.py`)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
-csv_path = PROJECT_ROOT / "data" / "original_data.csv"
-
-# Loading CDNOW dataset
-cdnow = get_data(csv_path)
-
-# Stop pipeline if file is missing
-if cdnow is None:
-    raise FileNotFoundError(f"ETL stopped: Could not find dataset at {csv_path}")
-
-# Create sales table - includes original customer_id
-sales_data = pd.DataFrame({
-    'customer_id': cdnow['customer_id'],
-    'country': cdnow['country'],
-    'date': cdnow['date'],
-    'product_id': cdnow['product_id']
-})
-
-# Creating product table - includes sample price from original data
-product_data = pd.DataFrame({
-    'product_id': cdnow['product_id'],
-    'quantity': cdnow['quantity'],
-    'price': cdnow['price'],
-    'category': cdnow['product_category']
-})
-
-# Converting the DataFrame to csv files
-output_dir = PROJECT_ROOT / "data"
-sales_data.to_csv(output_dir / "sales.csv", index=False)
-product_data.to_csv(output_dir / "products.csv", index=False)
-
-print("✅ ETL process completed. CSVs saved to:", output_dir)
+if __package__ in (None, ""):
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src import polars_engine
+from src.cache import fingerprint, lookup, store
+from src.config import load_config
+from src.utils import get_data, infer_compression, read_frame, write_frame
+
+
+def process(csv_path: Optional[Path] = None,
+            output_dir: Optional[Path] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Splits the CDNOW dataset into the sales and products files loaded into the refined database.
+
+    Args:
+        csv_path (Optional[Path]): Source dataset; data/original_data.csv by default.
+        output_dir (Optional[Path]): Where the files are written; data/ by default.
+
+    Returns:
+        Dict[str, pd.DataFrame]: The "sales" and "products" frames, as written to data/.
+    """
+    csv_path = Path(csv_path) if csv_path else PROJECT_ROOT / "data" / "original_data.csv"
+
+    # Output format of the intermediate files (see `etl` in config.yaml)
+    etl_cfg = load_config("etl")
+    file_format = etl_cfg.get("format", "csv")
+    categorical_columns = etl_cfg.get("categorical_columns")
+
+    output_dir = Path(output_dir) if output_dir else PROJECT_ROOT / "data"
+    outputs = {"sales": output_dir / f"sales.{file_format}", "products": output_dir / f"products.{file_format}"}
+
+    # Skip the whole step when the dataset, config and code are unchanged since a cached run
+    if not csv_path.exists():
+        raise FileNotFoundError(f"ETL stopped: Could not find dataset at {csv_path}")
+    cache_key = fingerprint("etl", files=[csv_path], config=etl_cfg,
+                            code=[Path(__file__), Path(__file__).with_name("utils.py"),
+                                  Path(__file__).with_name("polars_engine.py")])
+    cached = lookup("etl", cache_key)
+
+    if cached is not None:
+        frames = {}
+        for name, path in outputs.items():
+            path.write_bytes(cached[path.name])
+            frames[name] = read_frame(io.BytesIO(cached[path.name]), file_format)
+        print("✅ ETL outputs restored from the cache to:", output_dir)
+        return frames
+
+    if polars_engine.use_polars() and infer_compression(csv_path.name) is None:
+        # Lazy, multi-threaded scan of only the projected columns (see `engine` in config.yaml)
+        frames = polars_engine.split_dataset(csv_path)
+        sales_data, product_data = frames["sales"], frames["products"]
+    else:
+        # Loading CDNOW dataset
+        cdnow = get_data(csv_path)
+
+        # Stop pipeline if file is missing
+        if cdnow is None:
+            raise FileNotFoundError(f"ETL stopped: Could not find dataset at {csv_path}")
+
+        # Create sales table - includes original customer_id
+        sales_data = pd.DataFrame({
+            'customer_id': cdnow['customer_id'],
+            'country': cdnow['country'],
+            'date': cdnow['date'],
+            'product_id': cdnow['product_id']
+        })
+
+        # Creating product table - includes sample price from original data
+        product_data = pd.DataFrame({
+            'product_id': cdnow['product_id'],
+            'quantity': cdnow['quantity'],
+            'price': cdnow['price'],
+            'category': cdnow['product_category']
+        })
+
+    # Writing the DataFrames in the configured format
+    write_frame(sales_data, outputs["sales"], file_format, categorical_columns)
+    write_frame(product_data, outputs["products"], file_format, categorical_columns)
+    store("etl", cache_key, {path.name: path.read_bytes() for path in outputs.values()})
+
+    print(f"✅ ETL process completed. {file_format} files saved to:", output_dir)
+    return {"sales": sales_data, "products": product_data}
+
+
+if __name__ == "__main__":
+    process()
@@ -0,0 +1,127 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from src.utils import infer_format, write_frame
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def export_s3(df, cfg: dict) -> bool:
+    """Uploads to `bucket_name`/`object_name`; a chunk iterator is streamed as a multipart upload."""
+    from src.integrations.s3 import write_chunks_s3, write_file_s3
+
+    transfer = {"part_size": cfg.get("part_size_mb", 8) * 1024 * 1024,
+                "max_concurrency": cfg.get("max_concurrency", 4),
+                "compression": cfg.get("compression")}
+    upload = write_file_s3 if isinstance(df, pd.DataFrame) else write_chunks_s3
+    return upload(df, cfg["bucket_name"], cfg["object_name"], file_format=cfg.get("format"), **transfer)
+
+
+def export_gsheet(df: pd.DataFrame, cfg: dict) -> bool:
+    """Publishes to `worksheet_name` of `spread_sheet_id`."""
+    from src.integrations.gsheets import gcp_feed_data
+
+    return gcp_feed_data(cfg["spread_sheet_id"], cfg["worksheet_name"], df,
+                         diff=cfg.get("diff", False), max_cells=cfg.get("max_cells", 40000))
+
+
+def export_local(df: pd.DataFrame, cfg: dict) -> bool:
+    """Writes to `path` (relative to the project root), in the format given by `format` or its extension."""
+    path = PROJECT_ROOT / cfg["path"]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_frame(df, path, file_format=cfg.get("format") or infer_format(path),
+                categorical_columns=cfg.get("categorical_columns"))
+    print(f"File written to {path}")
+    return True
+
+
+def export_mysql(df: pd.DataFrame, cfg: dict) -> bool:
+    """Writes to `table_name` in `database` through the shared pooled engine."""
+    from src.connections import get_engine
+
+    df.to_sql(cfg["table_name"], get_engine(cfg["database"]), index=False,
+              if_exists=cfg.get("if_exists", "replace"), chunksize=cfg.get("batch_size", 10000),
+              method="multi")
+    print(f"Table '{cfg['database']}.{cfg['table_name']}' written ({len(df)} rows)")
+    return True
+
+
+# Every sink takes the data and its export config and returns True on success;
+# each imports its client library when it runs, so unused sinks cost nothing at startup
+SINKS: Dict[str, Callable] = {
+    "s3": export_s3,
+    "gsheet": export_gsheet,
+    "local": export_local,
+    "mysql": export_mysql,
+}
+
+
+def _run_sink(df, cfg: dict) -> bool:
+    """
+    Runs one export with its own retries and timing.
+
+    Args:
+        df: DataFrame (or, for a single streamed S3 export, an iterator of chunks).
+        cfg (dict): export config; `retries` (default 2) and `retry_delay` seconds (default 5) are optional.
+
+    Returns:
+        bool: True if the sink eventually succeeded.
+    """
+    sink = SINKS[cfg["host"]]
+    retries = cfg.get("retries", 2)
+    start = time.perf_counter()
+
+    for attempt in range(1, retries + 2):
+        try:
+            if sink(df, cfg):
+                print(f"✅ Export to {cfg['host']} finished in {time.perf_counter() - start:.1f}s "
+                      f"(attempt {attempt})")
+                return True
+        except Exception as e:
+            print(f"❌ Export to {cfg['host']} failed on attempt {attempt}: {e}")
+        # A consumed chunk stream cannot be replayed
+        if attempt <= retries and isinstance(df, pd.DataFrame):
+            time.sleep(cfg.get("retry_delay", 5) * attempt)
+        else:
+            break
+
+    print(f"❌ Export to {cfg['host']} gave up after {time.perf_counter() - start:.1f}s")
+    return False
+
+
+def run_exports(df, exports: List[dict], max_workers: int = 4) -> None:
+    """
+    Sends the data to every configured sink concurrently.
+
+    Each sink runs in its own thread with its own retries, so the export stage
+    takes as long as the slowest sink rather than the sum of all of them.
+
+    Args:
+        df: DataFrame to export (an iterator of chunks is only valid for a single S3 export).
+        exports (List[dict]): the `export` entries of a task in config.yaml.
+        max_workers (int, Default=4): sinks run at the same time.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: If an export names an unknown host.
+        Exception: If any sink still fails after its retries.
+    """
+    unknown = [cfg["host"] for cfg in exports if cfg["host"] not in SINKS]
+    if unknown:
+        raise ValueError(f"Unknown export host(s): {unknown}. Expected one of {list(SINKS)}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(exports)))) as pool:
+        results = list(pool.map(lambda cfg: _run_sink(df, cfg), exports))
+    print(f"Export stage finished in {time.perf_counter() - start:.1f}s "
+          f"({sum(results)}/{len(results)} sinks succeeded)")
+
+    failed = [cfg["host"] for cfg, ok in zip(exports, results) if not ok]
+    if failed:
+        raise Exception(f"❌ Export failed for: {', '.join(failed)}")
@@ -0,0 +1,50 @@
+USE refined;
+
+-- One row per customer with the RFM features over the history up to the
+-- cutoff (max(date) - 60 days) and the spend target over the 60 days after it,
+-- plus the same features over the whole history (scoring_*), as scoring builds
+-- them, which the registered models' drift profile is taken from.
+-- Mirrors the feature engineering in src/modeling.py, so only one row per
+-- customer leaves MySQL instead of one per transaction.
+WITH transactions AS (
+    SELECT
+        s.customer_id,
+        DATE(s.date) AS date,
+        p.price
+    FROM
+        sales s
+    JOIN
+        products p ON s.product_id = p.product_id
+),
+bounds AS (
+    SELECT MAX(date) AS max_date, MAX(date) - INTERVAL 60 DAY AS cutoff_date FROM transactions
+),
+history AS (
+    SELECT MAX(t.date) AS max_date
+    FROM transactions t
+    JOIN bounds b ON t.date <= b.cutoff_date
+)
+SELECT
+    t.customer_id,
+    DATEDIFF(MAX(CASE WHEN t.date <= b.cutoff_date THEN t.date END), h.max_date) AS recency,
+    COUNT(CASE WHEN t.date <= b.cutoff_date THEN 1 END) AS frequency,
+    SUM(CASE WHEN t.date <= b.cutoff_date THEN t.price END) AS price_sum,
+    AVG(CASE WHEN t.date <= b.cutoff_date THEN t.price END) AS price_mean,
+    COALESCE(SUM(CASE WHEN t.date > b.cutoff_date THEN t.price END), 0) AS spend_60_day,
+    MAX(CASE WHEN t.date > b.cutoff_date THEN 1 ELSE 0 END) AS spend_60_flag,
+    DATEDIFF(MAX(t.date), b.max_date) AS scoring_recency,
+    COUNT(*) AS scoring_frequency,
+    SUM(t.price) AS scoring_price_sum,
+    AVG(t.price) AS scoring_price_mean
+FROM
+    transactions t
+CROSS JOIN
+    bounds b
+CROSS JOIN
+    history h
+GROUP BY
+    t.customer_id,
+    b.max_date,
+    h.max_date
+HAVING
+    frequency > 0;
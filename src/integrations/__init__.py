@@ -0,0 +1,5 @@
+"""
+Sources and sinks backed by external services: MySQL (mysql_db), S3 (s3) and
+Google Sheets (gsheets). Each module imports its client libraries at import
+time, so import the one a task needs, not the package as a whole.
+"""
@@ -0,0 +1,208 @@
+import os
+import time
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import gspread
+import pandas as pd
+from google.oauth2.service_account import Credentials
+
+from src.metrics import instrumented, note
+
+
+def gcp_authentication() -> Credentials:
+    """
+    Authenticates with Google Cloud Platform using a service account and environment variables.
+
+    Environment Variables Required:
+        - PRIVATE_KEY_ID
+        - PRIVATE_KEY
+        - CLIENT_EMAIL
+        - CLIENT_ID
+        - CLIENT_X509_CERT_URL
+
+    Returns:
+        Credentials: A Google OAuth2 credentials object used for accessing Google Sheets and Drive APIs.
+    """
+    
+    SCOPES = [
+        "https://spreadsheets.google.com/feeds",
+        'https://www.googleapis.com/auth/spreadsheets',
+        "https://www.googleapis.com/auth/drive.file",
+        "https://www.googleapis.com/auth/drive"
+    ]
+     
+    type = "service_account"
+    project_id = "potent-symbol-456616-g9"
+    private_key_id = os.getenv("PRIVATE_KEY_ID")
+    private_key = os.getenv("PRIVATE_KEY").replace('\\n', '\n')
+    client_email = os.getenv("CLIENT_EMAIL")
+    client_id = os.getenv("CLIENT_ID")
+    auth_uri = "https://accounts.google.com/o/oauth2/auth"
+    token_uri = "https://oauth2.googleapis.com/token"
+    auth_provider_x509_cert_url = "https://www.googleapis.com/oauth2/v1/certs"
+    client_x509_cert_url = os.getenv("CLIENT_X509_CERT_URL")
+    
+    credentials = Credentials.from_service_account_info({
+        "type": type,
+        "project_id": project_id,
+        "private_key_id": private_key_id,
+        "private_key": private_key,
+        "client_email": client_email,
+        "client_id": client_id,
+        "client_x509_cert_url": client_x509_cert_url,
+        "token_uri": token_uri,
+        "auth_uri": auth_uri,
+        "auth_provider_x509_cert_url": auth_provider_x509_cert_url,
+        },
+       scopes=SCOPES
+    )
+    
+    return credentials
+    
+@lru_cache(maxsize=None)
+def gcp_client() -> gspread.Client:
+    """Returns a gspread client authorized once per process with the service account credentials."""
+    return gspread.authorize(gcp_authentication())
+
+
+def _with_backoff(call, *args, retries: int = 5, base_delay: float = 1.0, **kwargs):
+    """
+    Calls a Sheets API method, retrying with exponential backoff on quota (429) and transient 5xx errors.
+
+    Raises:
+        gspread.exceptions.APIError: For any other error, or once the retries are exhausted.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return call(*args, **kwargs)
+        except gspread.exceptions.APIError as e:
+            if e.code not in (429, 500, 503) or attempt == retries:
+                raise
+            delay = base_delay * 2 ** attempt
+            print(f"Sheets API returned {e.code}, retrying in {delay:.0f}s")
+            time.sleep(delay)
+
+
+def _changed_blocks(new_rows: List[List[str]], old_rows: List[List[str]]) -> List[Tuple[int, List[List[str]]]]:
+    """
+    Groups the rows that differ from the published ones into runs of consecutive rows.
+
+    Returns:
+        List[Tuple[int, List[List[str]]]]: (0-based first row, rows) per run.
+    """
+    def trimmed(row: List[str]) -> List[str]:
+        end = len(row)
+        while end and row[end - 1] == "":
+            end -= 1
+        return row[:end]
+
+    blocks = []
+    for i, row in enumerate(new_rows):
+        if i < len(old_rows) and trimmed(old_rows[i]) == trimmed(row):
+            continue
+        if blocks and blocks[-1][0] + len(blocks[-1][1]) == i:
+            blocks[-1][1].append(row)
+        else:
+            blocks.append((i, [row]))
+    return blocks
+
+
+@instrumented()
+def gcp_feed_data(spreadsheet_id: str, 
+                  worksheet_name: str, 
+                  df: pd.DataFrame,
+                  client: Optional[gspread.Client] = None,
+                  diff: bool = False,
+                  max_cells: int = 40000) -> bool:
+    
+    """
+    Uploads a pandas DataFrame to a specified Google Sheets worksheet.
+
+    If the worksheet does not exist, it creates a new one.
+    The rows are written through `batch_update` requests of at most `max_cells`
+    cells each, retried with backoff on 429s. With `diff`, the published values
+    are read back first and only the changed row ranges are rewritten (rows and
+    columns past the end of the new data are cleared); otherwise the worksheet is
+    cleared and rewritten.
+
+    Args:
+        spreadsheet_id (str): The ID of the target Google Spreadsheet.
+        worksheet_name (str): The name of the worksheet to write data into.
+        df (pd.DataFrame): The DataFrame containing data to upload.
+        client (Optional[gspread.Client]): Client to use; defaults to the cached `gcp_client()`.
+        diff (bool, Default=False): Only rewrite rows that differ from the published snapshot.
+        max_cells (int, Default=40000): Upper bound on cells sent per request.
+
+    Returns:
+        bool: True if the worksheet was updated (or already up to date), otherwise False.
+
+    Raises:
+        gspread.exceptions.WorksheetNotFound: If the worksheet doesn't exist (handled by creating a new one).
+        gspread.exceptions.SpreadsheetNotFound: If the spreadsheet ID is invalid or inaccessible.
+    """
+    
+    client = client or gcp_client()
+    
+    # Open the spreadsheet
+    try:
+        spreadsheet = client.open_by_key(spreadsheet_id)
+    except gspread.SpreadsheetNotFound:
+        print(f"Spreadsheet '{spreadsheet_id}' not found.")
+        return False
+    try:
+        sheet = spreadsheet.worksheet(worksheet_name)
+    except gspread.exceptions.WorksheetNotFound:
+        sheet = spreadsheet.add_worksheet(worksheet_name,1,1)
+    
+    new_rows = [df.columns.astype(str).tolist()] + df.astype(str).values.tolist()
+    width = len(new_rows[0])
+
+    if diff:
+        old_rows = _with_backoff(sheet.get_all_values)
+    else:
+        # Clear existing data
+        _with_backoff(sheet.clear)
+        old_rows = []
+
+    # Split the changed runs so that no request carries more than max_cells cells
+    rows_per_block = max(1, max_cells // max(width, 1))
+    ranges = []
+    # Cells past the new width are cleared below, so rows are compared within it
+    for start, rows in _changed_blocks(new_rows, [row[:width] for row in old_rows]):
+        for offset in range(0, len(rows), rows_per_block):
+            block = rows[offset:offset + rows_per_block]
+            first = start + offset + 1
+            a1 = f"{gspread.utils.rowcol_to_a1(first, 1)}:{gspread.utils.rowcol_to_a1(first + len(block) - 1, width)}"
+            ranges.append({"range": a1, "values": block})
+
+    # Pack ranges into batch_update requests
+    batch, cells = [], 0
+    for item in ranges:
+        size = len(item["values"]) * width
+        if batch and cells + size > max_cells:
+            _with_backoff(sheet.batch_update, batch)
+            batch, cells = [], 0
+        batch.append(item)
+        cells += size
+    if batch:
+        _with_backoff(sheet.batch_update, batch)
+
+    # Clear what the new data no longer covers: rows left over from a longer previous
+    # snapshot, and columns left over from a wider one
+    old_width = max((len(row) for row in old_rows), default=0)
+    stale = []
+    if len(old_rows) > len(new_rows):
+        stale.append(f"{gspread.utils.rowcol_to_a1(len(new_rows) + 1, 1)}:"
+                     f"{gspread.utils.rowcol_to_a1(len(old_rows), old_width)}")
+    if old_width > width and any(any(row[width:]) for row in old_rows[:len(new_rows)]):
+        stale.append(f"{gspread.utils.rowcol_to_a1(1, width + 1)}:"
+                     f"{gspread.utils.rowcol_to_a1(min(len(old_rows), len(new_rows)), old_width)}")
+    if stale:
+        _with_backoff(sheet.batch_clear, stale)
+
+    changed = sum(len(item["values"]) for item in ranges)
+    note(rows=len(df), worksheet=worksheet_name, rows_written=changed, ranges=len(ranges))
+    print(f"Google Sheet '{worksheet_name}' updated: {changed}/{len(new_rows)} rows written "
+          f"in {len(ranges)} range(s)")
+    return True
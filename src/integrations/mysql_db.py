@@ -0,0 +1,465 @@
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pandas as pd
+import pymysql
+from pymysql.connections import Connection
+from pymysql.cursors import Cursor
+
+from src.metrics import instrumented, note
+from src.utils import _batches
+
+# SQL Database Functions
+
+# Cursors come from pymysql, either directly (db_connection) or through the pooled
+# engine (src/connections.py)
+DB_ERRORS = pymysql.err.Error
+
+def db_connection(host: str,
+                  user: str,
+                  password: str,
+                  database: Optional[str] = None,
+                  allow_local_infile: bool = False
+                 ) -> Tuple[Optional[Connection], Optional[Cursor]]:
+    """
+    Connects to mysql server.
+
+    Args:
+        host (str): MySQL Server host
+        user (str): MySQL Server username
+        password (str): MySQL Server password
+        database (optional[str], Default=None): Database name (Default: None)
+        allow_local_infile (bool, Default=False): Enables LOAD DATA LOCAL INFILE on the connection
+
+    Returns:
+        tuple (Connection [Optional], Cursor [Optional]): 
+        - Connection object and Cursor object if successful, otherwise None
+
+    Raises:
+        Connection Error: Connection Unsuccessful
+    """
+    try:
+        #connecting to mysql server
+        con = pymysql.connect(
+            host=host,
+            user=user,
+            password=password,
+            database=database,
+            local_infile=allow_local_infile
+        )
+        mycursor = con.cursor()
+        print("Connected to MySQL Successfully")
+        return con, mycursor
+    except DB_ERRORS as e:
+        print(f"Cannot connect to MySQL Server: {e}")
+        return None, None
+
+def create_database(mycursor: Cursor,
+             database: str,
+             drop_existing: bool = True
+            ) -> None:
+    """_summary_
+
+    Args:
+        mycursor (Cursor): mysql cursor to make changed into database
+        database (str): the database that is being modified
+        drop_existing (bool, Default=True): drop and recreate the database; when False
+            an existing database (and its load state) is kept for incremental loads
+    
+    Returns:
+        - None
+    
+    Raises: 
+        -  Error if Database creation fails, otherwise none
+    """
+    #drop db if already exists and create a new one.
+    if drop_existing:
+        mycursor.execute(f"DROP DATABASE IF EXISTS {database}")
+    mycursor.execute(f"CREATE DATABASE IF NOT EXISTS {database}")
+    mycursor.execute("SHOW DATABASES")
+    dbs = mycursor.fetchall()
+    dbs = [db[0] for db in dbs]
+    if database in dbs:
+        print(f"Database: '{database}' created successfully")
+    else:
+        print(f"Failed to create Database: '{database}'")
+      
+
+def create_table(mycursor: Cursor,
+                 database: str,
+                 table_name: str,
+                 schema: str,
+                 primary_key: Optional[List[str]] = None) -> None:
+    """Creates Table
+
+    Secondary indexes are not created here; add them with `create_indexes`
+    once the table is loaded so the bulk insert does not maintain them row by row.
+
+    Args:
+        mycursor (Cursor): MySQL cursor. 
+        table_name (str): table name
+        schema (Tuple): defines the columns of the table and its data types
+        primary_key (Optional[List[str]], Default=None): columns of the primary key
+
+    Returns:
+        - None
+
+    Raises:
+        - Error if Table creation fails, otherwise None 
+
+    """
+    try:
+        #drop table if exists
+        mycursor.execute(f"USE {database}")
+        sql = f"DROP TABLE IF EXISTS {table_name}"
+        mycursor.execute(sql)
+        print(f"Old Table '{table_name}' dropped before creation.")
+        
+        #create a new one
+        if primary_key:
+            schema = f"{schema}, PRIMARY KEY ({', '.join(primary_key)})"
+        sql = f"CREATE TABLE {table_name} ({schema})"
+        mycursor.execute(sql)
+        print(f"Table '{table_name}' created successfully.")
+    except DB_ERRORS as e:
+        print(f"Error creating table: {e}")
+
+
+def create_indexes(mycursor: Cursor, table_name: str, indexes: List[List[str]]) -> None:
+    """Adds secondary indexes to a loaded table in a single ALTER TABLE
+
+    Args:
+        mycursor (Cursor): MySQL cursor.
+        table_name (str): table name
+        indexes (List[List[str]]): one list of column names per index
+
+    Returns:
+        - None
+
+    Raises:
+        - Error if index creation fails, otherwise None
+    """
+    if not indexes:
+        return
+    clauses = [f"ADD INDEX idx_{table_name}_{'_'.join(cols)} ({', '.join(cols)})" for cols in indexes]
+    try:
+        mycursor.execute(f"ALTER TABLE {table_name} {', '.join(clauses)}")
+        print(f"{len(indexes)} index(es) created on '{table_name}'.")
+    except DB_ERRORS as e:
+        print(f"Error creating indexes: {e}")
+
+
+LOAD_STATE_TABLE = "_load_state"
+
+
+def table_exists(mycursor: Cursor, table_name: str) -> bool:
+    """Returns True if `table_name` exists in the current database."""
+    mycursor.execute("SHOW TABLES LIKE %s", (table_name,))
+    return mycursor.fetchone() is not None
+
+
+def get_load_state(mycursor: Cursor, table_name: str) -> Optional[dict]:
+    """
+    Reads the last load's watermark and file checksum for a table.
+
+    The state table is created in the current database on first use.
+
+    Args:
+        mycursor (Cursor): MySQL cursor.
+        table_name (str): table name
+
+    Returns:
+        Optional[dict]: watermark, checksum and rows_loaded, or None if the table was never loaded.
+    """
+    mycursor.execute(f"CREATE TABLE IF NOT EXISTS {LOAD_STATE_TABLE} ("
+                     "table_name VARCHAR(64) PRIMARY KEY, watermark VARCHAR(64), "
+                     "checksum CHAR(64), rows_loaded BIGINT, updated_at DATETIME)")
+    mycursor.execute(f"SELECT watermark, checksum, rows_loaded FROM {LOAD_STATE_TABLE} "
+                     "WHERE table_name = %s", (table_name,))
+    row = mycursor.fetchone()
+    if row is None:
+        return None
+    return {"watermark": row[0], "checksum": row[1], "rows_loaded": row[2]}
+
+
+def save_load_state(con: Connection,
+                    mycursor: Cursor,
+                    table_name: str,
+                    watermark: Optional[str],
+                    checksum: str,
+                    rows_loaded: int) -> None:
+    """
+    Records the watermark and file checksum reached by a load.
+
+    Args:
+        con (Connection): Connection to the MySQL database.
+        mycursor (Cursor): MySQL cursor.
+        table_name (str): table name
+        watermark (Optional[str]): highest watermark value now in the table
+        checksum (str): SHA-256 of the source file that was loaded
+        rows_loaded (int): rows written by this load
+
+    Returns:
+        - None
+    """
+    mycursor.execute(f"INSERT INTO {LOAD_STATE_TABLE} "
+                     "(table_name, watermark, checksum, rows_loaded, updated_at) "
+                     "VALUES (%s, %s, %s, %s, NOW()) ON DUPLICATE KEY UPDATE "
+                     "watermark = VALUES(watermark), checksum = VALUES(checksum), "
+                     "rows_loaded = VALUES(rows_loaded), updated_at = VALUES(updated_at)",
+                     (table_name, watermark, checksum, rows_loaded))
+    con.commit()
+
+
+_DATE_PATTERN = r"\d{4}-\d{2}-\d{2}"
+_DATETIME_PATTERN = r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(\.\d+)?"
+
+def _sql_type(series: pd.Series) -> str:
+    """
+    Maps a pandas column to a MySQL type.
+
+    Numbers are typed by their dtype, never by the values seen, since later chunks
+    and incremental appends can be larger or more precise: integers become INT up
+    to 32 bits and BIGINT above, floats DOUBLE. Narrower or exact types (e.g.
+    DECIMAL for amounts) can be declared in the item's `columns`. ISO
+    date/datetime strings become DATE/DATETIME.
+    """
+    values = series.dropna()
+    if pd.api.types.is_bool_dtype(series):
+        return 'BOOLEAN'
+    if pd.api.types.is_integer_dtype(series):
+        dtype = series.dtype
+        if dtype.itemsize < 4 or (dtype.itemsize == 4 and dtype.kind == 'i'):
+            return 'INT'
+        return 'BIGINT UNSIGNED' if dtype.itemsize == 8 and dtype.kind == 'u' else 'BIGINT'
+    if pd.api.types.is_float_dtype(series):
+        return 'DOUBLE'
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'DATE' if len(values) and (values.dt.normalize() == values).all() else 'DATETIME'
+    text = values.astype(str)
+    if len(text) and text.str.fullmatch(_DATE_PATTERN).all():
+        return 'DATE'
+    if len(text) and text.str.fullmatch(_DATETIME_PATTERN).all():
+        return 'DATETIME'
+    return 'VARCHAR(255)'
+
+
+def formatting_columns_placeholders(df: pd.DataFrame,
+                                    column_types: Optional[dict] = None) -> Tuple[str, str]:
+    """
+    Generates SQL schema and placeholders based on DataFrame columns.
+
+    When streaming, pass the first chunk (or any representative sample);
+    types are inferred from its dtypes (and date strings from its values), so
+    declare a type in `column_types` when the sample is not representative.
+
+    Args:
+        df (pd.DataFrame): Pandas DataFrame containing the dataset, or a sample of it.
+        column_types (Optional[dict], Default=None): SQL type overrides by column name.
+
+    Returns:
+        Tuple[str, str]: SQL schema and value placeholders.
+    """
+    column_types = column_types or {}
+    sql_cols = []
+    placeholders = []
+
+    #changing python types to sql types
+    for col in df.columns:
+        data_type = column_types.get(col) or _sql_type(df[col])
+        sql_cols.append(f"{col} {data_type}")
+        placeholders.append("%s")
+
+    #converting the list as strings
+    schema = ", ".join(sql_cols)
+    placeholder_str = f"({', '.join(placeholders)})"
+
+    return schema, placeholder_str
+            
+
+@instrumented()
+def insert_data(con: Connection, 
+                mycursor: Cursor,
+                table_name: str,
+                df: pd.DataFrame
+                ) -> Optional[int]:
+    """
+    Inserts data into the specified table for specific columns.
+
+    Args:
+        con (Connection): Connection to the MySQL database.
+        mycursor (Cursor): MySQL cursor.
+        table_name (str): Name of the table.
+        df (pd.DataFrame): Pandas DataFrame containing the data.
+
+    Returns:
+        int: Number of rows successfully inserted
+       
+    Raises:
+        pymysql.err.Error: If a row fails to insert (rows committed before it stay in the table)
+    """
+    total=0
+    schema, placeholders = formatting_columns_placeholders(df)
+    cols = ", ".join(df.columns) #deriving column names in the specified df
+    sql_query = f"INSERT INTO {table_name} ({cols}) Values {placeholders}"
+    
+    for _, row in df.iterrows():
+        values = tuple(row) #one row data at a time 
+        try:
+            mycursor.execute(sql_query, values)
+            if mycursor.rowcount == 1: #if the number of row inserted is 1 
+                total+=1
+            con.commit()
+        except DB_ERRORS as e:
+            con.rollback()
+            print(f"❌ Insert failed for '{table_name}' after {total} rows: {e}")
+            raise
+    return total
+
+
+def insert_data_batched(con: Connection,
+                        mycursor: Cursor,
+                        table_name: str,
+                        df: pd.DataFrame,
+                        batch_size: int = 10000,
+                        upsert: bool = False
+                        ) -> int:
+    """
+    Inserts data in batches using `executemany`, committing once per batch.
+
+    PyMySQL rewrites a batched INSERT into a single multi-row VALUES
+    statement, so each batch is one round trip and one transaction.
+
+    Args:
+        con (Connection): Connection to the MySQL database.
+        mycursor (Cursor): MySQL cursor.
+        table_name (str): Name of the table.
+        df (pd.DataFrame): Pandas DataFrame containing the data.
+        batch_size (int, Default=10000): Number of rows sent per batch.
+        upsert (bool, Default=False): Update rows whose primary/unique key already
+            exists (INSERT ... ON DUPLICATE KEY UPDATE) instead of failing.
+
+    Returns:
+        int: Number of rows successfully inserted
+
+    Raises:
+        pymysql.err.Error: If a batch fails; it is rolled back (earlier batches stay committed)
+            and the load stops, so the caller can fail and retry it.
+    """
+    total = 0
+    placeholders = f"({', '.join(['%s'] * len(df.columns))})"
+    cols = ", ".join(df.columns)
+    sql_query = f"INSERT INTO {table_name} ({cols}) VALUES {placeholders}"
+    if upsert:
+        updates = ", ".join(f"{col} = VALUES({col})" for col in df.columns)
+        sql_query = f"{sql_query} ON DUPLICATE KEY UPDATE {updates}"
+
+    for i, batch in enumerate(_batches(df, batch_size), start=1):
+        values = list(batch.itertuples(index=False, name=None))
+        try:
+            mycursor.executemany(sql_query, values)
+            con.commit()
+            total += mycursor.rowcount
+            print(f"Batch {i}: {mycursor.rowcount}/{len(values)} rows inserted into '{table_name}'")
+        except DB_ERRORS as e:
+            con.rollback()
+            print(f"❌ Batch {i} failed for '{table_name}' ({len(values)} rows rolled back): {e}")
+            raise
+    return total
+
+
+def load_data_infile(con: Connection,
+                     mycursor: Cursor,
+                     table_name: str,
+                     df: pd.DataFrame,
+                     batch_size: int = 100000,
+                     upsert: bool = False
+                     ) -> int:
+    """
+    Loads data through `LOAD DATA LOCAL INFILE`, one temporary CSV file and one commit per batch.
+
+    The connection must be opened with `allow_local_infile=True` and the server
+    must have `local_infile` enabled.
+
+    Args:
+        con (Connection): Connection to the MySQL database.
+        mycursor (Cursor): MySQL cursor.
+        table_name (str): Name of the table.
+        df (pd.DataFrame): Pandas DataFrame containing the data.
+        batch_size (int, Default=100000): Number of rows written per temporary file.
+        upsert (bool, Default=False): Replace rows whose primary/unique key already exists.
+
+    Returns:
+        int: Number of rows successfully loaded
+
+    Raises:
+        pymysql.err.Error: If a batch fails; it is rolled back (earlier batches stay committed)
+            and the load stops, so the caller can fail and retry it.
+    """
+    total = 0
+    cols = ", ".join(df.columns)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for i, batch in enumerate(_batches(df, batch_size), start=1):
+            path = Path(tmpdir) / f"{table_name}_{i}.csv"
+            batch.to_csv(path, index=False, header=False, lineterminator="\n")
+            sql_query = (f"LOAD DATA LOCAL INFILE '{path.as_posix()}' "
+                         f"{'REPLACE ' if upsert else ''}INTO TABLE {table_name} "
+                         "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+                         "LINES TERMINATED BY '\\n' "
+                         f"({cols})")
+            try:
+                mycursor.execute(sql_query)
+                con.commit()
+                total += mycursor.rowcount
+                print(f"Batch {i}: {mycursor.rowcount}/{len(batch)} rows loaded into '{table_name}'")
+            except DB_ERRORS as e:
+                con.rollback()
+                print(f"❌ Batch {i} failed for '{table_name}' ({len(batch)} rows rolled back): {e}")
+                raise
+            finally:
+                path.unlink()
+    return total
+
+
+@instrumented()
+def bulk_insert(con: Connection,
+                mycursor: Cursor,
+                table_name: str,
+                df: pd.DataFrame,
+                strategy: str = "executemany",
+                batch_size: int = 10000,
+                upsert: bool = False
+                ) -> int:
+    """
+    Inserts a DataFrame using the given load strategy.
+
+    Args:
+        con (Connection): Connection to the MySQL database.
+        mycursor (Cursor): MySQL cursor.
+        table_name (str): Name of the table.
+        df (pd.DataFrame): Pandas DataFrame containing the data.
+        strategy (str, Default="executemany"): One of "row", "executemany" or "load_data".
+        batch_size (int, Default=10000): Rows per batch (ignored by "row").
+        upsert (bool, Default=False): Update rows whose key already exists (not supported by "row").
+
+    Returns:
+        int: Number of rows successfully inserted
+
+    Raises:
+        ValueError: If the strategy is unknown or cannot upsert.
+        pymysql.err.Error: If a row or batch fails to insert.
+    """
+    note(nbytes=df.memory_usage(index=False).sum(), table=table_name, strategy=strategy)
+    if strategy == "row":
+        if upsert:
+            raise ValueError("Upserts need the 'executemany' or 'load_data' strategy")
+        return insert_data(con=con, mycursor=mycursor, table_name=table_name, df=df)
+    if strategy == "executemany":
+        return insert_data_batched(con=con, mycursor=mycursor, table_name=table_name,
+                                   df=df, batch_size=batch_size, upsert=upsert)
+    if strategy == "load_data":
+        return load_data_infile(con=con, mycursor=mycursor, table_name=table_name,
+                                df=df, batch_size=batch_size, upsert=upsert)
+    raise ValueError(f"Unknown insert strategy: '{strategy}'")
@@ -0,0 +1,410 @@
+import gzip
+import io
+import itertools
+import os
+import time
+import zlib
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Union
+
+import boto3
+import pandas as pd
+from botocore.client import BaseClient
+from botocore.exceptions import ClientError
+
+from src.metrics import instrumented, note
+from src.utils import (FrameStreamWriter, _as_categoricals, _batches, infer_compression,
+                       infer_format, iter_frames, read_frame, write_frame)
+#Amazon Web Services (AWS)
+
+# S3 rejects multipart parts below this size, except the last one
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+def _compressor(compression: Optional[str]):
+    """Returns a streaming compressor object (compress/flush) for "gzip" or "zstd", or None."""
+    if compression is None:
+        return None
+    if compression == "gzip":
+        return zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip header
+    if compression == "zstd":
+        import zstandard  # optional dependency, only needed for zstd
+        return zstandard.ZstdCompressor().compressobj()
+    raise ValueError(f"Unknown compression: '{compression}'")
+
+
+class _PartSink(io.RawIOBase):
+    """
+    Write-only byte sink that can be drained while keeping a running position for writers.
+
+    With a compression, bytes are compressed as they are written; `position`
+    counts the uncompressed bytes the writer sees, `bytes_out` the compressed ones.
+    """
+
+    def __init__(self, compression: Optional[str] = None) -> None:
+        super().__init__()
+        self.buffer = bytearray()
+        self.position = 0
+        self.bytes_out = 0
+        self._compressor = _compressor(compression)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        size = len(data)
+        self.position += size
+        self._append(self._compressor.compress(bytes(data)) if self._compressor else data)
+        return size
+
+    def tell(self) -> int:
+        return self.position
+
+    def finish(self) -> None:
+        """Flushes whatever the compressor still holds into the buffer."""
+        if self._compressor:
+            self._append(self._compressor.flush())
+            self._compressor = None
+
+    def drain(self) -> bytes:
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+    def _append(self, data) -> None:
+        self.buffer += data
+        self.bytes_out += len(data)
+
+
+@lru_cache(maxsize=None)
+def auth_aws() -> BaseClient:
+    """
+    Authenticates and returns an S3 client using the provided AWS credentials and region.
+
+    The client is created once per process and reused (boto3 clients are thread-safe).
+    A failure raises and is not cached, so the next call tries again.
+
+    Returns:
+        BaseClient: An authenticated Boto3 S3 client.
+
+    Raises:
+        BotoCoreError, ClientError: If authentication or connection fails.
+    """
+    return boto3.client('s3', aws_access_key_id=os.getenv('ACCESS_KEY'),
+                        aws_secret_access_key=os.getenv('SECRET_KEY'),
+                        region_name='us-east-2')
+
+
+class _S3RangeFile(io.RawIOBase):
+    """Seekable, read-only view of an S3 object that fetches only the byte ranges asked for."""
+
+    def __init__(self, s3_client: BaseClient, bucket: str, object_name: str, size: int) -> None:
+        super().__init__()
+        self.s3_client, self.bucket, self.object_name = s3_client, bucket, object_name
+        self.size = size
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.size}[whence]
+        self.position = base + offset
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+    def readinto(self, buffer) -> int:
+        if self.position >= self.size or not len(buffer):
+            return 0
+        end = min(self.position + len(buffer), self.size) - 1
+        data = self.s3_client.get_object(Bucket=self.bucket, Key=self.object_name,
+                                         Range=f"bytes={self.position}-{end}")['Body'].read()
+        buffer[:len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+
+def _iter_s3_blocks(s3_client: BaseClient,
+                    bucket: str,
+                    object_name: str,
+                    size: int,
+                    block_size: int,
+                    max_concurrency: int) -> Iterator[bytes]:
+    """Yields an S3 object's bytes in order, fetching up to `max_concurrency` byte ranges ahead in parallel."""
+
+    def fetch(start: int) -> bytes:
+        end = min(start + block_size, size) - 1
+        return s3_client.get_object(Bucket=bucket, Key=object_name,
+                                    Range=f"bytes={start}-{end}")['Body'].read()
+
+    starts = iter(range(0, size, block_size))
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        pending = deque(pool.submit(fetch, start) for start in itertools.islice(starts, max_concurrency))
+        while pending:
+            block = pending.popleft().result()
+            start = next(starts, None)
+            if start is not None:
+                pending.append(pool.submit(fetch, start))
+            yield block
+
+
+class _BlockStream(io.RawIOBase):
+    """Read-only file object over an iterator of byte blocks."""
+
+    def __init__(self, blocks: Iterator[bytes]) -> None:
+        super().__init__()
+        self.blocks = blocks
+        self.leftover = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not len(self.leftover):
+            block = next(self.blocks, None)
+            if block is None:
+                return 0
+            self.leftover = memoryview(block)
+        size = min(len(buffer), len(self.leftover))
+        buffer[:size] = self.leftover[:size]
+        self.leftover = self.leftover[size:]
+        return size
+
+
+def _decompressed(stream: io.RawIOBase, compression: Optional[str]):
+    """Wraps a raw byte stream so it is buffered and decompressed on the fly."""
+    stream = io.BufferedReader(stream)
+    if compression is None:
+        return stream
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=stream)
+    if compression == "zstd":
+        import zstandard  # optional dependency, only needed for zstd
+        return zstandard.ZstdDecompressor().stream_reader(stream)
+    raise ValueError(f"Unknown compression: '{compression}'")
+
+
+@instrumented()
+def read_file_s3(bucket: str, 
+                 object_name: str,
+                 file_format: Optional[str] = None,
+                 columns: Optional[List[str]] = None,
+                 chunksize: Optional[int] = None,
+                 block_size: int = 8 * 1024 * 1024,
+                 max_concurrency: int = 4) -> Union[pd.DataFrame, Iterator[pd.DataFrame], None]:
+    """
+    Reads a file from S3 and loads it into a pandas DataFrame.
+
+    Uncompressed Parquet is read through byte-range requests for the footer and
+    the projected column chunks only. Everything else is downloaded as parallel
+    byte-range GETs (up to `max_concurrency` blocks ahead) that are decompressed
+    (.gz / .zst) and parsed as they arrive.
+
+    Parameters:
+        bucket (str): The S3 bucket name.
+        file_name (str): The name of the file in the bucket.
+        file_format (Optional[str]): "csv", "parquet" or "feather"; inferred from the extension if None.
+        columns (Optional[List[str]]): Only load these columns.
+        chunksize (Optional[int]): Return an iterator of DataFrames of this many rows (CSV/Parquet).
+        block_size (int, Default=8 MiB): Bytes per range request.
+        max_concurrency (int, Default=4): Range requests in flight.
+
+    With `chunksize`, the recorded read_file_s3 step only covers opening the
+    object (the HEAD request, and the footer for Parquet) and is marked
+    `streamed`; the chunks are downloaded, and timed, by the step consuming them.
+
+    Returns:
+        pd.DataFrame: Data loaded from the file in the specified bucket
+        (an iterator of DataFrames when `chunksize` is set, None if the request fails).
+    
+    Raises:
+        ClientError: If there is an issue with the AWS request (e.g., file not found).
+        Exception: For any other unforeseen errors during the file reading or DataFrame creation.
+    """
+    file_format = file_format or infer_format(object_name)
+    compression = infer_compression(object_name)
+    df = None
+    
+    try:
+        s3_client = auth_aws()
+        size = s3_client.head_object(Bucket=bucket, Key=object_name)['ContentLength']
+        note(nbytes=size, object=f"s3://{bucket}/{object_name}", streamed=bool(chunksize))
+
+        if file_format == "parquet" and compression is None:
+            source = _S3RangeFile(s3_client, bucket, object_name, size)
+            if chunksize:
+                return iter_frames(source, file_format="parquet", chunksize=chunksize, columns=columns)
+            import pyarrow.parquet as pq
+            df = pq.read_table(source, columns=columns).to_pandas()
+        else:
+            blocks = _iter_s3_blocks(s3_client, bucket, object_name, size, block_size, max_concurrency)
+            stream = _decompressed(_BlockStream(blocks), compression)
+            if file_format == "csv":
+                reader = pd.read_csv(stream, usecols=columns, chunksize=chunksize)
+                if chunksize:
+                    return reader
+                df = reader
+            else:
+                # Feather (and compressed Parquet) need the whole object to be seekable
+                df = read_frame(io.BytesIO(stream.read()), file_format=file_format, columns=columns)
+        print(f"✅ Loaded {len(df)} rows x {len(df.columns)} columns from s3://{bucket}/{object_name}")
+    except ClientError as e:
+        print(e)
+    return df
+
+@instrumented()
+def write_file_s3(df: pd.DataFrame, 
+                  bucket: str, 
+                  object_name: str,
+                  file_format: Optional[str] = None,
+                  categorical_columns: Optional[List[str]] = None,
+                  batch_rows: int = 100000,
+                  **transfer) -> bool:
+    """
+    Uploads a pandas DataFrame as a CSV, Parquet or Feather file to a specified S3 bucket.
+
+    CSV and Parquet are encoded `batch_rows` rows at a time into a multipart
+    upload (see `write_chunks_s3`), so no full serialized copy of the frame is
+    built; Feather needs the whole frame and is sent with a single put.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to upload.
+        bucket (str): The name of the S3 bucket.
+        object_name (str): The key (file name) for the object in the S3 bucket.
+        file_format (Optional[str]): "csv", "parquet" or "feather"; inferred from the extension if None.
+        categorical_columns (Optional[List[str]]): Columns to dictionary-encode (Parquet/Feather).
+        batch_rows (int, Default=100000): Rows encoded per batch.
+        **transfer: `part_size`, `max_concurrency` and `compression`, passed to `write_chunks_s3`.
+
+    Returns:
+        bool: True if the upload succeeded, otherwise False.
+
+    Raises:
+        ValueError: If `object_name` is not provided.
+        ClientError: If there is an issue with the S3 request (e.g., invalid bucket, permissions issue).
+    """
+
+    if object_name is None:
+        raise ValueError("You must provide an object_name when uploading a DataFrame.")
+
+    file_format = file_format or infer_format(object_name)
+    df = _as_categoricals(df, categorical_columns)
+    note(rows=len(df), object=f"s3://{bucket}/{object_name}")
+
+    if file_format != "feather":
+        return write_chunks_s3(_batches(df, batch_rows), bucket, object_name,
+                               file_format=file_format, **transfer)
+    
+    try:
+        s3_client = auth_aws()
+        buffer = io.BytesIO()
+        write_frame(df, buffer, file_format=file_format)
+        s3_client.put_object(Bucket=bucket, Key=object_name, Body=buffer.getvalue())
+        note(nbytes=buffer.tell())
+        print("File uploaded Successfully")
+        return True
+    except ClientError as e:
+        print(e)
+        return False
+
+
+@instrumented()
+def write_chunks_s3(chunks: Iterable[pd.DataFrame],
+                    bucket: str,
+                    object_name: str,
+                    part_size: int = 8 * 1024 * 1024,
+                    file_format: Optional[str] = None,
+                    compression: Optional[str] = None,
+                    max_concurrency: int = 4) -> bool:
+    """
+    Uploads a stream of DataFrame chunks as one CSV or Parquet object through an S3 multipart upload.
+
+    Chunks are encoded (and optionally gzip/zstd compressed) as they arrive, and
+    a part is handed to a thread pool whenever the buffer reaches `part_size`.
+    At most `max_concurrency` parts are in flight, so memory stays bounded at
+    roughly that many parts while the uploads overlap with encoding. The multipart
+    upload is aborted on any failure, in S3 or in the chunks and their encoding.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): DataFrame chunks sharing the same columns.
+        bucket (str): The name of the S3 bucket.
+        object_name (str): The key (file name) for the object in the S3 bucket.
+        part_size (int, Default=8 MiB): Buffered bytes per part (S3 minimum is 5 MiB).
+        file_format (Optional[str]): "csv" or "parquet"; inferred from the extension if None.
+        compression (Optional[str]): "gzip" or "zstd"; inferred from a .gz/.zst extension if None.
+        max_concurrency (int, Default=4): Parts uploaded in parallel.
+
+    Returns:
+        bool: True if the upload succeeded, otherwise False.
+
+    Raises:
+        ValueError: If `object_name` is not provided, or `part_size` is below the 5 MiB S3 minimum.
+        Exception: Whatever the chunks or their encoding raised (the multipart upload is
+            aborted first); S3 errors are printed and reported as False instead.
+    """
+    if object_name is None:
+        raise ValueError("You must provide an object_name when uploading a DataFrame.")
+    if part_size < MIN_PART_SIZE:
+        # S3 would only refuse the parts when the upload is completed, after sending them all
+        raise ValueError(f"part_size must be at least {MIN_PART_SIZE} bytes (5 MiB), got {part_size}.")
+
+    sink = _PartSink(compression=compression or infer_compression(object_name))
+    writer = FrameStreamWriter(sink, file_format=file_format or infer_format(object_name))
+    s3_client = auth_aws()
+    upload_id = s3_client.create_multipart_upload(Bucket=bucket, Key=object_name)["UploadId"]
+    futures, in_flight = [], set()
+    rows = 0
+    start = time.perf_counter()
+
+    def upload_part(part_number: int, body: bytes) -> dict:
+        part = s3_client.upload_part(Bucket=bucket, Key=object_name, UploadId=upload_id,
+                                     PartNumber=part_number, Body=body)
+        return {"PartNumber": part_number, "ETag": part["ETag"]}
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+
+            def submit(body: bytes) -> None:
+                nonlocal in_flight
+                if len(in_flight) >= max_concurrency:
+                    _, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                future = pool.submit(upload_part, len(futures) + 1, body)
+                futures.append(future)
+                in_flight.add(future)
+
+            for chunk in chunks:
+                writer.write(chunk)
+                rows += len(chunk)
+                if len(sink.buffer) >= part_size:
+                    submit(sink.drain())
+            writer.close()
+            sink.finish()
+            if sink.buffer or not futures:
+                submit(sink.drain())
+            parts = [future.result() for future in futures]
+
+        s3_client.complete_multipart_upload(Bucket=bucket, Key=object_name, UploadId=upload_id,
+                                            MultipartUpload={"Parts": parts})
+        elapsed = time.perf_counter() - start
+        note(rows=rows, nbytes=sink.bytes_out, object=f"s3://{bucket}/{object_name}", parts=len(parts))
+        megabytes = sink.bytes_out / (1024 * 1024)
+        print(f"File uploaded Successfully ({len(parts)} parts, {megabytes:.1f} MB "
+              f"in {elapsed:.1f}s, {megabytes / elapsed if elapsed else 0:.1f} MB/s)")
+        return True
+    except BaseException as e:
+        # Whatever failed (S3, or the chunks and their encoding, e.g. a database error in a
+        # streamed extract), don't leave a billed, orphaned multipart upload behind
+        try:
+            s3_client.abort_multipart_upload(Bucket=bucket, Key=object_name, UploadId=upload_id)
+        except ClientError as abort_error:
+            print(f"❌ Could not abort the multipart upload of s3://{bucket}/{object_name}: {abort_error}")
+        if not isinstance(e, ClientError):
+            raise
+        print(e)
+        return False
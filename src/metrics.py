@@ -0,0 +1,293 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, Optional
+
+from src.config import load_config
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+try:
+    import resource  # Unix only; peak RSS is reported as None elsewhere
+except ImportError:
+    resource = None
+
+# Finished steps of this process not yet written to a Prometheus textfile; write_textfile
+# takes a task's steps out, and the oldest are dropped past MAX_RECORDS (e.g. steps run
+# outside any task in a long-lived process)
+MAX_RECORDS = 10_000
+_records: Deque[dict] = deque(maxlen=MAX_RECORDS)
+_lock = threading.Lock()
+# Open steps per thread (the innermost receives note()), and the task being run
+_local = threading.local()
+_task: Optional[str] = None
+
+
+def metrics_settings() -> dict:
+    """
+    Reads the `metrics` section of config/config.yaml (parsed once per process).
+
+    Returns:
+        dict: Output and profiling settings (empty if the section is missing).
+    """
+    return load_config("metrics")
+
+
+def process_peak_rss_mb() -> Optional[float]:
+    """High-water resident set size of the whole process so far, in MB (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB on Linux
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def _stack() -> list:
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def note(rows: Optional[int] = None, nbytes: Optional[int] = None, **fields) -> None:
+    """
+    Adds rows, bytes or other fields to the innermost step open in this thread.
+
+    Does nothing outside a step, so instrumented code can call it unconditionally.
+    """
+    stack = _stack()
+    if not stack:
+        return
+    record = stack[-1]
+    if rows is not None:
+        record["rows"] = int(rows)
+    if nbytes is not None:
+        record["bytes"] = int(nbytes)
+    record.update(fields)
+
+
+def _emit(record: dict, settings: dict) -> None:
+    """Keeps the record for the textfile and appends it to the JSON log."""
+    with _lock:
+        _records.append(record)
+        if settings.get("json_log"):
+            path = PROJECT_ROOT / settings["json_log"]
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+
+
+@contextmanager
+def measure(step: str, **labels) -> Iterator[dict]:
+    """
+    Records a step's wall time, rows, bytes and memory.
+
+    The record is yielded so the body can fill in `rows` and `bytes` (or call
+    `note`); it is logged when the step ends, also when it raises. Memory is the
+    process-wide RSS high-water mark when the step ended (`process_peak_rss_mb`, which
+    earlier steps may have set) and how much the step raised it (`rss_growth_mb`).
+
+    Args:
+        step (str): Step name, e.g. "read_file_s3" or "modeling.train".
+        **labels: Extra fields for the record, e.g. table or object names.
+
+    Yields:
+        dict: The step's record.
+    """
+    settings = metrics_settings()
+    if not settings.get("enabled", True):
+        yield {}
+        return
+
+    record = {"step": step, "task": _task, **labels, "rows": None, "bytes": None}
+    rss_before = process_peak_rss_mb()
+    stack = _stack()
+    stack.append(record)
+    start = time.perf_counter()
+    try:
+        yield record
+        record["status"] = "ok"
+    except BaseException:
+        record["status"] = "error"
+        raise
+    finally:
+        stack.pop()
+        record["seconds"] = round(time.perf_counter() - start, 6)
+        rss_after = process_peak_rss_mb()
+        record["process_peak_rss_mb"] = None if rss_after is None else round(rss_after, 1)
+        if rss_before is not None:
+            record["rss_growth_mb"] = round(rss_after - rss_before, 1)
+        record["ts"] = datetime.now(timezone.utc).isoformat()
+        _emit(record, settings)
+
+
+def _result_size(result) -> Dict[str, int]:
+    """Rows and in-memory bytes of a DataFrame result, or the count returned by a loader."""
+    if hasattr(result, "memory_usage") and hasattr(result, "columns"):
+        return {"rows": len(result), "bytes": int(result.memory_usage(index=False).sum())}
+    if isinstance(result, int) and not isinstance(result, bool):
+        return {"rows": result}
+    return {}
+
+
+def instrumented(step: Optional[str] = None) -> Callable:
+    """
+    Decorator measuring every call of a function as a step (named after the function by default).
+
+    Rows and bytes are taken from a DataFrame (or row count) result unless the
+    function reported them itself through `note`.
+    """
+    def decorator(func: Callable) -> Callable:
+        name = step or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with measure(name) as record:
+                result = func(*args, **kwargs)
+                for key, value in _result_size(result).items():
+                    if record.get(key) is None:
+                        record[key] = value
+                return result
+        return wrapper
+    return decorator
+
+
+def write_textfile(task: str, directory: Optional[Path] = None) -> Optional[Path]:
+    """
+    Writes a task's steps as Prometheus metrics, for node_exporter's textfile collector.
+
+    Every task gets its own d2p_<task>.prom, so tasks run in separate processes
+    (e.g. one pipeline stage per Airflow retry) do not overwrite each other's
+    metrics. Steps are summed per step name; the file is replaced atomically. The
+    task's steps are dropped from memory once taken, also when no directory is set.
+
+    Args:
+        task (str): Task or stage name.
+        directory (Optional[Path]): Output directory; `metrics.prometheus_textfile_dir` when omitted.
+
+    Returns:
+        Optional[Path]: The file written, or None when no textfile directory is configured.
+    """
+    with _lock:
+        taken = [record for record in _records if record.get("task") == task]
+        kept = [record for record in _records if record.get("task") != task]
+        _records.clear()
+        _records.extend(kept)
+
+    settings = metrics_settings()
+    if directory is None:
+        if not settings.get("prometheus_textfile_dir"):
+            return None
+        directory = PROJECT_ROOT / settings["prometheus_textfile_dir"]
+    path = Path(directory) / f"d2p_{task}.prom"
+
+    totals: Dict[tuple, dict] = {}
+    for record in taken:
+        key = (task, record["step"])
+        total = totals.setdefault(key, {"calls": 0, "errors": 0, "seconds": 0.0, "rows": 0, "bytes": 0,
+                                        "rss_growth_bytes": 0, "process_peak_rss_bytes": 0})
+        total["calls"] += 1
+        total["errors"] += record.get("status") == "error"
+        total["seconds"] += record["seconds"]
+        total["rows"] += record.get("rows") or 0
+        total["bytes"] += record.get("bytes") or 0
+        total["rss_growth_bytes"] = max(total["rss_growth_bytes"],
+                                        int((record.get("rss_growth_mb") or 0) * 1024 ** 2))
+        total["process_peak_rss_bytes"] = max(total["process_peak_rss_bytes"],
+                                              int((record.get("process_peak_rss_mb") or 0) * 1024 ** 2))
+
+    help_text = {"calls": "Times the step ran", "errors": "Times the step raised",
+                 "seconds": "Wall time spent in the step", "rows": "Rows the step handled",
+                 "bytes": "Bytes the step read, wrote or held",
+                 "rss_growth_bytes": "Most the step raised the process peak resident set size",
+                 "process_peak_rss_bytes": "Peak resident set size of the whole process when the step ended"}
+    lines = []
+    for metric, text in help_text.items():
+        lines += [f"# HELP d2p_step_{metric} {text} (last run).", f"# TYPE d2p_step_{metric} gauge"]
+        for (task, step), total in sorted(totals.items()):
+            lines.append(f'd2p_step_{metric}{{task="{task}",step="{step}"}} {total[metric]}')
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text("\n".join(lines) + "\n")
+    os.replace(tmp, path)
+    return path
+
+
+@contextmanager
+def profiled(name: str, enabled: Optional[bool] = None) -> Iterator[None]:
+    """
+    Profiles a whole task with cProfile or pyinstrument when it is opted in.
+
+    A task is profiled when `enabled` is True, or when it is listed in
+    `metrics.profile.tasks`. cProfile dumps `<dir>/<name>-<timestamp>.prof` (open
+    with pstats or snakeviz) and prints the top functions; pyinstrument writes an
+    HTML report.
+
+    Args:
+        name (str): Task or stage name.
+        enabled (Optional[bool]): Force profiling on or off; config decides when None.
+    """
+    profile_cfg = metrics_settings().get("profile") or {}
+    if enabled is None:
+        enabled = name in (profile_cfg.get("tasks") or [])
+    if not enabled:
+        yield
+        return
+
+    out_dir = PROJECT_ROOT / profile_cfg.get("dir", "./data/profiles")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = out_dir / f"{name}-{datetime.now().strftime('%Y%m%dT%H%M%S')}"
+
+    if profile_cfg.get("tool", "cprofile") == "pyinstrument":
+        from pyinstrument import Profiler  # optional dependency, only needed for this tool
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            stem.with_suffix(".html").write_text(profiler.output_html())
+            print(f"🔬 Profile of '{name}' written to {stem.with_suffix('.html')}")
+        return
+
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(stem.with_suffix(".prof"))
+        print(f"🔬 Profile of '{name}' written to {stem.with_suffix('.prof')}")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+
+
+@contextmanager
+def task_run(name: str, profile: Optional[bool] = None) -> Iterator[None]:
+    """
+    Runs a task (or pipeline stage) as a measured step: every step inside is labelled
+    with it, it is profiled when opted in, and the textfile is refreshed at the end.
+
+    Args:
+        name (str): Task or stage name.
+        profile (Optional[bool]): Force profiling on or off; `metrics.profile.tasks` decides when None.
+    """
+    global _task
+    previous, _task = _task, name
+    try:
+        with profiled(name, profile), measure("task"):
+            yield
+    finally:
+        _task = previous
+        if metrics_settings().get("enabled", True):
+            write_textfile(name)
@@ -1,142 +1,305 @@
+import hashlib
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
 import numpy as np
 import pandas as pd
-from faker import Faker
-from xgboost import XGBClassifier, XGBRegressor
-
-from src.utils import read_file_s3
-
-fake = Faker()
-
-#modeling function for gathering insights
-def modeling(original_data: pd.DataFrame) -> pd.DataFrame:
+import xgboost
+from xgboost import XGBClassifier, XGBModel, XGBRegressor
+
+from src import polars_engine
+from src.cache import cached_frame, fingerprint
+from src.config import load_config
+from src.enrichment import customer_countries, enrichment_settings
+from src.metrics import instrumented, measure, note
+from src.registry import (load_manifest, load_model, needs_retrain, profile_from_moments, registry_settings,
+                          retrain_due, save_model)
+from src.utils import read_frame, write_frame
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+TRANSACTION_COLUMNS = ['customer_id', 'date', 'quantity', 'price']
+FEATURE_COLUMNS = ['recency', 'frequency', 'price_sum', 'price_mean']
+TARGET_COLUMNS = ['spend_60_day', 'spend_60_flag']
+# FEATURE_COLUMNS over the whole history, as src/features.sql exports them next to the training window
+SCORING_COLUMNS = ['scoring_recency', 'scoring_frequency', 'scoring_price_sum', 'scoring_price_mean']
+
+def build_features(historical_data: pd.DataFrame) -> pd.DataFrame:
     """
-    Builds a CLV model using synthetic customer and product data, 
-    then trains regression and classification models to predict 
-    customer spending and likelihood of purchase.
+    Computes the per-customer RFM features in a single groupby pass.
 
     Parameters:
-        original_data : pd.DataFrame (raw sales data)
+        historical_data : pd.DataFrame (transactions with customer_id, datetime date and price)
 
     Returns:
-        pd.DataFrame: DataFrame with customer features, predicted spend, and purchase probability.
+        pd.DataFrame: One row per customer_id with recency (days from the last
+        overall purchase, <= 0), frequency, price_sum and price_mean.
     """
-    
-    customer_data = original_data[['customer_id']]
-    customer_data.drop_duplicates(inplace=True)
+    if polars_engine.use_polars():
+        return polars_engine.build_features(historical_data)
 
-    #creating fake column which will include the country of customer
-    countries = []
+    max_date = historical_data['date'].max()
 
-    for i in range(25):
-        countries.append(fake.country())
+    #sums accumulate in float64 (prices are float32 after transaction_frame), as in the polars engine
+    prices = historical_data['price'].astype(np.float64)
+    features_df = historical_data.assign(price=prices).groupby('customer_id').agg(
+        last_purchase=('date', 'max'),
+        frequency=('date', 'count'),
+        price_sum=('price', 'sum'),
+        price_mean=('price', 'mean'),
+    )
 
-        countries = list(set(countries))
+    last_purchase = features_df.pop('last_purchase').to_numpy(dtype='datetime64[ns]')
+    features_df.insert(0, 'recency', (last_purchase - max_date.to_datetime64()) / np.timedelta64(1, 'D'))
 
-    p = np.random.uniform(0, 0.99999, len(countries))
-    p = p/sum(p)
-    customer_data['country'] = np.random.choice(countries, size=len(customer_data), p=p)
+    return features_df
 
-    customer_data['country'].value_counts().reset_index()
+def parse_dates(dates: pd.Series) -> pd.Series:
+    """Parses transaction dates, leaving already parsed ones untouched (YYYYMMDD integers are read as text)."""
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    if pd.api.types.is_integer_dtype(dates):
+        dates = dates.astype(str)
+    return pd.to_datetime(dates)
 
-    #Product Data - Creating product dataframe with fake data -> product_id, product_category, price(from original dataframe)
-    original_data['product_id'] = np.random.randint(10000, 1909221900, len(original_data))
-    product_data = original_data[['product_id', 'price']]
-    original_data.drop(['price'], axis=1, inplace=True)
+@instrumented("modeling.prepare")
+def transaction_frame(original_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Projects raw transactions onto the columns the features need, in compact dtypes.
 
-    #fake list to create product's category columns
-    products = ['fruit', 'vegetables', 'refrigerated items', 'frozen', 'spices and herbs', 'canned foods', 
-                'packaged foods', 'condiments and sauces', 'beverages', 'dairy', 'cheese', 'meat', 'seafood', 
-                'baked goods', 'baking', 'snacks', 'baby products', 'pets', 'personal care', 'medicine', 'kitchen', 
-                'cleaning products']
-    
-    p = np.random.uniform(0, 0.99999, len(products))
-    p=p/sum(p)
-    product_data["product_category"] = np.random.choice(products, size=len(product_data), p=p)
+    customer_id is downcast to the narrowest integer type and price to float32
+    (XGBoost trains on float32 anyway); the other columns are never copied.
 
-    product_data['product_category'].value_counts().reset_index()
+    Parameters:
+        original_data : pd.DataFrame (raw sales data, one row per transaction)
 
-    #Merge Product, customer data into original data
+    Returns:
+        pd.DataFrame: customer_id, datetime date and price.
+    """
+    if polars_engine.use_polars():
+        transactions = polars_engine.transaction_frame(original_data)
+        if transactions is not None:
+            return transactions
+    return pd.DataFrame({
+        'customer_id': pd.to_numeric(original_data['customer_id'], downcast='integer'),
+        'date': parse_dates(original_data['date']),
+        'price': original_data['price'].astype(np.float32),
+    }, copy=False)
+
+def prepare_features(transactions: pd.DataFrame) -> pd.DataFrame:
+    """
+    Splits transactions at the 60-day cutoff and builds the per-customer
+    features (before the cutoff) and targets (after it).
 
-    original_data = original_data.merge(product_data, on='product_id', how='left')
-    original_data = original_data.merge(customer_data, on='customer_id', how='left')
+    Parameters:
+        transactions : pd.DataFrame (output of transaction_frame)
 
-    #CLV
-    original_data['date'] = pd.to_datetime(original_data['date'].astype(str))
+    Returns:
+        pd.DataFrame: One row per customer_id with FEATURE_COLUMNS and TARGET_COLUMNS (float32).
+    """
+    n_days=60
+    if polars_engine.use_polars():
+        return polars_engine.prepare_features(transactions, n_days)
 
-    """##Finding First purchase of customer"""
+    cutoff_date = transactions['date'].max() - pd.to_timedelta(n_days, unit='D')
+    in_history = (transactions['date'] <= cutoff_date).to_numpy()
 
-    first_purchases = original_data.sort_values(by=['customer_id','date']).groupby('customer_id').first()
+    #Recency, Frequency, Overall Price and Price Mean
+    features_df = build_features(transactions[in_history])
 
-    #ML : feature eng
+    #Targets: spend in the 60 days after the cutoff, for customers with a purchase before it
+    future = transactions.loc[~in_history, ['customer_id', 'price']]
+    spend = future['price'].astype(np.float64).groupby(future['customer_id']).sum()
+    features_df['spend_60_day'] = spend.reindex(features_df.index, fill_value=0)
+    features_df['spend_60_flag'] = features_df.index.isin(spend.index)
 
-    n_days=60
-    max_date = original_data['date'].max()
-    cutoff_date = max_date - pd.to_timedelta(n_days, unit='d')
+    return features_df.astype(np.float32)
 
-    historical_data = original_data[original_data['date']<=cutoff_date]
-    future_data = original_data[original_data['date']>cutoff_date]
+@instrumented("modeling.enrich")
+def enrich_customers(original_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Assigns every customer a synthetic country (reproducible; see src/enrichment.py).
 
-    #Targets DataFrame for ML Modeling
+    Parameters:
+        original_data : pd.DataFrame (raw sales data or per-customer features)
 
-    targets_df = future_data.drop(['quantity'], axis=1)
+    Returns:
+        pd.DataFrame: customer_id with its country.
+    """
+    return customer_countries(original_data['customer_id'])
 
-    targets_df.drop(['date'], axis=1, inplace=True)
-    targets_df = targets_df.groupby('customer_id').sum().rename({'price':'spend_60_day'}, axis=1)
-    targets_df['spend_60_flag'] = 1
+def is_aggregated(original_data: pd.DataFrame) -> bool:
+    """True when the input already holds per-customer features and targets (src/features.sql)."""
+    return set(FEATURE_COLUMNS + TARGET_COLUMNS).issubset(original_data.columns)
 
-    targets_df.drop(['product_category', 'product_id', 'country'], axis=1, inplace=True)
+def aggregated_scoring_features(features: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the scoring FEATURE_COLUMNS of per-customer features aggregated by src/features.sql.
 
-    #Recency
+    Parameters:
+        features : pd.DataFrame (output of src/features.sql)
 
-    max_date = historical_data['date'].max()
+    Returns:
+        pd.DataFrame: FEATURE_COLUMNS computed over the whole history (the SCORING_COLUMNS),
+        or over the training window for exports made before those columns existed.
+    """
+    if set(SCORING_COLUMNS).issubset(features.columns):
+        return features[SCORING_COLUMNS].set_axis(FEATURE_COLUMNS, axis=1)
+    return features[FEATURE_COLUMNS]
 
-    recency_df = historical_data[['customer_id', 'date']].groupby('customer_id').apply(lambda x: (x['date'].max() - max_date) / pd.to_timedelta(1, "day"))
-    recency_df = recency_df.to_frame(name='recency')
+@instrumented("modeling.features")
+def training_frame(original_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the per-customer features and targets the models are trained on.
 
-    #Frequency
+    Parameters:
+        original_data : pd.DataFrame (raw sales data, or per-customer features
+            and targets already aggregated by src/features.sql)
 
-    frequency_df = historical_data[['customer_id', 'date']].groupby('customer_id').count().set_axis(['frequency'],axis=1)
-    # frequency_df = frequency_df.rename(columns = {"date":"frequency"})
+    Returns:
+        pd.DataFrame: One row per customer_id with FEATURE_COLUMNS and TARGET_COLUMNS.
+    """
+    if is_aggregated(original_data):
+        #already aggregated per customer in MySQL (src/features.sql)
+        return original_data.set_index('customer_id')[FEATURE_COLUMNS + TARGET_COLUMNS].astype(np.float32)
+    return prepare_features(transaction_frame(original_data))
 
-    #Overall Price and Price Mean
+@instrumented("modeling.scoring_features")
+def scoring_frame(original_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the per-customer features to score, computed over the whole history
+    (no 60-day holdout) so predictions look 60 days past the latest transaction.
 
-    price_df = historical_data[['customer_id','price']].groupby('customer_id').agg({
-        'price':['sum','mean']
-    }).set_axis({"price_sum","price_mean"},axis=1)
+    Parameters:
+        original_data : pd.DataFrame (raw sales data, or per-customer features
+            already aggregated by src/features.sql)
 
-    features_df = pd.concat([recency_df,frequency_df,price_df], axis=1)
+    Returns:
+        pd.DataFrame: One row per customer_id with FEATURE_COLUMNS.
+    """
+    if is_aggregated(original_data):
+        return aggregated_scoring_features(original_data.set_index('customer_id')).astype(np.float32)
+    return build_features(transaction_frame(original_data)).astype(np.float32)
 
-    features_df = pd.merge(features_df, targets_df, left_index=True, right_index=True, how="left").fillna(0)
+def training_settings() -> dict:
+    """
+    Reads the `training` section of config/config.yaml (parsed once per process).
 
-    #ML: Modelling
+    Returns:
+        dict: Threading, validation and per-model hyperparameters (empty if the section is missing).
+    """
+    return load_config("training")
 
-    #Regression
+def thread_budget(n_jobs: Optional[int], parts: int = 2) -> List[int]:
+    """
+    Splits a thread budget between models fitted at the same time.
 
-    X= features_df[['recency','frequency','price_sum','price_mean']]
-    y= features_df[['spend_60_day','spend_60_flag']]
+    Parameters:
+        n_jobs : Optional[int] (total threads; 0 or None uses every core)
+        parts : int (models sharing the budget)
 
-    xgbr = XGBRegressor(verbosity=0, random_state=42)
+    Returns:
+        List[int]: Threads per model, at least one each.
+    """
+    total = n_jobs or os.cpu_count() or 1
+    return [max(1, total // parts + (i < total % parts)) for i in range(parts)]
+
+@instrumented("modeling.train")
+def train_models(features_df: pd.DataFrame,
+                 settings: Optional[dict] = None) -> Tuple[Dict[str, XGBModel], dict]:
+    """
+    Trains the spend regressor and the purchase classifier concurrently.
+
+    Both use the histogram tree method by default and stop early on a held-out
+    validation split; hyperparameters and the thread budget, which is split
+    between the two fits, come from the `training` section of config.yaml.
+
+    Parameters:
+        features_df : pd.DataFrame (FEATURE_COLUMNS and TARGET_COLUMNS per customer)
+        settings : Optional[dict] (training settings; read from config.yaml when omitted)
 
-    xgbr.fit(X,y)
+    Returns:
+        tuple (models, metadata): Estimators keyed by registry name, and training metadata.
+    """
+    settings = training_settings() if settings is None else settings
+
+    note(rows=len(features_df))
+    X= features_df[FEATURE_COLUMNS]
+    y= features_df[TARGET_COLUMNS]
+
+    validation_fraction = settings.get("validation_fraction", 0.2)
+    if validation_fraction:
+        from sklearn.model_selection import train_test_split
+        X_train, X_val, y_train, y_val = train_test_split(
+            X, y, test_size=validation_fraction, random_state=settings.get("random_state", 42))
+    else:
+        X_train, X_val, y_train, y_val = X, X, y, y
+    early_stopping = settings.get("early_stopping_rounds", 20) if validation_fraction else None
+    reg_jobs, cls_jobs = thread_budget(settings.get("n_jobs"))
 
-    score = xgbr.score(X, y)
-    print("Training score: ", score)
+    #Regression
 
-    predictions = xgbr.predict(X)
+    xgbr = XGBRegressor(**{"verbosity": 0, "random_state": 42, "tree_method": "hist",
+                           **settings.get("regressor", {}),
+                           "n_jobs": reg_jobs, "early_stopping_rounds": early_stopping})
 
     #Classification
 
-    y_prob = features_df['spend_60_flag']
+    xgb_classification = XGBClassifier(**{"objective": "reg:squarederror", "random_state": 123,
+                                          "tree_method": "hist",
+                                          **settings.get("classifier", {}),
+                                          "n_jobs": cls_jobs, "early_stopping_rounds": early_stopping})
+
+    def fit(model: XGBModel, target_train, target_val) -> float:
+        start = time.perf_counter()
+        eval_set = [(X_val, target_val)] if early_stopping else None
+        model.fit(X_train, target_train, eval_set=eval_set, verbose=False)
+        return time.perf_counter() - start
+
+    # XGBoost releases the GIL while boosting, so both fits run in parallel
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        reg_fit = pool.submit(fit, xgbr, y_train, y_val)
+        cls_fit = pool.submit(fit, xgb_classification, y_train['spend_60_flag'], y_val['spend_60_flag'])
+        reg_seconds, cls_seconds = reg_fit.result(), cls_fit.result()
+
+    score = xgbr.score(X_val, y_val)
+    print("Validation score: ", score)
+    score_prob = xgb_classification.score(X_val, y_val['spend_60_flag'])
+    print(f"Fitted regressor in {reg_seconds:.1f}s ({reg_jobs} threads), "
+          f"classifier in {cls_seconds:.1f}s ({cls_jobs} threads)")
+
+    metadata = {"customers": len(features_df),
+                "validation_rows": len(X_val),
+                "spend_r2": float(score),
+                "purchase_accuracy": float(score_prob),
+                "best_iteration": {"spend": getattr(xgbr, "best_iteration", None),
+                                   "purchase": getattr(xgb_classification, "best_iteration", None)},
+                "fit_seconds": {"spend": reg_seconds, "purchase": cls_seconds}}
+    return {"spend": xgbr, "purchase": xgb_classification}, metadata
+
+@instrumented("modeling.predict")
+def predict(models: Dict[str, XGBModel], features_df: pd.DataFrame,
+            customer_data: pd.DataFrame, write_csv: bool = True) -> pd.DataFrame:
+    """
+    Scores customers with trained (or registry-loaded) models.
 
-    xgb_classification = XGBClassifier(
-        objective    = "reg:squarederror",
-        random_state = 123
-    )
+    Parameters:
+        models : dict (the "spend" regressor and "purchase" classifier)
+        features_df : pd.DataFrame (FEATURE_COLUMNS, optionally TARGET_COLUMNS, per customer)
+        customer_data : pd.DataFrame (customer_id with its synthetic country)
+        write_csv : bool (also write predictions.csv)
 
-    xgb_classification.fit(X, y_prob)
-    score = xgb_classification.score(X, y_prob)
+    Returns:
+        pd.DataFrame: DataFrame with customer features, predicted spend, and purchase probability.
+    """
+    X = features_df[FEATURE_COLUMNS]
 
-    predictions_prob = xgb_classification.predict_proba(X)
+    predictions = models["spend"].predict(X)
+    predictions_prob = models["purchase"].predict_proba(X)
 
     predictions_df = pd.concat([
             pd.DataFrame(predictions)[[1]].set_axis(['pred_spend'], axis=1),
@@ -145,24 +308,357 @@ def modeling(original_data: pd.DataFrame) -> pd.DataFrame:
 
     predictions_df = predictions_df.merge(customer_data, on='customer_id', how='left')
 
-    predictions_df.to_csv('predictions.csv', index=False)
+    if write_csv:
+        predictions_df.to_csv('predictions.csv', index=False)
+
+    return predictions_df
+
+def fit_and_register(original_data: pd.DataFrame,
+                     reference: pd.DataFrame) -> Tuple[Dict[str, XGBModel], pd.DataFrame]:
+    """
+    Trains both models and registers them as the latest version in the model registry.
+
+    Parameters:
+        original_data : pd.DataFrame (transactions or per-customer features and targets)
+        reference : pd.DataFrame (scoring features of the same data, for later drift checks)
+
+    Returns:
+        tuple (models, features_df): Trained estimators and the frame they were trained on.
+    """
+    features_df = training_frame(original_data)
+    models, metadata = train_models(features_df)
+    with measure("modeling.register"):
+        save_model(models, FEATURE_COLUMNS, reference, metadata=metadata)
+    return models, features_df
+
+# ──────────────────────────────────────────────
+# Out-of-core training: per-customer feature chunks are spooled to Parquet parts
+# and fed to XGBoost through a DataIter, so memory is bounded by the chunk size
+
+class FeatureParts(xgboost.DataIter):
+    """
+    Feeds spooled Parquet feature parts to XGBoost one part at a time.
+
+    Customers are assigned to the validation split by a hash of customer_id, so
+    every pass over the parts sees the same split without holding it in memory.
+    """
+
+    def __init__(self, parts: List[Path], target, validation: bool,
+                 validation_fraction: float, cache_prefix: str) -> None:
+        self._parts = parts
+        self._target = target
+        self._validation = validation
+        self._validation_fraction = validation_fraction
+        self._position = 0
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data) -> bool:
+        while self._position < len(self._parts):
+            part = read_frame(self._parts[self._position], file_format="parquet")
+            self._position += 1
+            held_out = in_validation(part['customer_id'], self._validation_fraction)
+            part = part[held_out if self._validation else ~held_out]
+            if len(part):
+                input_data(data=part[FEATURE_COLUMNS], label=part[self._target])
+                return True
+        return False
+
+    def reset(self) -> None:
+        self._position = 0
+
+
+def in_validation(customer_ids: pd.Series, validation_fraction: float) -> np.ndarray:
+    """Deterministically marks about `validation_fraction` of the customers as held out."""
+    buckets = pd.util.hash_pandas_object(customer_ids, index=False).to_numpy() % 10000
+    return buckets < validation_fraction * 10000
+
+
+@instrumented("modeling.spool")
+def spool_parts(chunks: Iterator[pd.DataFrame], directory: Path) -> Tuple[List[Path], dict]:
+    """
+    Writes per-customer feature chunks to Parquet parts and profiles them on the way.
+
+    Parameters:
+        chunks : Iterator[pd.DataFrame] (per-customer FEATURE_COLUMNS and TARGET_COLUMNS,
+            e.g. the streamed src/features.sql extract)
+        directory : Path (where the parts are written)
+
+    Returns:
+        tuple (parts, profile): Part paths and the drift profile of their scoring features
+        (see aggregated_scoring_features), as scoring_frame builds them.
+
+    Raises:
+        ValueError: If a chunk holds raw transactions instead of per-customer features.
+    """
+    parts = []
+    count, sums, squares = 0, np.zeros(len(FEATURE_COLUMNS)), np.zeros(len(FEATURE_COLUMNS))
+    for chunk in chunks:
+        if not is_aggregated(chunk):
+            raise ValueError("External-memory training needs per-customer features "
+                             "(src/features.sql), not raw transactions")
+        # MySQL returns DECIMAL sums as decimal.Decimal and counts as integers; XGBoost only
+        # takes numeric dtypes, so features and labels are spooled as float32, as in training_frame
+        part = chunk[FEATURE_COLUMNS + TARGET_COLUMNS].astype(np.float32)
+        part.insert(0, 'customer_id', chunk['customer_id'])
+        path = directory / f"part-{len(parts):05d}.parquet"
+        write_frame(part, path, file_format="parquet")
+        parts.append(path)
+
+        values = aggregated_scoring_features(chunk).to_numpy(dtype=np.float64)
+        count += len(values)
+        sums += values.sum(axis=0)
+        squares += (values ** 2).sum(axis=0)
+    if not count:
+        raise ValueError("External-memory training received no rows")
+    note(rows=count, nbytes=sum(path.stat().st_size for path in parts), parts=len(parts))
+    print(f"Spooled {count} customers into {len(parts)} parts")
+    return parts, profile_from_moments(FEATURE_COLUMNS, count, sums, squares)
+
+
+def _booster_params(model_settings: dict, n_jobs: int) -> Tuple[dict, int]:
+    """Translates sklearn-style model settings into xgboost.train params and a round count."""
+    params = {k: v for k, v in model_settings.items() if k not in ("n_estimators", "random_state")}
+    params.update({"tree_method": params.get("tree_method", "hist"),
+                   "seed": model_settings.get("random_state", 0), "nthread": n_jobs})
+    return params, model_settings.get("n_estimators", 100)
+
+
+@instrumented("modeling.train")
+def train_models_external(parts: List[Path], cache_dir: Path,
+                          settings: Optional[dict] = None) -> Tuple[Dict[str, XGBModel], dict]:
+    """
+    Trains both models from spooled feature parts through external-memory quantile DMatrices.
+
+    Uses the same `training` settings as train_models (hyperparameters, validation
+    split, early stopping and the split thread budget); the validation split is
+    chosen by customer_id hash instead of at random.
+
+    Parameters:
+        parts : List[Path] (Parquet parts written by spool_parts)
+        cache_dir : Path (directory for XGBoost's page cache)
+        settings : Optional[dict] (training settings; read from config.yaml when omitted)
 
+    Returns:
+        tuple (models, metadata): Estimators keyed by registry name, and training metadata.
+    """
+    settings = training_settings() if settings is None else settings
+    validation_fraction = settings.get("validation_fraction", 0.2)
+    early_stopping = settings.get("early_stopping_rounds", 20) if validation_fraction else None
+    reg_jobs, cls_jobs = thread_budget(settings.get("n_jobs"))
+
+    specs = {
+        "spend": (XGBRegressor, TARGET_COLUMNS, reg_jobs,
+                  {"tree_method": "hist", "random_state": 42, **settings.get("regressor", {})}),
+        "purchase": (XGBClassifier, 'spend_60_flag', cls_jobs,
+                     {"objective": "reg:squarederror", "tree_method": "hist", "random_state": 123,
+                      **settings.get("classifier", {})}),
+    }
+
+    def fit(name: str) -> Tuple[XGBModel, float, dict]:
+        model_class, target, n_jobs, model_settings = specs[name]
+        params, rounds = _booster_params(model_settings, n_jobs)
+        start = time.perf_counter()
+        dtrain = xgboost.ExtMemQuantileDMatrix(
+            FeatureParts(parts, target, False, validation_fraction, str(cache_dir / f"{name}-train")),
+            max_bin=params.get("max_bin", 256), nthread=n_jobs)
+        evals = []
+        if early_stopping:
+            dval = xgboost.ExtMemQuantileDMatrix(
+                FeatureParts(parts, target, True, validation_fraction, str(cache_dir / f"{name}-val")),
+                ref=dtrain, nthread=n_jobs)
+            evals = [(dval, "validation")]
+        booster = xgboost.train(params, dtrain, num_boost_round=rounds, evals=evals,
+                                early_stopping_rounds=early_stopping, verbose_eval=False)
+        model = model_class()
+        model.load_model(bytearray(booster.save_raw(raw_format="ubj")))
+        stats = {"best_iteration": getattr(booster, "best_iteration", None),
+                 "best_score": getattr(booster, "best_score", None)}
+        return model, time.perf_counter() - start, stats
+
+    # XGBoost releases the GIL while boosting, so both fits run in parallel
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = dict(zip(specs, pool.map(fit, specs)))
+
+    print(f"Fitted regressor in {results['spend'][1]:.1f}s ({reg_jobs} threads), "
+          f"classifier in {results['purchase'][1]:.1f}s ({cls_jobs} threads) from {len(parts)} parts")
+
+    metadata = {"external_memory": True,
+                "parts": len(parts),
+                "best_iteration": {name: r[2]["best_iteration"] for name, r in results.items()},
+                "validation_score": {name: r[2]["best_score"] for name, r in results.items()},
+                "fit_seconds": {name: r[1] for name, r in results.items()}}
+    return {name: r[0] for name, r in results.items()}, metadata
+
+
+def modeling_external(chunks: Iterator[pd.DataFrame], settings: Optional[dict] = None) -> pd.DataFrame:
+    """
+    Out-of-core counterpart of modeling() for customer bases that do not fit in memory.
+
+    The feature chunks are spooled to Parquet parts, both models are trained from
+    them through external memory and registered, and the customers are then
+    scored part by part, so only the predictions are ever held in full.
+
+    Parameters:
+        chunks : Iterator[pd.DataFrame] (per-customer features and targets, in chunks)
+        settings : Optional[dict] (training settings; read from config.yaml when omitted)
+
+    Returns:
+        pd.DataFrame: DataFrame with customer features, predicted spend, and purchase probability.
+    """
+    settings = training_settings() if settings is None else settings
+    cache_root = PROJECT_ROOT / settings.get("external_memory", {}).get("cache_dir", "./data/xgb_cache")
+    cache_root.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=cache_root) as tmp:
+        parts, profile = spool_parts(chunks, Path(tmp))
+        models, metadata = train_models_external(parts, Path(tmp), settings)
+        with measure("modeling.register"):
+            save_model(models, FEATURE_COLUMNS, profile, metadata=metadata)
+
+        predictions = []
+        for path in parts:
+            part = read_frame(path, file_format="parquet")
+            predictions.append(predict(models, part.set_index('customer_id'),
+                                       enrich_customers(part), write_csv=False))
+
+    predictions_df = pd.concat(predictions, ignore_index=True)
+    predictions_df.to_csv('predictions.csv', index=False)
     return predictions_df
 
+#modeling function for gathering insights
+def modeling(original_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Builds a CLV model using synthetic customer data, 
+    then trains regression and classification models to predict 
+    customer spending and likelihood of purchase. The trained models
+    are registered so the `score` task can reuse them.
 
-def process() -> None:
+    Parameters:
+        original_data : pd.DataFrame (raw sales data, or per-customer features
+            and targets already aggregated by src/features.sql)
+
+    Returns:
+        pd.DataFrame: DataFrame with customer features, predicted spend, and purchase probability.
+    """
+    # Dates are parsed and dtypes narrowed once, for both the reference and the training features
+    data = original_data if is_aggregated(original_data) else transaction_frame(original_data)
+    customer_data = enrich_customers(data)
+    reference = scoring_frame(data)
+    models, features_df = fit_and_register(data, reference)
+    return predict(models, features_df, customer_data)
+
+def score(original_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Scores customers with the latest registered models, retraining them only
+    when the registry says they are due (schedule, schema change or drift).
+
+    Parameters:
+        original_data : pd.DataFrame (raw sales data, or per-customer features
+            already aggregated by src/features.sql)
+
+    Returns:
+        pd.DataFrame: DataFrame with customer features, predicted spend, and purchase probability.
     """
-    Loads data from S3, runs the CLV modeling pipeline, 
-    prints results, and uploads them to Google Sheets.
+    data = original_data if is_aggregated(original_data) else transaction_frame(original_data)
+    customer_data = enrich_customers(data)
+    features_df = scoring_frame(data)
+
+    with measure("modeling.load_model"):
+        models, manifest = load_model()
+    retrain, reason = needs_retrain(manifest, features_df[FEATURE_COLUMNS])
+    if retrain:
+        print(f"Retraining: {reason}")
+        models, _ = fit_and_register(data, features_df)
+    else:
+        print(f"Reusing model version {manifest['version']}: {reason}")
+
+    return predict(models, features_df, customer_data)
+
+
+def process(object_name: str = 'clv_data.parquet',
+            columns: Optional[List[str]] = None,
+            mode: str = 'train',
+            data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Loads data from S3, runs the CLV modeling pipeline and prints the results.
+    Publishing them is left to the task's `exports` (src/exporters.py).
+
+    Args:
+        object_name (str): S3 object holding either the raw extract or the
+            per-customer features exported by the data_analysis_ext_features task.
+        columns (Optional[List[str]]): Columns fetched from S3; only these are read
+            from a Parquet object. TRANSACTION_COLUMNS when None; pass an empty list
+            to read every column (e.g. of the per-customer features object).
+        mode (str, Default='train'): 'train' always retrains and registers the models
+            (out of core from feature chunks when `training.external_memory.enabled` is set);
+            'score' reuses the latest registered models unless they are due for retraining.
+        data (Optional[pd.DataFrame]): The extract, already in memory (e.g. handed over
+            by the pipeline's extract stage); S3 is not read then.
 
-    Returns: 
-        None
+    Returns:
+        pd.DataFrame: Customer features with predicted spend and purchase probability.
     """
     
     s3_bucket = "d2p.testing.bucket"
-    df = read_file_s3(bucket=s3_bucket, object_name='clv_data.csv')
-    results_df = modeling(df)
+    columns = TRANSACTION_COLUMNS if columns is None else (columns or None)
+    external = training_settings().get("external_memory", {})
+    if mode == 'train' and external.get("enabled") and data is None:
+        # Per-customer features streamed from MySQL, or from the S3 features object
+        chunksize = external.get("chunksize", 100000)
+        if external.get("query"):
+            from src.data_analysis_ext import stream_sql_query_from_file
+            chunks = stream_sql_query_from_file(PROJECT_ROOT / "src" / external["query"],
+                                                database=external.get("database", "refined"),
+                                                chunksize=chunksize)
+        else:
+            from src.integrations.s3 import read_file_s3
+            chunks = read_file_s3(bucket=s3_bucket, object_name=object_name, chunksize=chunksize)
+        if chunks is None:
+            raise Exception("❌ No feature chunks to train on. Check the query or S3 object.")
+        results_df = modeling_external(chunks)
+    else:
+        # S3 (boto3) is only needed when the extract is not handed over in memory
+        if data is None:
+            from botocore.exceptions import BotoCoreError, ClientError
+            from src.integrations.s3 import auth_aws, read_file_s3
+
+        computed = []
+
+        def run() -> pd.DataFrame:
+            computed.append(True)
+            df = data if data is not None else read_file_s3(bucket=s3_bucket, object_name=object_name,
+                                                            columns=columns)
+            return score(df) if mode == 'score' else modeling(df)
+
+        # Only scoring is cached: training registers a new model version every run, and
+        # a scoring run whose models are due (none registered, or older than
+        # `retrain_every_days`) must retrain whatever the data. Otherwise the same input
+        # (object ETag, or content hash of in-memory data), settings, code and registered
+        # model give the same schema and drift checks, and the same predictions
+        manifest = load_manifest() if mode == 'score' else None
+        if manifest is None or retrain_due(manifest):
+            source = None
+        elif data is not None:
+            row_hashes = pd.util.hash_pandas_object(data, index=False).to_numpy()
+            source = ["memory", list(data.columns), hashlib.sha256(row_hashes.tobytes()).hexdigest()]
+        else:
+            try:
+                source = [s3_bucket, object_name,
+                          auth_aws().head_object(Bucket=s3_bucket, Key=object_name)["ETag"]]
+            except (ClientError, BotoCoreError) as e:
+                # e.g. missing credentials or an unreachable endpoint: run without the cache
+                print(e)
+                source = None
+        cache_key = None if source is None else fingerprint(
+            "modeling",
+            config={"object": source, "columns": columns, "mode": mode,
+                    "training": training_settings(), "enrichment": enrichment_settings(),
+                    "registry": registry_settings(), "model": manifest["version"]},
+            code=[Path(__file__), PROJECT_ROOT / "src" / "registry.py", PROJECT_ROOT / "src" / "enrichment.py",
+                  PROJECT_ROOT / "src" / "polars_engine.py"])
+        results_df = cached_frame("modeling", cache_key, run)
+        if not computed:
+            # A cache hit skips predict(), which writes predictions.csv on a run
+            results_df.to_csv('predictions.csv', index=False)
     print(results_df.head())
-    
-    #push the processed data to google sheets
     return results_df
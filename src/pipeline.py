@@ -0,0 +1,158 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if __package__ in (None, ""):
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.cache import cache_stats
+from src.config import load_config
+from src.exporters import run_exports
+from src.metrics import task_run
+from src.utils import process_task
+
+
+def run_task(task: str, config: dict, data: Any = None, stream: bool = True) -> Any:
+    """
+    Runs a task of config.yaml the way `main.py -t <task>` does, then sends its result to every export.
+
+    Tasks naming a `module` run src/<module>.py's process() with the task's `params`;
+    the others run their SQL extract.
+
+    Args:
+        task (str): Task name in config.yaml.
+        config (dict): The loaded config.
+        data (Any): Output of an earlier stage, passed to the module as `data`.
+        stream (bool, Default=True): Let a single S3 export with a `chunksize` stream the
+            extract; the result is then consumed by the export and cannot be handed on.
+
+    Returns:
+        The task's result (a DataFrame, or a consumed chunk iterator when streamed).
+
+    Raises:
+        Exception: If the task returns no data or an export fails.
+    """
+    task_cfg = config[task]
+    exports = [item["export"] for item in task_cfg.get("export", [])]
+
+    # Stream the extract straight into S3 when it is the only export and sets a chunksize
+    single_s3 = stream and len(exports) == 1 and exports[0]["host"] == "s3"
+    chunksize = exports[0].get("chunksize") if single_s3 else None
+
+    if "module" in task_cfg:
+        params = dict(task_cfg.get("params", {}))
+        if data is not None:
+            params["data"] = data
+        df = process_task(task_cfg["module"], **params)
+    else:
+        df = process_task("data_analysis_ext", chunksize=chunksize,
+                          query_file=task_cfg.get("query", "query.sql"))
+
+    if df is None:
+        raise Exception("❌ DataFrame returned is None. Check your query or DB connection.")
+
+    # Export result to every sink in the config
+    if exports:
+        run_exports(df, exports, max_workers=task_cfg.get("export_workers", 4))
+    return df
+
+
+def run_stage(stage: dict, config: dict, outputs: Dict[str, Any], stream: bool = True) -> Any:
+    """
+    Runs one pipeline stage: a config `task` (with its exports) or a src `module` with `params`.
+
+    Args:
+        stage (dict): Stage entry of `pipeline` in config.yaml.
+        config (dict): The loaded config.
+        outputs (Dict[str, Any]): Results of the stages already run in this process.
+        stream (bool, Default=True): Whether a task stage may stream its extract.
+
+    Returns:
+        The stage's result.
+    """
+    # In-memory hand-over from an earlier stage; absent when the stage is run on its own
+    data = outputs.get(stage["input"]) if stage.get("input") else None
+    if "task" in stage:
+        return run_task(stage["task"], config, data=data, stream=stream)
+    params = dict(stage.get("params", {}))
+    if data is not None:
+        params["data"] = data
+    return process_task(stage["module"], **params)
+
+
+def run_pipeline(stage_names: Optional[List[str]] = None, config: Optional[dict] = None,
+                 profile: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Runs the `pipeline` stages of config.yaml in order, inside this one process.
+
+    Modules are imported once, the pooled database connections and the S3/Sheets
+    clients are shared by every stage, and a stage's result is handed to the
+    stages naming it as `input` in memory instead of through disk or the database.
+    A handed-over result is held in full (an extract is then not streamed into S3)
+    until its last consumer ran. Running a subset of stages (e.g. an Airflow retry)
+    falls back to each stage's own source for inputs that were not produced in this run.
+
+    Every stage is recorded as a task by src/metrics.py (JSON log and Prometheus
+    textfile per the `metrics` section), and profiled when opted in.
+
+    Args:
+        stage_names (Optional[List[str]]): Stages to run; all of them when None.
+        config (Optional[dict]): The loaded config; read from config.yaml when omitted.
+        profile (Optional[bool]): Profile every stage; `metrics.profile.tasks` decides when None.
+
+    Returns:
+        Dict[str, Any]: Result of every stage that ran, by name, except those handed over to a later stage.
+
+    Raises:
+        ValueError: If an unknown stage is asked for.
+    """
+    config = load_config() if config is None else config
+    stages = config["pipeline"]
+    known = [stage["name"] for stage in stages]
+    unknown = [name for name in stage_names or [] if name not in known]
+    if unknown:
+        raise ValueError(f"Unknown pipeline stage(s): {unknown}. Expected one of {known}")
+
+    selected = [stage for stage in stages if not stage_names or stage["name"] in stage_names]
+    # Results another selected stage consumes must be materialized, not streamed away,
+    # and are released after the last stage consuming them
+    last_consumer = {stage["input"]: stage["name"] for stage in selected if stage.get("input")}
+
+    outputs: Dict[str, Any] = {}
+    start = time.perf_counter()
+    try:
+        for stage in selected:
+            print(f"▶️  Stage '{stage['name']}'...")
+            stage_start = time.perf_counter()
+            with task_run(stage["name"], profile=profile):
+                outputs[stage["name"]] = run_stage(stage, config, outputs,
+                                                   stream=stage["name"] not in last_consumer)
+            for name in [name for name, consumer in last_consumer.items() if consumer == stage["name"]]:
+                outputs.pop(name, None)
+            print(f"⏱️  Stage '{stage['name']}' finished in {time.perf_counter() - stage_start:.1f}s")
+    finally:
+        # Only stages that touched MySQL imported the pool (and SQLAlchemy)
+        if "src.connections" in sys.modules:
+            sys.modules["src.connections"].dispose_engines()
+
+    print(f"✅ Pipeline finished {len(selected)} stage(s) in {time.perf_counter() - start:.1f}s")
+    for step, counts in cache_stats().items():
+        print(f"🗄️  Cache '{step}': {counts.get('hit', 0)} hit(s), {counts.get('miss', 0)} miss(es)")
+    return outputs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Runs the D2P pipeline stages in one process")
+    parser.add_argument("-s", "--stage", action="append", dest="stages",
+                        help="Stage to run (repeatable); every stage when omitted")
+    parser.add_argument("-p", "--profile", action="store_true",
+                        help="Profile every stage (cProfile, or pyinstrument per metrics.profile.tool)")
+    args = parser.parse_args()
+    run_pipeline(args.stages, profile=args.profile or None)
+
+
+if __name__ == "__main__":
+    main()
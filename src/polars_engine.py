@@ -0,0 +1,225 @@
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import load_config
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Strings pandas.read_csv reads as missing by default, so both engines see the same nulls
+NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+             '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+# Resolution pandas.to_datetime gives parsed strings (nanoseconds before pandas 3)
+TIME_UNIT = "ns" if int(pd.__version__.split(".")[0]) < 3 else "us"
+
+NANOSECONDS_PER_DAY = 86_400 * 10 ** 9
+
+
+def engine_settings() -> dict:
+    """
+    Reads the `engine` section of config/config.yaml (parsed once per process).
+
+    Returns:
+        dict: Backend and thread settings (empty if the section is missing).
+    """
+    return load_config("engine")
+
+
+def use_polars() -> bool:
+    """True when `engine.backend` runs the ETL split and feature engineering on Polars."""
+    return engine_settings().get("backend", "pandas") == "polars"
+
+
+def polars():
+    """Imports Polars (optional dependency), sizing its thread pool from `engine.threads` first."""
+    threads = engine_settings().get("threads")
+    if threads and "polars" not in sys.modules:
+        # Read once, when Polars is first imported
+        os.environ.setdefault("POLARS_MAX_THREADS", str(threads))
+    import polars as pl
+
+    return pl
+
+
+# ──────────────────────────────────────────────
+# ETL: src/etl_pipeline.py
+
+def _scan(pl, source: Path, infer_schema_length: Optional[int] = 10_000):
+    """Lazily scans a CSV, Parquet or Feather file, reading nulls as pandas does."""
+    from src.utils import infer_format
+
+    file_format = infer_format(source.name)
+    if file_format == "parquet":
+        return pl.scan_parquet(source)
+    if file_format == "feather":
+        return pl.scan_ipc(source)
+    return pl.scan_csv(source, null_values=NA_VALUES, infer_schema_length=infer_schema_length)
+
+
+def _fill_missing(pl, frame):
+    """fillna(0) as utils.get_data does it; integer columns with gaps are floats in pandas."""
+    with_nulls = [name for name, count in zip(frame.columns, frame.null_count().row(0)) if count]
+    if not with_nulls:
+        return frame
+    return frame.with_columns(
+        pl.col(name).cast(pl.Float64) if frame.schema[name].is_integer() else pl.col(name)
+        for name in with_nulls
+    ).with_columns(pl.col(with_nulls).fill_null(0))
+
+
+def split_dataset(source: Path) -> Dict[str, pd.DataFrame]:
+    """
+    Projects the CDNOW dataset onto the sales and products tables in one multi-threaded pass.
+
+    The dtype of every CSV column is inferred from a sample, and from the whole file
+    only when a later value does not fit it.
+
+    Args:
+        source (Path): Uncompressed CSV, Parquet or Feather dataset.
+
+    Returns:
+        Dict[str, pd.DataFrame]: The "sales" and "products" frames, identical to the pandas path.
+    """
+    pl = polars()
+
+    def tables(dataset) -> tuple:
+        # One scan for both tables; columns neither uses (e.g. a pandas index) are never parsed
+        cdnow = dataset.select("customer_id", "country", "date", "product_id", "quantity", "price",
+                               "product_category").collect()
+        return (cdnow.select("customer_id", "country", "date", "product_id"),
+                cdnow.select("product_id", "quantity", "price", pl.col("product_category").alias("category")))
+
+    try:
+        sales, products = tables(_scan(pl, source))
+    except pl.exceptions.ComputeError:
+        # A value past the sampled rows does not fit the dtype inferred from them (e.g. a
+        # float in an integer column); like pandas, let the whole column decide
+        sales, products = tables(_scan(pl, source, infer_schema_length=None))
+    return {"sales": _fill_missing(pl, sales).to_pandas(), "products": _fill_missing(pl, products).to_pandas()}
+
+
+# ──────────────────────────────────────────────
+# Feature engineering: src/modeling.py
+
+def _parsed_dates(pl, dates):
+    """YYYYMMDD integers or ISO date strings as datetimes; None for anything else (left to pandas)."""
+    if dates.dtype.is_integer():
+        return dates.cast(pl.String).str.strptime(pl.Datetime(TIME_UNIT), "%Y%m%d")
+    if dates.dtype == pl.String:
+        return dates.str.strptime(pl.Datetime(TIME_UNIT), "%Y-%m-%d")
+    return None
+
+
+def _narrowest_integer(pl, ids):
+    """The dtype pd.to_numeric(downcast='integer') picks for these integer ids."""
+    low, high = ids.min(), ids.max()
+    for dtype, info in ((pl.Int8, np.iinfo(np.int8)), (pl.Int16, np.iinfo(np.int16)),
+                        (pl.Int32, np.iinfo(np.int32))):
+        if low is not None and info.min <= low and high <= info.max:
+            return dtype
+    return pl.Int64
+
+
+def transaction_frame(original_data: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """
+    Polars version of modeling.transaction_frame: dates parsed and dtypes narrowed in parallel.
+
+    Parameters:
+        original_data : pd.DataFrame (raw sales data, one row per transaction)
+
+    Returns:
+        Optional[pd.DataFrame]: customer_id, datetime date and price, or None when the
+        ids are not integers or the dates are neither YYYYMMDD integers, ISO strings
+        nor datetimes (pandas then parses them, so both engines always agree).
+    """
+    pl = polars()
+    frame = pl.from_pandas(original_data[['customer_id', 'date', 'price']])
+    ids, dates = frame["customer_id"], frame["date"]
+    if not ids.dtype.is_integer():
+        return None
+    if not isinstance(dates.dtype, pl.Datetime):
+        try:
+            dates = _parsed_dates(pl, dates)
+        except pl.exceptions.PolarsError:
+            dates = None
+        if dates is None:
+            return None
+
+    transactions = frame.with_columns(
+        pl.col("customer_id").cast(_narrowest_integer(pl, ids)),
+        dates.alias("date"),
+        pl.col("price").cast(pl.Float32),
+    ).to_pandas()
+    transactions.index = original_data.index
+    return transactions
+
+
+def _customer_features(pl, transactions):
+    """Lazy per-customer RFM aggregation (see modeling.build_features)."""
+    last_purchase = pl.col("last_purchase")
+    return transactions.group_by("customer_id").agg(
+        last_purchase=pl.col("date").max(),
+        frequency=pl.col("date").count().cast(pl.Int64),
+        price_sum=pl.col("price").cast(pl.Float64).sum(),
+        price_mean=pl.col("price").cast(pl.Float64).mean(),
+    ).with_columns(
+        # Same arithmetic as pandas: nanosecond difference divided by one day
+        recency=(last_purchase - last_purchase.max()).dt.total_nanoseconds() / NANOSECONDS_PER_DAY,
+    )
+
+
+def _to_features_frame(features) -> pd.DataFrame:
+    """Collects per-customer features into pandas, ordered and indexed by customer_id like a groupby."""
+    return features.sort("customer_id").collect().to_pandas().set_index("customer_id")
+
+
+def build_features(historical_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Polars version of modeling.build_features.
+
+    Parameters:
+        historical_data : pd.DataFrame (transactions with customer_id, datetime date and price)
+
+    Returns:
+        pd.DataFrame: One row per customer_id with recency, frequency, price_sum and price_mean.
+    """
+    pl = polars()
+    transactions = pl.from_pandas(historical_data[['customer_id', 'date', 'price']]).lazy()
+    features = _customer_features(pl, transactions).select(
+        "customer_id", "recency", "frequency", "price_sum", "price_mean")
+    return _to_features_frame(features)
+
+
+def prepare_features(transactions: pd.DataFrame, n_days: int) -> pd.DataFrame:
+    """
+    Polars version of modeling.prepare_features, as one lazy query: the history
+    and the `n_days` after the cutoff are aggregated in parallel and joined.
+
+    Parameters:
+        transactions : pd.DataFrame (output of transaction_frame)
+        n_days : int (length of the target window)
+
+    Returns:
+        pd.DataFrame: One row per customer_id with the features and targets (float32).
+    """
+    pl = polars()
+    cutoff = pl.col("date").max() - pl.duration(days=n_days)
+    frame = pl.from_pandas(transactions[['customer_id', 'date', 'price']]).lazy() \
+        .with_columns(in_history=pl.col("date") <= cutoff)
+
+    features = _customer_features(pl, frame.filter(pl.col("in_history")))
+    spend = frame.filter(~pl.col("in_history")).group_by("customer_id").agg(
+        spend_60_day=pl.col("price").cast(pl.Float64).sum())
+
+    result = features.join(spend, on="customer_id", how="left").select(
+        "customer_id",
+        *(pl.col(name).cast(pl.Float32) for name in ("recency", "frequency", "price_sum", "price_mean")),
+        pl.col("spend_60_day").fill_null(0).cast(pl.Float32),
+        pl.col("spend_60_day").is_not_null().cast(pl.Float32).alias("spend_60_flag"),
+    )
+    return _to_features_frame(result)
@@ -0,0 +1,252 @@
+import json
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import xgboost
+from xgboost import XGBClassifier, XGBModel, XGBRegressor
+
+from src.config import load_config
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Model name -> estimator class; boosters are stored as <name>.ubj (XGBoost's native binary JSON)
+MODEL_CLASSES = {"spend": XGBRegressor, "purchase": XGBClassifier}
+MANIFEST_FILE = "manifest.json"
+LATEST_FILE = "LATEST"
+
+
+def registry_settings() -> dict:
+    """
+    Reads the `model_registry` section of config/config.yaml (parsed once per process).
+
+    Returns:
+        dict: Location and retraining settings (empty if the section is missing).
+    """
+    return load_config("model_registry")
+
+
+def _put(settings: dict, key: str, data: bytes) -> None:
+    """Stores `data` under `key`, below `path` on disk or `bucket_name`/`prefix` in S3."""
+    if settings.get("location", "local") == "s3":
+        from src.integrations.s3 import auth_aws
+        auth_aws().put_object(Bucket=settings["bucket_name"],
+                              Key=f"{settings.get('prefix', 'models/clv')}/{key}", Body=data)
+    else:
+        path = PROJECT_ROOT / settings.get("path", "./models") / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+
+def _get(settings: dict, key: str) -> Optional[bytes]:
+    """Returns the bytes stored under `key`, or None if there is nothing there."""
+    if settings.get("location", "local") == "s3":
+        from src.integrations.s3 import auth_aws
+        s3_client = auth_aws()
+        try:
+            response = s3_client.get_object(Bucket=settings["bucket_name"],
+                                            Key=f"{settings.get('prefix', 'models/clv')}/{key}")
+        except s3_client.exceptions.NoSuchKey:
+            return None
+        return response["Body"].read()
+    path = PROJECT_ROOT / settings.get("path", "./models") / key
+    return path.read_bytes() if path.exists() else None
+
+
+def feature_profile(X: pd.DataFrame) -> Dict[str, dict]:
+    """
+    Summarises every feature column, so later scoring runs can be checked for drift.
+
+    Args:
+        X (pd.DataFrame): Reference feature matrix.
+
+    Returns:
+        dict: Column -> {"mean", "std"}.
+    """
+    return {col: {"mean": float(X[col].mean()), "std": float(X[col].std(ddof=0))}
+            for col in X.columns}
+
+
+def profile_from_moments(columns: List[str], count: int,
+                         sums: np.ndarray, squares: np.ndarray) -> Dict[str, dict]:
+    """
+    Builds the same profile as feature_profile from running sums, for data seen in chunks.
+
+    Args:
+        columns (List[str]): Feature columns.
+        count (int): Rows seen.
+        sums (np.ndarray): Per-column sum of the values.
+        squares (np.ndarray): Per-column sum of the squared values.
+
+    Returns:
+        dict: Column -> {"mean", "std"}.
+    """
+    means = sums / count
+    stds = np.sqrt(np.maximum(squares / count - means ** 2, 0.0))
+    return {col: {"mean": float(m), "std": float(sd)} for col, m, sd in zip(columns, means, stds)}
+
+
+def feature_drift(manifest: dict, X: pd.DataFrame) -> Dict[str, float]:
+    """
+    Measures how far each feature mean moved since training, in reference standard deviations.
+
+    Args:
+        manifest (dict): Manifest of the registered model.
+        X (pd.DataFrame): Feature matrix about to be scored.
+
+    Returns:
+        dict: Column -> absolute mean shift.
+    """
+    drift = {}
+    for col, stats in manifest["feature_profile"].items():
+        spread = stats["std"] or 1.0
+        drift[col] = abs(float(X[col].mean()) - stats["mean"]) / spread
+    return drift
+
+
+def save_model(models: Dict[str, XGBModel],
+               feature_columns: List[str],
+               reference: Union[pd.DataFrame, Dict[str, dict]],
+               metadata: Optional[dict] = None,
+               settings: Optional[dict] = None) -> str:
+    """
+    Registers a newly trained set of models as the latest version.
+
+    Each booster is written in XGBoost's native UBJ format next to a manifest
+    holding the feature schema, a profile of the reference features and the
+    training metadata; the LATEST pointer is only moved once everything is stored.
+
+    Args:
+        models (Dict[str, XGBModel]): Trained estimators keyed by MODEL_CLASSES name.
+        feature_columns (List[str]): Feature columns, in the order the models expect them.
+        reference (Union[pd.DataFrame, dict]): Features, built the way scoring runs
+            build them, that later scoring runs are checked for drift against, or
+            their already computed profile.
+        metadata (Optional[dict]): Extra training metadata (scores, row counts, ...).
+        settings (Optional[dict]): Registry settings; read from config.yaml when omitted.
+
+    Returns:
+        str: Version of the registered models.
+    """
+    settings = registry_settings() if settings is None else settings
+    trained_at = datetime.now(timezone.utc)
+    version = trained_at.strftime("%Y%m%dT%H%M%S%fZ")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, model in models.items():
+            path = Path(tmp) / f"{name}.ubj"
+            model.save_model(path)
+            _put(settings, f"{version}/{name}.ubj", path.read_bytes())
+
+    manifest = {
+        "version": version,
+        "trained_at": trained_at.isoformat(),
+        "xgboost_version": xgboost.__version__,
+        "models": sorted(models),
+        "feature_columns": list(feature_columns),
+        "feature_profile": (feature_profile(reference[feature_columns])
+                            if isinstance(reference, pd.DataFrame) else reference),
+        "metadata": metadata or {},
+    }
+    _put(settings, f"{version}/{MANIFEST_FILE}", json.dumps(manifest, indent=2).encode())
+    _put(settings, LATEST_FILE, version.encode())
+    print(f"✅ Registered model version {version}")
+    return version
+
+
+def latest_version(settings: Optional[dict] = None) -> Optional[str]:
+    """Returns the version the LATEST pointer names, or None if nothing has been registered yet."""
+    settings = registry_settings() if settings is None else settings
+    latest = _get(settings, LATEST_FILE)
+    return None if latest is None else latest.decode().strip()
+
+
+def load_manifest(version: Optional[str] = None, settings: Optional[dict] = None) -> Optional[dict]:
+    """Reads a registered version's manifest (the latest by default) without its boosters; None if nothing is registered."""
+    settings = registry_settings() if settings is None else settings
+    version = latest_version(settings) if version is None else version
+    return None if version is None else json.loads(_get(settings, f"{version}/{MANIFEST_FILE}"))
+
+
+def load_model(version: Optional[str] = None,
+               settings: Optional[dict] = None) -> Tuple[Optional[Dict[str, XGBModel]], Optional[dict]]:
+    """
+    Loads a registered set of models, the latest one by default.
+
+    Args:
+        version (Optional[str]): Version to load; None follows the LATEST pointer.
+        settings (Optional[dict]): Registry settings; read from config.yaml when omitted.
+
+    Returns:
+        tuple (models, manifest): Estimators keyed by name and their manifest,
+        or (None, None) if nothing has been registered yet.
+    """
+    settings = registry_settings() if settings is None else settings
+    manifest = load_manifest(version, settings)
+    if manifest is None:
+        return None, None
+
+    version = manifest["version"]
+    models = {}
+    for name in manifest["models"]:
+        model = MODEL_CLASSES[name]()
+        model.load_model(bytearray(_get(settings, f"{version}/{name}.ubj")))
+        models[name] = model
+    print(f"Loaded model version {version} (trained {manifest['trained_at']})")
+    return models, manifest
+
+
+def retrain_due(manifest: Optional[dict], settings: Optional[dict] = None) -> Optional[str]:
+    """
+    Checks the part of needs_retrain that does not depend on the data: whether any
+    model is registered, and whether it is older than `retrain_every_days`.
+
+    Args:
+        manifest (Optional[dict]): Manifest of the latest registered models.
+        settings (Optional[dict]): Registry settings; read from config.yaml when omitted.
+
+    Returns:
+        Optional[str]: Why the models are due for retraining, or None if they are not.
+    """
+    settings = registry_settings() if settings is None else settings
+    if manifest is None:
+        return "no registered model"
+    age = datetime.now(timezone.utc) - datetime.fromisoformat(manifest["trained_at"])
+    if age.days >= settings.get("retrain_every_days", 7):
+        return f"model is {age.days} days old"
+    return None
+
+
+def needs_retrain(manifest: Optional[dict], X: pd.DataFrame,
+                  settings: Optional[dict] = None) -> Tuple[bool, str]:
+    """
+    Decides whether the registered models can keep scoring or must be retrained.
+
+    Models are retrained when none is registered, when the feature schema changed,
+    when they are older than `retrain_every_days`, or when any feature mean moved
+    more than `drift_threshold` reference standard deviations.
+
+    Args:
+        manifest (Optional[dict]): Manifest of the latest registered models.
+        X (pd.DataFrame): Feature matrix about to be scored.
+        settings (Optional[dict]): Registry settings; read from config.yaml when omitted.
+
+    Returns:
+        tuple (bool, str): Whether to retrain, and why.
+    """
+    settings = registry_settings() if settings is None else settings
+    due = retrain_due(manifest, settings)
+    if due:
+        return True, due
+    if manifest["feature_columns"] != list(X.columns):
+        return True, "feature schema changed"
+
+    drift = feature_drift(manifest, X)
+    column, shift = max(drift.items(), key=lambda kv: kv[1])
+    if shift > settings.get("drift_threshold", 0.5):
+        return True, f"'{column}' drifted {shift:.2f} std"
+    return False, f"largest drift {shift:.2f} std ('{column}')"
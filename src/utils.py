@@ -1,131 +1,91 @@
-import io
-import os
+import hashlib
 import importlib
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterator, List, Optional
 
-import boto3
-import gspread
-import mysql.connector
 import pandas as pd
-from botocore.client import BaseClient
-from botocore.exceptions import BotoCoreError, ClientError
 from dotenv import load_dotenv
-from google.oauth2.service_account import Credentials
-from gspread_dataframe import set_with_dataframe
-from mysql.connector import Error, MySQLConnection
-from mysql.connector.cursor import MySQLCursor as Cursor
 
 load_dotenv(Path('.env'))
 
-# SQL Database Functions
-def db_connection(host: str,
-                  user: str,
-                  password: str,
-                  database: Optional[str] = None
-                 ) -> Optional[Tuple[MySQLConnection, str]]:
+# The MySQL, S3 and Google Sheets helpers live in src/integrations/ so a task only
+# imports the client libraries it uses; they stay importable from here, loaded on first access
+_INTEGRATIONS = {
+    "mysql_db": ("DB_ERRORS", "db_connection", "create_database", "create_table", "create_indexes",
+                 "LOAD_STATE_TABLE", "table_exists", "get_load_state", "save_load_state",
+                 "formatting_columns_placeholders", "insert_data", "insert_data_batched",
+                 "load_data_infile", "bulk_insert"),
+    "s3": ("auth_aws", "read_file_s3", "write_file_s3", "write_chunks_s3"),
+    "gsheets": ("gcp_authentication", "gcp_client", "gcp_feed_data"),
+}
+_LAZY_NAMES = {name: module for module, names in _INTEGRATIONS.items() for name in names}
+
+
+def file_checksum(path: Path, block_size: int = 1024 * 1024) -> str:
+    """Returns the SHA-256 hex digest of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def after_watermark(series: pd.Series, watermark: Optional[str]) -> pd.Series:
     """
-    Connects to mysql server.re
+    Boolean mask of the rows at or past a stored watermark.
 
-    Args:
-        host (str): MySQL Server host
-        user (str): MySQL Server username
-        password (str): MySQL Server password
-        database (optional[str], Default=None): Database name (Default: None)
-
-    Returns:
-        tuple (MySQLConnection [Optional], cursor [Optional]): 
-        - Connection object and Cursor obhect if successful, otherwise None
-
-    Raises:
-        Connection Error: Connection Unsuccessful
-    """
-    try:
-        #connecting to mysql server
-        con = mysql.connector.connect(
-            host=host,
-            user=user,
-            password=password,
-            database=database
-        )
-        mycursor = con.cursor()
-        print("Connected to MySQL Successfully")
-        return con, mycursor
-    except Error as e:
-        print(f"Cannot connect to MySQL Server: {e}")
-        return None, None
-
-def create_database(mycursor: Cursor,
-             database: str
-            ) -> Optional[Error]:
-    """_summary_
+    Rows equal to the watermark are kept, so rows arriving late on the last
+    loaded value are not lost; the load upserts them on its primary key.
+    Numeric columns are compared as numbers, anything else as dates.
 
     Args:
-        mycursor (Cursor): mysql cursor to make changed into database
-        database (str): the database that is being modified
-    
+        series (pd.Series): watermark column of the incoming data
+        watermark (Optional[str]): stored watermark (None keeps every row)
+
     Returns:
-        - None
-    
-    Raises: 
-        -  Error if Database creation fails, otherwise none
+        pd.Series: mask of rows to load
     """
-    #drop db if already exists and create a new one.
-    mycursor.execute(f"DROP DATABASE IF EXISTS {database}")
-    mycursor.execute(f"CREATE DATABASE {database}")
-    mycursor.execute("SHOW DATABASES")
-    dbs = mycursor.fetchall()
-    dbs = [db[0] for db in dbs]
-    if database in dbs:
-        print(f"Database: '{database}' created successfully")
+    if watermark is None:
+        return pd.Series(True, index=series.index)
+    if pd.api.types.is_numeric_dtype(series):
+        values, bound = series, float(watermark)
     else:
-        print(f"Failed to create Database: '{database}'")
-      
+        values, bound = pd.to_datetime(series.astype(str)), pd.Timestamp(watermark)
+    return values >= bound
+
 
-def create_table(mycursor: Cursor, database: str, table_name: str, schema: str) -> None:
-    """Creates Table
+def max_watermark(series: pd.Series, watermark: Optional[str]) -> Optional[str]:
+    """
+    Returns the larger of a stored watermark and the newest value in `series`.
 
     Args:
-        mycursor (Cursor): MySQL cursor. 
-        table_name (str): table name
-        schema (Tuple): defines the columns of the table and its data types
+        series (pd.Series): watermark column of the rows just loaded
+        watermark (Optional[str]): watermark reached so far (None if none yet)
 
     Returns:
-        - None
-
-    Raises:
-        - Error if Table creation fails, otherwise None 
-
+        Optional[str]: new watermark, as text for the state table
     """
-    try:
-        #drop table if exists
-        mycursor.execute(f"USE {database}")
-        sql = f"DROP TABLE IF EXISTS {table_name}"
-        mycursor.execute(sql)
-        print(f"Old Table '{table_name}' dropped before creation.")
-        
-        #create a new one
-        sql = f"CREATE TABLE {table_name} ({schema})"
-        mycursor.execute(sql)
-        print(f"Table '{table_name}' created successfully.")
-    except Error as e:
-        print(f"Error creating table: {e}")
+    if series.empty:
+        return watermark
+    if pd.api.types.is_numeric_dtype(series):
+        newest = series.max()
+        return str(newest) if watermark is None or newest > float(watermark) else watermark
+    newest = pd.to_datetime(series.astype(str)).max()
+    return newest.isoformat() if watermark is None or newest > pd.Timestamp(watermark) else watermark
 
 
 def get_data(csv_file: str) -> Optional[pd.DataFrame]:
     """
-    Reads data from a CSV file using pandas and prepares it for MySQL upload.
+    Reads data from a CSV, Parquet or Feather file (by extension) and prepares it for MySQL upload.
 
     Args:
-        csv_file (str): Absolute path to the CSV file.
+        csv_file (str): Absolute path to the data file.
 
     Returns:
-        Optional[pd.DataFrame]: DataFrame containing the CSV data, or None if not found.
+        Optional[pd.DataFrame]: DataFrame containing the file's data, or None if not found.
     """
     try:
-        df = pd.read_csv(csv_file).fillna(0)
-        df.drop(['Unnamed: 0'], axis=1, inplace=True, errors='ignore')
-        return df
+        return _clean_frame(read_frame(csv_file, file_format=infer_format(csv_file)))
     except FileNotFoundError:
         print(f"❌ File not found: {csv_file}")
         return None
@@ -133,254 +93,212 @@ def get_data(csv_file: str) -> Optional[pd.DataFrame]:
         print(f"❌ Error reading {csv_file}: {e}")
         return None
 
-def formatting_columns_placeholders(df: pd.DataFrame) -> Tuple[str, str]:
+
+def get_data_chunks(csv_file: str, chunksize: int = 100000) -> Optional[Iterator[pd.DataFrame]]:
     """
-    Generates SQL schema and placeholders based on DataFrame columns.
+    Streams a CSV, Parquet or Feather file in chunks so memory stays bounded by `chunksize` rather than the file size.
+
+    Each chunk is cleaned the same way as `get_data`.
 
     Args:
-        df (pd.DataFrame): Pandas DataFrame containing the dataset.
+        csv_file (str): Absolute path to the data file.
+        chunksize (int, Default=100000): Number of rows per chunk.
 
     Returns:
-        Tuple[str, str]: SQL schema and value placeholders.
-    """
-    sql_cols = []
-    placeholders = []
-
-    #changing python types to sql types
-    for col in df.columns:
-        if df[col].dtype == 'int64':
-            data_type = 'INT'
-        elif df[col].dtype == 'float64':
-            data_type = 'FLOAT'
-        elif df[col].dtype == 'bool':
-            data_type = 'BOOLEAN'
-        else:
-            data_type = 'VARCHAR(255)'
-        sql_cols.append(f"{col} {data_type}")
-        placeholders.append("%s")
-
-    #converting the list as strings
-    schema = ", ".join(sql_cols)
-    placeholder_str = f"({', '.join(placeholders)})"
-
-    return schema, placeholder_str
-            
-
-def insert_data(con: MySQLConnection, 
-                mycursor: Cursor,
-                table_name: str,
-                df: pd.DataFrame
-                ) -> Optional[int]:
+        Optional[Iterator[pd.DataFrame]]: Generator of DataFrame chunks, or None if not found.
     """
-    Inserts data into the specified table for specific columns.
+    try:
+        reader = iter_frames(csv_file, file_format=infer_format(csv_file), chunksize=chunksize)
+    except FileNotFoundError:
+        print(f"❌ File not found: {csv_file}")
+        return None
+    except Exception as e:
+        print(f"❌ Error reading {csv_file}: {e}")
+        return None
+    return (_clean_frame(chunk) for chunk in reader)
 
-    Args:
-        con (MySQLConnection): Connection to the MySQL database.
-        mycursor (Cursor): MySQL cursor.
-        table_name (str): Name of the table.
-        df (pd.DataFrame): Pandas DataFrame containing the data.
 
-    Returns:
-        int: Number of rows successfully inserted
-       
-    Raises:
-        Error: If insertion fails, otherwise None
-    """
-    total=0
-    schema, placeholders = formatting_columns_placeholders(df)
-    cols = ", ".join(df.columns) #deriving column names in the specified df
-    sql_query = f"INSERT INTO {table_name} ({cols}) Values {placeholders}"
-    
-    for _, row in df.iterrows():
-        values = tuple(row) #one row data at a time 
-        try:
-            mycursor.execute(sql_query, values)
-            if mycursor.rowcount == 1: #if the number of row inserted is 1 
-                total+=1
-            con.commit()
-        except Error as e:
-            print(e)
-    return total
-        
-#Amazon Web Services (AWS)
-
-def auth_aws() -> BaseClient:
-    """
-    Authenticates and returns an S3 client using the provided AWS credentials and region.
+def _clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Fills missing values and drops the pandas index column left by `to_csv`."""
+    df = df.fillna(0)
+    df.drop(['Unnamed: 0'], axis=1, inplace=True, errors='ignore')
+    return df
 
-    Returns:
-        BaseClient: An authenticated Boto3 S3 client.
 
-    Raises:
-        BotoCoreError, ClientError: If authentication or connection fails.
-    """
-    try:
-        s3_client = boto3.client('s3', aws_access_key_id=os.getenv('ACCESS_KEY'),
-                                 aws_secret_access_key=os.getenv('SECRET_KEY'),
-                                 region_name='us-east-2')
-        return s3_client
-    except (BotoCoreError, ClientError, TypeError) as e:
-        print(e)
-    
-
-def read_file_s3(bucket: str, 
-                 object_name: str) -> pd.DataFrame:
-    """
-    Reads a file from S3 and loads it into a pandas DataFrame.
+def _batches(df: pd.DataFrame, batch_size: int) -> Iterator[pd.DataFrame]:
+    """Yields consecutive row slices of `df` holding at most `batch_size` rows."""
+    for start in range(0, len(df), batch_size):
+        yield df.iloc[start:start + batch_size]
 
-    Parameters:
-        bucket (str): The S3 bucket name.
-        file_name (str): The name of the file in the bucket.
 
-    Returns:
-        pd.DataFrame: Data loaded from the file in the specified bucket.
-    
-    Raises:
-        ClientError: If there is an issue with the AWS request (e.g., file not found).
-        Exception: For any other unforeseen errors during the file reading or DataFrame creation.
-    """
-    
-    try:
-        s3_client = auth_aws()
-        s3_object = s3_client.get_object(Bucket=bucket, Key=object_name)
-        df = pd.read_csv(s3_object['Body'])
-        print(df)
-    except ClientError as e:
-        print(e)
-    return df
+# Serialization
+FILE_FORMATS = ("csv", "parquet", "feather")
+
+
+COMPRESSIONS = {".gz": "gzip", ".zst": "zstd"}
+
+
+def infer_format(name: str, default: str = "csv") -> str:
+    """Returns the file format implied by a file or object name's extension, else `default`."""
+    path = Path(str(name))
+    if path.suffix.lower() in COMPRESSIONS:
+        path = path.with_suffix("")
+    suffix = path.suffix.lstrip(".").lower()
+    return suffix if suffix in FILE_FORMATS else default
 
-def write_file_s3(df: pd.DataFrame, 
-                  bucket: str, 
-                  object_name: str) -> None:
+
+def infer_compression(name: str) -> Optional[str]:
+    """Returns "gzip" or "zstd" for names ending in .gz / .zst, else None."""
+    return COMPRESSIONS.get(Path(str(name)).suffix.lower())
+
+
+def _as_categoricals(df: pd.DataFrame, categorical_columns: Optional[List[str]]) -> pd.DataFrame:
+    """Casts the listed columns to pandas categoricals (dictionary-encoded by Arrow)."""
+    columns = [col for col in categorical_columns or [] if col in df.columns]
+    return df.astype({col: "category" for col in columns}) if columns else df
+
+
+def write_frame(df: pd.DataFrame,
+                target,
+                file_format: str = "csv",
+                categorical_columns: Optional[List[str]] = None) -> None:
     """
-    Uploads a pandas DataFrame as a CSV file to a specified S3 bucket.
+    Writes a DataFrame to a path or binary file object in the given format.
 
     Args:
-        df (pd.DataFrame): The DataFrame to upload.
-        bucket (str): The name of the S3 bucket.
-        object_name (str): The key (file name) for the object in the S3 bucket.
+        df (pd.DataFrame): The DataFrame to write.
+        target: Path or writable binary file object.
+        file_format (str, Default="csv"): One of "csv", "parquet" or "feather".
+        categorical_columns (Optional[List[str]], Default=None): Columns stored
+            dictionary-encoded in Parquet/Feather; they read back as categoricals.
 
     Returns:
         None
 
     Raises:
-        ValueError: If `object_name` is not provided.
-        ClientError: If there is an issue with the S3 request (e.g., invalid bucket, permissions issue).
+        ValueError: If the format is unknown.
     """
+    if file_format == "csv":
+        df.to_csv(target, index=False)
+    elif file_format == "parquet":
+        _as_categoricals(df, categorical_columns).to_parquet(target, index=False)
+    elif file_format == "feather":
+        _as_categoricals(df, categorical_columns).reset_index(drop=True).to_feather(target)
+    else:
+        raise ValueError(f"Unknown file format: '{file_format}'")
 
-    if object_name is None:
-        raise ValueError("You must provide an object_name when uploading a DataFrame.")
-    
-    try:
-        s3_client = auth_aws()
-        csv = df.to_csv(index = False)
-        s3_client.put_object(Bucket=bucket, Key=object_name, Body=csv)
-        print("File uploaded Successfully")
-    except ClientError as e:
-        print(e)
-        
-def gcp_authentication() -> Credentials:
+
+def read_frame(source,
+               file_format: str = "csv",
+               columns: Optional[List[str]] = None) -> pd.DataFrame:
     """
-    Authenticates with Google Cloud Platform using a service account and environment variables.
+    Reads a DataFrame from a path or binary file object in the given format.
 
-    Environment Variables Required:
-        - PRIVATE_KEY_ID
-        - PRIVATE_KEY
-        - CLIENT_EMAIL
-        - CLIENT_ID
-        - CLIENT_X509_CERT_URL
+    Args:
+        source: Path or readable binary file object (seekable for Parquet/Feather).
+        file_format (str, Default="csv"): One of "csv", "parquet" or "feather".
+        columns (Optional[List[str]], Default=None): Only read these columns;
+            Parquet and Feather skip the other columns on disk entirely.
 
     Returns:
-        Credentials: A Google OAuth2 credentials object used for accessing Google Sheets and Drive APIs.
+        pd.DataFrame: The data read.
+
+    Raises:
+        ValueError: If the format is unknown.
     """
-    
-    SCOPES = [
-        "https://spreadsheets.google.com/feeds",
-        'https://www.googleapis.com/auth/spreadsheets',
-        "https://www.googleapis.com/auth/drive.file",
-        "https://www.googleapis.com/auth/drive"
-    ]
-     
-    type = "service_account"
-    project_id = "potent-symbol-456616-g9"
-    private_key_id = os.getenv("PRIVATE_KEY_ID")
-    private_key = os.getenv("PRIVATE_KEY").replace('\\n', '\n')
-    client_email = os.getenv("CLIENT_EMAIL")
-    client_id = os.getenv("CLIENT_ID")
-    auth_uri = "https://accounts.google.com/o/oauth2/auth"
-    token_uri = "https://oauth2.googleapis.com/token"
-    auth_provider_x509_cert_url = "https://www.googleapis.com/oauth2/v1/certs"
-    client_x509_cert_url = os.getenv("CLIENT_X509_CERT_URL")
-    
-    credentials = Credentials.from_service_account_info({
-        "type": type,
-        "project_id": project_id,
-        "private_key_id": private_key_id,
-        "private_key": private_key,
-        "client_email": client_email,
-        "client_id": client_id,
-        "client_x509_cert_url": client_x509_cert_url,
-        "token_uri": token_uri,
-        "auth_uri": auth_uri,
-        "auth_provider_x509_cert_url": auth_provider_x509_cert_url,
-        },
-       scopes=SCOPES
-    )
-    
-    return credentials
-    
-def gcp_feed_data(spreadsheet_id: str, 
-                  worksheet_name: str, 
-                  df: pd.DataFrame) -> None:
-    
+    if file_format == "csv":
+        return pd.read_csv(source, usecols=columns)
+    if file_format == "parquet":
+        return pd.read_parquet(source, columns=columns)
+    if file_format == "feather":
+        return pd.read_feather(source, columns=columns)
+    raise ValueError(f"Unknown file format: '{file_format}'")
+
+
+def iter_frames(path,
+                file_format: str = "csv",
+                chunksize: int = 100000,
+                columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
     """
-    Uploads a pandas DataFrame to a specified Google Sheets worksheet.
-
-    If the worksheet does not exist, it creates a new one.
-    Existing data in the worksheet is cleared before uploading the new DataFrame.
+    Reads a file as DataFrame chunks of about `chunksize` rows.
 
     Args:
-        spreadsheet_id (str): The ID of the target Google Spreadsheet.
-        worksheet_name (str): The name of the worksheet to write data into.
-        df (pd.DataFrame): The DataFrame containing data to upload.
+        path: Path of the file.
+        file_format (str, Default="csv"): One of "csv", "parquet" or "feather".
+        chunksize (int, Default=100000): Rows per chunk (Feather yields its stored record batches).
+        columns (Optional[List[str]], Default=None): Only read these columns.
 
     Returns:
-        None
+        Iterator[pd.DataFrame]: DataFrame chunks.
 
     Raises:
-        gspread.exceptions.WorksheetNotFound: If the worksheet doesn't exist (handled by creating a new one).
-        gspread.exceptions.SpreadsheetNotFound: If the spreadsheet ID is invalid or inaccessible.
+        FileNotFoundError: If the file does not exist (raised before iteration starts).
+        ValueError: If the format is unknown.
+    """
+    if file_format == "csv":
+        return iter(pd.read_csv(path, chunksize=chunksize, usecols=columns))
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path)
+        return (batch.to_pandas() for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns))
+    if file_format == "feather":
+        import pyarrow as pa
+        reader = pa.ipc.open_file(pa.memory_map(str(path)))
+        return (reader.get_batch(i).to_pandas()[columns or slice(None)] for i in range(reader.num_record_batches))
+    raise ValueError(f"Unknown file format: '{file_format}'")
+
+
+class FrameStreamWriter:
+    """
+    Encodes a stream of DataFrame chunks as one CSV or Parquet file.
+
+    CSV gets a single header; Parquet gets one row group per chunk, with the
+    schema fixed by the first chunk.
     """
-    
-    creds = gcp_authentication()
-    client = gspread.authorize(creds)
-    
-    # Open the spreadsheet
-    try:
-        sheet = client.open_by_key(spreadsheet_id).worksheet(worksheet_name)
-    except gspread.exceptions.WorksheetNotFound:
-        sheet = client.open_by_key(spreadsheet_id).add_worksheet(worksheet_name,1,1)
-    except gspread.SpreadsheetNotFound:
-        print(f"Spreadsheet '{spreadsheet_id}' not found.")
-    
-    # Clear existing data
-    sheet.clear()
-    
-    df=df.astype(str)
-    
-    cell_list = sheet.update([df.columns.values.tolist()] + df.values.tolist())
-    
-    if cell_list:
-        return True
-    else:
-        return False
 
-def process_task(task: str) -> dict:
+    def __init__(self, sink, file_format: str = "csv") -> None:
+        if file_format not in ("csv", "parquet"):
+            raise ValueError(f"Streaming writes support csv and parquet, not '{file_format}'")
+        self.sink = sink
+        self.file_format = file_format
+        self._writer = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.file_format == "csv":
+            self.sink.write(df.to_csv(index=False, header=self._writer is None).encode())
+            self._writer = True
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.sink, table.schema)
+        else:
+            table = table.cast(self._writer.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self.file_format == "parquet" and self._writer is not None:
+            self._writer.close()
+
+
+def process_task(task: str, **kwargs) -> dict:
     """Import task file to process the data from src/tools folder
+
+    Only the selected task's module (and the integrations it uses) is imported.
+
     Args:
         task (str): name of the task to process
+        **kwargs: passed on to the task's process()
     Returns:
         dict: processed_data
     """
     lib = importlib.import_module(f"src.{task}")
-    return lib.process()
+    return lib.process(**kwargs)
+
+
+def __getattr__(name: str):
+    """Resolves the integration helpers (e.g. `from src.utils import auth_aws`) by importing their module on first use."""
+    if name in _LAZY_NAMES:
+        return getattr(importlib.import_module(f"src.integrations.{_LAZY_NAMES[name]}"), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
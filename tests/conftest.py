@@ -0,0 +1,17 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make `src` and `benchmarks` importable however pytest is started
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+@pytest.fixture(autouse=True)
+def metrics_in_memory(monkeypatch):
+    """Instrumented code under test records its steps, but not into the project's metrics log."""
+    from src import metrics
+
+    monkeypatch.setattr(metrics, "metrics_settings", lambda: {"enabled": True})
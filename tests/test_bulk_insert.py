@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+from pymysql.err import Error
+
+from src.integrations.mysql_db import bulk_insert
+
+
+class FakeConnection:
+    """Records commits and rollbacks; the cursor fails the statement numbered `fail_on`."""
+
+    def __init__(self, fail_on: int):
+        self.fail_on = fail_on
+        self.statements, self.committed, self.rolled_back = 0, [], 0
+        self.pending = []
+        self.rowcount = 0
+
+    def _run(self, rows: list) -> None:
+        self.statements += 1
+        if self.statements == self.fail_on:
+            raise Error("Duplicate entry")
+        self.pending, self.rowcount = rows, len(rows)
+
+    def execute(self, sql, values=None):
+        self._run([values])
+
+    def executemany(self, sql, values):
+        self._run(list(values))
+
+    def commit(self):
+        self.committed += self.pending
+        self.pending = []
+
+    def rollback(self):
+        self.pending = []
+        self.rolled_back += 1
+
+
+@pytest.mark.parametrize("strategy", ["executemany", "row"])
+def test_a_failing_batch_fails_the_load(strategy):
+    df = pd.DataFrame({"customer_id": range(10), "price": [1.5] * 10})
+    con = FakeConnection(fail_on=2)
+
+    with pytest.raises(Error):
+        bulk_insert(con=con, mycursor=con, table_name="sales", df=df, strategy=strategy, batch_size=4)
+
+    assert con.statements == 2  # nothing is sent after the failing batch
+    assert con.rolled_back == 1
+    assert len(con.committed) == (4 if strategy == "executemany" else 1)
@@ -0,0 +1,34 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from src import cache, data_analysis_ext
+
+
+@pytest.fixture
+def settings(tmp_path, monkeypatch):
+    settings = {"enabled": True, "location": "local", "path": str(tmp_path)}
+    monkeypatch.setattr(cache, "cache_settings", lambda: settings)
+    return settings
+
+
+def test_concurrent_stores_keep_every_entry(settings, tmp_path):
+    keys = [f"{i:064x}" for i in range(32)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda key: cache.store("step", key, {"out.bin": key.encode()}, settings), keys))
+
+    index = json.loads((tmp_path / cache.INDEX_FILE).read_text())
+    assert sorted(index) == [f"step/{key}" for key in keys]
+    assert not list(tmp_path.glob(".*"))  # no temporary files left behind
+    assert cache.lookup("step", keys[0], settings) == {"out.bin": keys[0].encode()}
+
+
+def test_empty_stream_is_not_cached(settings):
+    assert list(data_analysis_ext._cache_stream(iter([]), "0" * 64)) == []
+    assert cache.lookup("extract", "0" * 64, settings) is None
+
+    chunks = [pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [3]})]
+    assert len(list(data_analysis_ext._cache_stream(iter(chunks), "1" * 64))) == 2
+    assert cache.lookup("extract", "1" * 64, settings) is not None
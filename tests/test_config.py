@@ -0,0 +1,25 @@
+from src import config
+
+
+def test_sections_are_copies(monkeypatch):
+    monkeypatch.setattr(config, "_read_config", lambda: {"training": {"n_jobs": 2}})
+
+    settings = config.load_config("training")
+    settings["n_jobs"] = 8
+
+    assert config.load_config("training") == {"n_jobs": 2}
+    assert config.load_config("missing") == {}
+    assert config.load_config() == {"training": {"n_jobs": 2}}
+
+
+def test_every_settings_reader_uses_the_shared_config():
+    from src import cache, connections, enrichment, metrics, modeling, polars_engine, registry
+
+    whole = config.load_config()
+    assert modeling.training_settings() == (whole.get("training") or {})
+    assert registry.registry_settings() == (whole.get("model_registry") or {})
+    assert cache.cache_settings() == (whole.get("step_cache") or {})
+    assert enrichment.enrichment_settings() == (whole.get("enrichment") or {})
+    assert polars_engine.engine_settings() == (whole.get("engine") or {})
+    assert connections.connection_settings() == (whole.get("connections") or {})
+    assert config._read_config.cache_info().misses == 1
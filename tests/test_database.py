@@ -0,0 +1,21 @@
+import pandas as pd
+import pytest
+
+from src.database import load_item
+from src.utils import after_watermark
+
+
+def test_after_watermark_keeps_rows_on_the_watermark():
+    dates = pd.Series(["1997-03-09", "1997-03-10", "1997-03-11"])
+
+    assert after_watermark(dates, "1997-03-10").tolist() == [False, True, True]
+    assert after_watermark(pd.Series([1, 2, 3]), "2").tolist() == [False, True, True]
+
+
+def test_incremental_watermark_needs_a_primary_key(tmp_path):
+    item = {"import": {"dirpath": str(tmp_path), "file_extension": "csv", "prefix_filename": "sales",
+                       "load_mode": "incremental", "watermark_column": "date"}}
+
+    # Refused before the database is touched
+    with pytest.raises(ValueError, match="primary_key"):
+        load_item(None, None, "refined", item, full_refresh=False)
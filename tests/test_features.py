@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import synthetic_features
+from src.modeling import FEATURE_COLUMNS, SCORING_COLUMNS, build_features, scoring_frame, spool_parts
+from src.registry import feature_profile
+
+
+@pytest.fixture
+def historical_data() -> pd.DataFrame:
+    """Three customers, one of them with a single purchase; last overall purchase on 1997-03-10."""
+    return pd.DataFrame({
+        'customer_id': [1, 2, 1, 3, 2, 1],
+        'date': pd.to_datetime(['1997-01-01', '1997-01-05', '1997-02-01',
+                                '1997-02-15', '1997-03-10', '1997-03-01']),
+        'price': [10.0, 25.5, 30.0, 12.25, 4.5, 20.0],
+    })
+
+
+def original_features(historical_data: pd.DataFrame) -> pd.DataFrame:
+    """The RFM features as modeling() first computed them, one groupby().apply per customer."""
+    max_date = historical_data['date'].max()
+
+    recency_df = historical_data[['customer_id', 'date']].groupby('customer_id').apply(
+        lambda x: (x['date'].max() - max_date) / pd.to_timedelta(1, "day"))
+    recency_df = recency_df.to_frame(name='recency')
+
+    frequency_df = historical_data[['customer_id', 'date']].groupby('customer_id').count().set_axis(['frequency'], axis=1)
+
+    # The original named these with a set, which has no order (and pandas no longer accepts);
+    # the names are given in the order the aggregations produce them
+    price_df = historical_data[['customer_id', 'price']].groupby('customer_id').agg({
+        'price': ['sum', 'mean']
+    }).set_axis(["price_sum", "price_mean"], axis=1)
+
+    return pd.concat([recency_df, frequency_df, price_df], axis=1)
+
+
+def test_build_features_matches_original(historical_data):
+    pd.testing.assert_frame_equal(build_features(historical_data), original_features(historical_data))
+
+
+def test_build_features_values(historical_data):
+    expected = pd.DataFrame({
+        'recency': [-9.0, 0.0, -23.0],
+        'frequency': [3, 2, 1],
+        'price_sum': [60.0, 30.0, 12.25],
+        'price_mean': [20.0, 15.0, 12.25],
+    }, index=pd.Index([1, 2, 3], name='customer_id'))
+
+    pd.testing.assert_frame_equal(build_features(historical_data), expected)
+
+
+def test_aggregated_scoring_frame_covers_the_whole_history():
+    features = synthetic_features(100)
+    expected = features.set_index('customer_id')[SCORING_COLUMNS].set_axis(FEATURE_COLUMNS, axis=1)
+
+    pd.testing.assert_frame_equal(scoring_frame(features), expected.astype('float32'))
+
+
+def test_spooled_profile_matches_scoring_features(tmp_path):
+    """External-memory training registers the profile of the features score() builds, not the training window."""
+    features = synthetic_features(1000)
+    chunks = (features.iloc[start:start + 300] for start in range(0, len(features), 300))
+
+    _, profile = spool_parts(chunks, tmp_path)
+
+    expected = feature_profile(scoring_frame(features))
+    assert profile.keys() == expected.keys()
+    for column, stats in expected.items():
+        assert profile[column] == pytest.approx(stats, rel=1e-5)
@@ -0,0 +1,137 @@
+import gspread
+import pandas as pd
+import pytest
+from requests import Response
+
+from src.integrations import gsheets
+
+
+def api_error(code: int) -> gspread.exceptions.APIError:
+    response = Response()
+    response.status_code = code
+    response._content = f'{{"error": {{"code": {code}, "message": "quota", "status": "x"}}}}'.encode()
+    return gspread.exceptions.APIError(response)
+
+
+class FakeWorksheet:
+    """In-memory worksheet recording the requests gcp_feed_data sends."""
+
+    def __init__(self, rows=None, failures=()):
+        self.cells = {(r, c): value for r, row in enumerate(rows or [], start=1)
+                      for c, value in enumerate(row, start=1) if value != ""}
+        self.failures = list(failures)  # errors raised by the next batch_update calls
+        self.batch_updates, self.cleared = [], []
+
+    @staticmethod
+    def _bounds(a1: str):
+        first, last = a1.split(":")
+        return gspread.utils.a1_to_rowcol(first), gspread.utils.a1_to_rowcol(last)
+
+    def get_all_values(self):
+        if not self.cells:
+            return []
+        height = max(r for r, _ in self.cells)
+        width = max(c for _, c in self.cells)
+        return [[self.cells.get((r, c), "") for c in range(1, width + 1)] for r in range(1, height + 1)]
+
+    def clear(self):
+        self.cells.clear()
+
+    def batch_update(self, data):
+        if self.failures:
+            raise self.failures.pop(0)
+        self.batch_updates.append(data)
+        for item in data:
+            (top, left), _ = self._bounds(item["range"])
+            for r, row in enumerate(item["values"], start=top):
+                for c, value in enumerate(row, start=left):
+                    self.cells[(r, c)] = value
+
+    def batch_clear(self, ranges):
+        self.cleared.extend(ranges)
+        for a1 in ranges:
+            (top, left), (bottom, right) = self._bounds(a1)
+            for key in [k for k in self.cells if top <= k[0] <= bottom and left <= k[1] <= right]:
+                del self.cells[key]
+
+
+class FakeClient:
+    def __init__(self, sheet: FakeWorksheet):
+        self.sheet = sheet
+
+    def open_by_key(self, spreadsheet_id):
+        return self
+
+    def worksheet(self, name):
+        return self.sheet
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    delays = []
+    monkeypatch.setattr(gsheets.time, "sleep", delays.append)
+    return delays
+
+
+def frame(rows: int, columns=("customer_id", "pred_spend", "pred_prob")) -> pd.DataFrame:
+    return pd.DataFrame({name: [f"{name}-{i}" for i in range(rows)] for name in columns})
+
+
+def published(df: pd.DataFrame):
+    return [df.columns.tolist()] + df.astype(str).values.tolist()
+
+
+def test_batch_updates_are_bounded_by_max_cells():
+    sheet = FakeWorksheet()
+    df = frame(100)
+
+    assert gsheets.gcp_feed_data("id", "clv", df, client=FakeClient(sheet), max_cells=60)
+
+    cells_per_request = [sum(len(item["values"]) * len(item["values"][0]) for item in data)
+                         for data in sheet.batch_updates]
+    assert max(cells_per_request) <= 60
+    assert len(sheet.batch_updates) == 6  # 101 rows x 3 columns, 20 rows per request
+    assert sheet.get_all_values() == published(df)
+
+
+def test_retries_with_backoff_on_429(no_sleep):
+    sheet = FakeWorksheet(failures=[api_error(429), api_error(429)])
+    df = frame(5)
+
+    assert gsheets.gcp_feed_data("id", "clv", df, client=FakeClient(sheet))
+
+    assert no_sleep == [1.0, 2.0]
+    assert sheet.get_all_values() == published(df)
+
+
+def test_other_api_errors_are_not_retried(no_sleep):
+    sheet = FakeWorksheet(failures=[api_error(403)])
+
+    with pytest.raises(gspread.exceptions.APIError):
+        gsheets.gcp_feed_data("id", "clv", frame(5), client=FakeClient(sheet))
+    assert no_sleep == []
+
+
+def test_diff_rewrites_only_changed_rows():
+    old = frame(50)
+    new = old.copy()
+    new.loc[[10, 11, 30], "pred_spend"] = "changed"
+    sheet = FakeWorksheet(published(old))
+
+    assert gsheets.gcp_feed_data("id", "clv", new, client=FakeClient(sheet), diff=True)
+
+    ranges = [item["range"] for data in sheet.batch_updates for item in data]
+    assert ranges == ["A12:C13", "A32:C32"]  # data rows 10-11 and 30, after the header row
+    assert sheet.cleared == []
+    assert sheet.get_all_values() == published(new)
+
+
+def test_diff_clears_stale_rows_and_columns():
+    old = frame(20, columns=("customer_id", "pred_spend", "pred_prob", "country"))
+    new = frame(10)  # shorter, and without the country column
+    sheet = FakeWorksheet(published(old))
+
+    assert gsheets.gcp_feed_data("id", "clv", new, client=FakeClient(sheet), diff=True)
+
+    assert sheet.batch_updates == []  # the first three columns of the first rows are unchanged
+    assert sheet.get_all_values() == published(new)
@@ -0,0 +1,50 @@
+from src import metrics
+
+
+def test_every_task_writes_its_own_textfile(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "_records", [])
+    monkeypatch.setattr(metrics, "metrics_settings", lambda: {"enabled": True,
+                                                              "prometheus_textfile_dir": str(tmp_path)})
+
+    with metrics.task_run("extract"):
+        with metrics.measure("read_file_s3"):
+            metrics.note(rows=10)
+    with metrics.task_run("score"):
+        with metrics.measure("modeling.train"):
+            pass
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["d2p_extract.prom", "d2p_score.prom"]
+    extract = (tmp_path / "d2p_extract.prom").read_text()
+    assert 'd2p_step_rows{task="extract",step="read_file_s3"} 10' in extract
+    assert 'task="score"' not in extract
+    score = (tmp_path / "d2p_score.prom").read_text()
+    assert 'd2p_step_calls{task="score",step="modeling.train"} 1' in score
+    assert 'd2p_step_process_peak_rss_bytes{task="score",step="modeling.train"}' in score
+    assert 'd2p_step_rss_growth_bytes{task="score",step="modeling.train"}' in score
+    assert list(metrics._records) == []
+
+
+def test_written_steps_are_dropped_from_memory(monkeypatch):
+    monkeypatch.setattr(metrics, "_records", [])
+
+    with metrics.measure("outside_any_task"):
+        pass
+    with metrics.task_run("extract"):  # no textfile directory configured
+        with metrics.measure("read_file_s3"):
+            pass
+    assert [record["step"] for record in metrics._records] == ["outside_any_task"]
+
+    with metrics.task_run("score"):
+        with metrics.measure("modeling.train"):
+            pass
+    assert [record["step"] for record in metrics._records] == ["outside_any_task"]
+
+
+def test_steps_outside_any_task_are_capped(monkeypatch):
+    monkeypatch.setattr(metrics, "_records", metrics.deque(maxlen=3))
+
+    for step in "abcde":
+        with metrics.measure(step):
+            pass
+
+    assert [record["step"] for record in metrics._records] == ["c", "d", "e"]
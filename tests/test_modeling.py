@@ -0,0 +1,112 @@
+import io
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import cdnow_chunks, synthetic_features
+from src import cache, modeling, registry
+
+
+@pytest.fixture
+def registry_settings(tmp_path, monkeypatch):
+    """A local model registry and step cache under tmp_path, and small models."""
+    settings = {"location": "local", "path": str(tmp_path / "models"),
+                "retrain_every_days": 7, "drift_threshold": 0.5}
+    monkeypatch.setattr(registry, "registry_settings", lambda: settings)
+    monkeypatch.setattr(modeling, "registry_settings", lambda: settings)
+    monkeypatch.setattr(cache, "cache_settings", lambda: {"enabled": True, "location": "local",
+                                                          "path": str(tmp_path / "cache")})
+    monkeypatch.setattr(modeling, "training_settings", lambda: {"regressor": {"n_estimators": 5},
+                                                                "classifier": {"n_estimators": 5},
+                                                                "n_jobs": 1})
+    monkeypatch.chdir(tmp_path)  # predictions.csv
+    return settings
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    """Counts the modeling() and score() runs process() does not serve from the step cache."""
+    counts = {"modeling": 0, "score": 0}
+    for name in counts:
+        def counted(df, run=getattr(modeling, name), name=name):
+            counts[name] += 1
+            return run(df)
+        monkeypatch.setattr(modeling, name, counted)
+    return counts
+
+
+def test_train_is_never_served_from_the_cache(registry_settings, runs):
+    data = next(cdnow_chunks(5000))
+
+    modeling.process(mode='train', data=data)
+    first = registry.latest_version()
+    modeling.process(mode='train', data=data)
+
+    assert runs["modeling"] == 2
+    assert registry.latest_version() != first
+
+
+def test_score_is_cached_until_the_model_is_due(registry_settings, runs):
+    data = next(cdnow_chunks(5000))
+    modeling.process(mode='train', data=data)
+    trained = registry.latest_version()
+
+    first = modeling.process(mode='score', data=data)
+    Path('predictions.csv').unlink()
+    second = modeling.process(mode='score', data=data)
+    assert runs["score"] == 1
+    assert second.equals(first)
+    # The cache hit still leaves this run's predictions behind
+    pd.testing.assert_frame_equal(pd.read_csv('predictions.csv'), pd.read_csv(io.StringIO(first.to_csv(index=False))))
+    assert registry.latest_version() == trained
+
+    # Same data, but the schedule says the model is due: scoring runs again and retrains
+    registry_settings["retrain_every_days"] = 0
+    modeling.process(mode='score', data=data)
+    assert runs["score"] == 2
+    assert registry.latest_version() != trained
+
+
+def as_returned_by_mysql(features: pd.DataFrame) -> pd.DataFrame:
+    """src/features.sql output as PyMySQL hands it over: DECIMAL sums as Decimal, counts and days as int."""
+    amounts = ['price_sum', 'price_mean', 'spend_60_day', 'scoring_price_sum', 'scoring_price_mean']
+    counts = ['recency', 'frequency', 'spend_60_flag', 'scoring_recency', 'scoring_frequency']
+    return features.assign(
+        **{name: [Decimal(f"{value:.2f}") for value in features[name]] for name in amounts},
+        **{name: features[name].astype(np.int64) for name in counts})
+
+
+def test_external_memory_trains_on_database_types(registry_settings, tmp_path):
+    features = as_returned_by_mysql(synthetic_features(2000))
+    chunks = (features.iloc[start:start + 500] for start in range(0, len(features), 500))
+    settings = {**modeling.training_settings(), "validation_fraction": 0.2, "early_stopping_rounds": 2,
+                "external_memory": {"cache_dir": str(tmp_path / "xgb_cache")}}
+
+    predictions = modeling.modeling_external(chunks, settings)
+
+    assert len(predictions) == len(features)
+    assert predictions[['pred_spend', 'pred_prob']].notna().all().all()
+    assert registry.latest_version() is not None
+
+
+def test_score_runs_uncached_when_s3_credentials_are_missing(registry_settings, runs, monkeypatch):
+    from botocore.exceptions import NoCredentialsError
+    from src.integrations import s3
+
+    data = next(cdnow_chunks(5000))
+    modeling.process(mode='train', data=data)
+
+    class NoCredentials:
+        def head_object(self, **_):
+            raise NoCredentialsError()
+
+    reads = []
+    monkeypatch.setattr(s3, "auth_aws", NoCredentials)
+    monkeypatch.setattr(s3, "read_file_s3", lambda columns, **_: reads.append(columns) or data[columns])
+
+    assert len(modeling.process(mode='score')) == data['customer_id'].nunique()
+    assert reads == [modeling.TRANSACTION_COLUMNS]
+    assert runs["score"] == 1
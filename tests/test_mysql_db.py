@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from src.integrations.mysql_db import formatting_columns_placeholders
+
+
+def test_numeric_types_follow_the_dtype_not_the_first_chunk():
+    first_chunk = pd.DataFrame({
+        "small_id": np.array([1, 2], dtype=np.int32),
+        "big_id": np.array([1, 2], dtype=np.int64),
+        "price": [9.99, 12.5],  # two decimals here, not necessarily in the next chunk
+        "date": ["1997-01-01", "1997-01-02"],
+    })
+
+    schema, placeholders = formatting_columns_placeholders(first_chunk)
+
+    assert schema == "small_id INT, big_id BIGINT, price DOUBLE, date DATE"
+    assert placeholders == "(%s, %s, %s, %s)"
+
+
+def test_declared_columns_override_the_inferred_type():
+    schema, _ = formatting_columns_placeholders(pd.DataFrame({"price": [9.99]}),
+                                                column_types={"price": "DECIMAL(10, 2)"})
+
+    assert schema == "price DECIMAL(10, 2)"
@@ -0,0 +1,98 @@
+import boto3
+import numpy as np
+import pandas as pd
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+from src.integrations import s3
+
+BUCKET = "d2p-test-bucket"
+PART_SIZE = s3.MIN_PART_SIZE
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_SESSION_TOKEN"):
+        monkeypatch.setenv(name, "testing")
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        monkeypatch.setattr(s3, "auth_aws", lambda: client)
+        yield client
+
+
+def frame_chunks(rows: int, chunk_rows: int = 50_000, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    return [pd.DataFrame({"customer_id": rng.integers(0, 10**6, size),
+                          "price": rng.random(size).round(6),
+                          "quantity": rng.integers(1, 10, size)})
+            for size in [chunk_rows] * (rows // chunk_rows)]
+
+
+def uploaded_part_sizes(client) -> list:
+    """Records the body size of every UploadPart call made through the client."""
+    sizes = []
+    client.meta.events.register("provide-client-params.s3.UploadPart",
+                                lambda params, **_: sizes.append(len(params["Body"])))
+    return sizes
+
+
+def open_uploads(client) -> list:
+    return client.list_multipart_uploads(Bucket=BUCKET).get("Uploads", [])
+
+
+def test_write_chunks_s3_splits_into_parts(s3_client):
+    chunks = frame_chunks(400_000)
+    sizes = uploaded_part_sizes(s3_client)
+
+    assert s3.write_chunks_s3(chunks, BUCKET, "sales.csv", part_size=PART_SIZE)
+
+    assert len(sizes) > 1
+    assert all(size >= PART_SIZE for size in sizes[:-1])
+    assert s3_client.head_object(Bucket=BUCKET, Key="sales.csv", PartNumber=1)["PartsCount"] == len(sizes)
+    pd.testing.assert_frame_equal(s3.read_file_s3(BUCKET, "sales.csv"),
+                                  pd.concat(chunks, ignore_index=True))
+
+
+@pytest.mark.parametrize("object_name", ["sales.csv.gz", "sales.csv.zst", "sales.parquet.gz"])
+def test_write_chunks_s3_round_trips_compressed(s3_client, object_name):
+    if object_name.endswith(".zst"):
+        pytest.importorskip("zstandard")
+    chunks = frame_chunks(120_000, chunk_rows=30_000)
+
+    assert s3.write_chunks_s3(chunks, BUCKET, object_name, part_size=PART_SIZE)
+
+    pd.testing.assert_frame_equal(s3.read_file_s3(BUCKET, object_name),
+                                  pd.concat(chunks, ignore_index=True))
+
+
+def test_write_chunks_s3_aborts_when_a_part_fails(s3_client, monkeypatch):
+    upload_part = s3_client.upload_part
+
+    def failing_upload_part(**kwargs):
+        if kwargs["PartNumber"] == 2:
+            raise ClientError({"Error": {"Code": "InternalError", "Message": "injected"}}, "UploadPart")
+        return upload_part(**kwargs)
+
+    monkeypatch.setattr(s3_client, "upload_part", failing_upload_part)
+
+    assert not s3.write_chunks_s3(frame_chunks(400_000), BUCKET, "sales.csv", part_size=PART_SIZE)
+    assert open_uploads(s3_client) == []
+    assert "Contents" not in s3_client.list_objects_v2(Bucket=BUCKET)
+
+
+def test_write_chunks_s3_aborts_when_the_chunks_fail(s3_client):
+    def chunks():
+        yield from frame_chunks(100_000)
+        raise RuntimeError("extract failed mid-stream")
+
+    with pytest.raises(RuntimeError, match="mid-stream"):
+        s3.write_chunks_s3(chunks(), BUCKET, "sales.csv", part_size=PART_SIZE)
+    assert open_uploads(s3_client) == []
+
+
+def test_write_chunks_s3_rejects_parts_below_the_s3_minimum(s3_client):
+    with pytest.raises(ValueError, match="part_size"):
+        s3.write_chunks_s3(frame_chunks(1_000), BUCKET, "sales.csv", part_size=PART_SIZE - 1)
+    assert open_uploads(s3_client) == []